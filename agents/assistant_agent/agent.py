@@ -58,6 +58,9 @@ root_run_config = RunConfig(
     )
 )
 
+# Opening line played from cache by the Twilio channel while the live session connects
+root_greeting = "Bonjour, je suis Livia, l'assistante IA d'Emmanuel Prat. Puis-je prendre un message pour Emmanuel ou vous renseigner ?"
+
 root_agent = Agent(
     name="assistant_agent",
     model="gemini-live-2.5-flash-native-audio",
@@ -47,6 +47,9 @@ root_run_config = RunConfig(
     )
 )
 
+# Opening line played from cache by the Twilio channel while the live session connects
+root_greeting = "Bonjour, je suis un assistant médical IA. Cet entretien aide à préparer votre visite médicale, et les informations recueillies seront validées par le médecin. Quel est le motif de votre visite aujourd'hui ?"
+
 root_agent = Agent(
     name="assistant_medical",
     model="gemini-live-2.5-flash-native-audio",
@@ -0,0 +1,70 @@
+"""Model events per second through agent_to_client_messaging.
+
+Each ADK Event carries one 40 ms chunk of 24kHz PCM, as Gemini Live streams
+a spoken turn. The pydantic path is the bridge before LiveAgentEvent: one
+validated AgentDataEvent per chunk and hasattr/startswith checks per part.
+The handler does nothing, so the figures are the bridge's own overhead.
+
+Run from the repository root:
+    python -m benchmarks.bench_agent_events
+"""
+import asyncio
+import time
+
+from google.adk.events import Event
+from google.genai.types import Blob, Content, Part
+
+from channels.twilio.live_messaging import AgentDataEvent, agent_to_client_messaging
+
+EVENTS = 50_000
+
+
+async def _replay(events: list[Event]):
+    for event in events:
+        yield event
+
+
+async def _pydantic_messaging(on_agent_event, live_events):
+    async for event in live_events:
+        if event.turn_complete or event.interrupted or not event.content or not event.content.parts:
+            continue
+        for part in event.content.parts:
+            is_text = hasattr(part, "text") and part.text is not None
+            is_audio = (
+                part.inline_data
+                and part.inline_data.mime_type
+                and part.inline_data.mime_type.startswith("audio/pcm")
+            )
+            if is_audio:
+                audio_data = part.inline_data and part.inline_data.data
+                if audio_data:
+                    await on_agent_event(AgentDataEvent(payload=audio_data))
+            elif is_text:
+                continue
+
+
+async def _events_per_second(messaging, events: list[Event]) -> float:
+    async def on_agent_event(message):
+        pass
+
+    start = time.perf_counter()
+    await messaging(on_agent_event, _replay(events))
+    return len(events) / (time.perf_counter() - start)
+
+
+def main():
+    chunk = b"\x01\x00" * 960
+    events = [
+        Event(author="agent", content=Content(role="model", parts=[
+            Part(inline_data=Blob(data=chunk, mime_type="audio/pcm;rate=24000"))
+        ]))
+        for _ in range(EVENTS)
+    ]
+    before = max(asyncio.run(_events_per_second(_pydantic_messaging, events)) for _ in range(3))
+    after = max(asyncio.run(_events_per_second(agent_to_client_messaging, events)) for _ in range(3))
+    print(f"{'pydantic events/s':>18} {'slotted events/s':>17} {'speedup':>8}")
+    print(f"{before:>18,.0f} {after:>17,.0f} {after / before:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
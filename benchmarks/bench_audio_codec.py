@@ -0,0 +1,125 @@
+"""Benchmark of the Twilio audio codec path in channels/twilio/audio.py.
+
+For each function it reports frames/s, ns per input sample, the peak bytes
+allocated per frame (as seen by tracemalloc, which includes NumPy buffers)
+and p50/p99 per-frame latency. Results are written as JSON; pass
+--baseline with an earlier result file to flag regressions.
+
+Run from the repository root:
+    python -m benchmarks.bench_audio_codec --output bench_audio.json
+    python -m benchmarks.bench_audio_codec --baseline bench_audio.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from channels.twilio.audio import (
+    CallTranscoder,
+    _lin2ulaw,
+    _ulaw2lin,
+    adk_pcm24k_to_twilio_ulaw8k,
+    twilio_ulaw8k_to_adk_pcm16k,
+)
+
+FRAMES = 5000
+ALLOC_FRAMES = 200
+REGRESSION_THRESHOLD = 0.25 # Relative slowdown of p50 that counts as a regression
+
+
+def _cases():
+    """(name, function, 20 ms input frame, samples per frame)"""
+    rng = np.random.default_rng(0)
+    ulaw8k = rng.integers(0, 256, 160, dtype=np.uint8).tobytes()
+    pcm8k = rng.integers(-8000, 8000, 160, dtype=np.int16).tobytes()
+    pcm24k = rng.integers(-8000, 8000, 480, dtype=np.int16).tobytes()
+    transcoder = CallTranscoder(fused=True)
+    return [
+        ("_ulaw2lin", _ulaw2lin, ulaw8k, 160),
+        ("_lin2ulaw", _lin2ulaw, pcm8k, 160),
+        ("twilio_ulaw8k_to_adk_pcm16k", twilio_ulaw8k_to_adk_pcm16k, ulaw8k, 160),
+        ("adk_pcm24k_to_twilio_ulaw8k", adk_pcm24k_to_twilio_ulaw8k, pcm24k, 480),
+        ("CallTranscoder.inbound", transcoder.inbound, ulaw8k, 160),
+        ("CallTranscoder.outbound", transcoder.outbound, pcm24k, 480),
+    ]
+
+
+def bench(func, frame: bytes, samples: int) -> dict:
+    for _ in range(100):
+        func(frame)
+
+    latencies = np.empty(FRAMES, dtype=np.int64)
+    clock = time.perf_counter_ns
+    for i in range(FRAMES):
+        start = clock()
+        func(frame)
+        latencies[i] = clock() - start
+
+    tracemalloc.start()
+    peaks = []
+    for _ in range(ALLOC_FRAMES):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        func(frame)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+    tracemalloc.stop()
+
+    mean_ns = float(latencies.mean())
+    return {
+        "frames_per_s": 1e9 / mean_ns,
+        "ns_per_sample": mean_ns / samples,
+        "peak_alloc_bytes_per_frame": int(np.median(peaks)),
+        "p50_us": float(np.percentile(latencies, 50)) / 1000,
+        "p99_us": float(np.percentile(latencies, 99)) / 1000,
+    }
+
+
+def compare(results: dict, baseline: dict) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous and result["p50_us"] > previous["p50_us"] * (1 + REGRESSION_THRESHOLD):
+            regressions.append(f"{name}: p50 {previous['p50_us']:.1f}us -> {result['p50_us']:.1f}us")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against an earlier JSON result file")
+    args = parser.parse_args()
+
+    results = {name: bench(func, frame, samples) for name, func, frame, samples in _cases()}
+
+    print(f"{'function':<30} {'frames/s':>10} {'ns/sample':>10} {'alloc B':>8} {'p50 us':>8} {'p99 us':>8}")
+    for name, r in results.items():
+        print(
+            f"{name:<30} {r['frames_per_s']:>10.0f} {r['ns_per_sample']:>10.1f}"
+            f" {r['peak_alloc_bytes_per_frame']:>8} {r['p50_us']:>8.1f} {r['p99_us']:>8.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "python": sys.version.split()[0],
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+                "results": results,
+            }, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f))
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Event loop lag while calls transcode model audio inline or on worker threads.
+
+Each simulated call receives a 20 ms μ-law frame from Twilio every tick and,
+every ``BURST_EVERY`` ticks, a multi-second chunk of 24kHz PCM from the model,
+as Gemini Live sends at the start of a turn. Transcoding such a chunk inline
+blocks the loop, and every other call's frames wait behind it. The lag a
+LoopLagMonitor sees is what a call hears as jitter.
+
+Run from the repository root:
+    python -m benchmarks.bench_loop_lag
+"""
+import asyncio
+
+import numpy as np
+
+from channels.twilio.audio import CallTranscoder, TranscodeExecutor
+from channels.twilio.metrics import LoopLagMonitor
+
+FRAME_SECONDS = 0.020
+TICKS = 150
+BURST_EVERY = 25
+BURST_SECONDS = 4
+
+
+async def _call(transcoder, threaded: bool, seed: int):
+    rng = np.random.default_rng(seed)
+    ulaw = rng.integers(0, 256, 160, dtype=np.uint8).tobytes()
+    burst = rng.integers(-8000, 8000, 24000 * BURST_SECONDS, dtype=np.int16).tobytes()
+    # Calls start out of phase, as real ones do
+    await asyncio.sleep(FRAME_SECONDS * (seed % BURST_EVERY) / BURST_EVERY)
+    for tick in range(TICKS):
+        pcm16 = transcoder.inbound(ulaw)
+        if tick % BURST_EVERY == seed % BURST_EVERY:
+            ulaw_out = transcoder.outbound(burst)
+            if threaded:
+                await ulaw_out
+        if threaded:
+            await pcm16
+        await asyncio.sleep(FRAME_SECONDS)
+
+
+async def bench(num_calls: int, threads: int) -> dict:
+    monitor = LoopLagMonitor(interval=0.005, window=10_000)
+    monitor.start()
+    executor = TranscodeExecutor(max_workers=threads) if threads else None
+    transcoders = [executor.open_call() if executor else CallTranscoder(fused=True) for _ in range(num_calls)]
+    await asyncio.gather(*(_call(transcoder, bool(executor), i) for i, transcoder in enumerate(transcoders)))
+    monitor.stop()
+    if executor:
+        executor.close()
+    return monitor.metrics()
+
+
+def main():
+    print(f"{'calls':>6} {'mode':>10} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for num_calls in (10, 50):
+        for threads in (0, 4):
+            metrics = asyncio.run(bench(num_calls, threads))
+            mode = f"{threads} threads" if threads else "inline"
+            print(f"{num_calls:>6} {mode:>10} {metrics['p50_ms']:>8.2f} {metrics['p99_ms']:>8.2f} {metrics['max_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
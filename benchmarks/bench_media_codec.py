@@ -0,0 +1,54 @@
+"""Per-frame CPU of the Twilio media WebSocket messages, stdlib JSON vs the fast codec.
+
+Inbound is one Twilio `media` message decoded to u-law bytes; outbound is one
+20 ms u-law frame encoded into a `media` message. The stdlib path is what
+Starlette's receive_json/send_json plus base64 cost per frame.
+
+Run from the repository root:
+    python -m benchmarks.bench_media_codec
+"""
+import base64
+import json
+import timeit
+
+import numpy as np
+
+from channels.twilio.media_codec import TwilioMessageEncoder, media_payload
+
+FRAMES = 100_000
+STREAM_SID = "MZ18ad3ab5a668481ce02b83e7395059f0"
+
+
+def main():
+    ulaw = np.random.default_rng(0).integers(0, 256, 160, dtype=np.uint8).tobytes()
+    message = json.dumps({
+        "event": "media",
+        "sequenceNumber": "4",
+        "media": {"track": "inbound", "chunk": "2", "timestamp": "45", "payload": base64.b64encode(ulaw).decode()},
+        "streamSid": STREAM_SID,
+    }, separators=(",", ":"))
+    encoder = TwilioMessageEncoder(STREAM_SID)
+
+    def stdlib_inbound():
+        return base64.b64decode(json.loads(message)["media"]["payload"])
+
+    def stdlib_outbound():
+        payload = base64.b64encode(ulaw).decode("ascii")
+        return json.dumps({"event": "media", "streamSid": STREAM_SID, "media": {"payload": payload}})
+
+    assert media_payload(message) == stdlib_inbound()
+    assert json.loads(encoder.media(ulaw)) == json.loads(stdlib_outbound())
+
+    cases = {
+        "inbound": (stdlib_inbound, lambda: media_payload(message)),
+        "outbound": (stdlib_outbound, lambda: encoder.media(ulaw)),
+    }
+    print(f"{'direction':<10} {'stdlib us/frame':>16} {'fast us/frame':>14} {'speedup':>8}")
+    for direction, (stdlib, fast) in cases.items():
+        slow_us = min(timeit.repeat(stdlib, number=FRAMES, repeat=3)) / FRAMES * 1e6
+        fast_us = min(timeit.repeat(fast, number=FRAMES, repeat=3)) / FRAMES * 1e6
+        print(f"{direction:<10} {slow_us:>16.2f} {fast_us:>14.2f} {slow_us / fast_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Per-sample cost of the in-process metrics.
+
+Recording happens on the audio hot path (every frame increments a counter
+and observes a transcode time), so it must stay cheap enough to leave on.
+The figures back the costs documented on MetricsRegistry.
+
+Run from the repository root:
+    python -m benchmarks.bench_metrics
+"""
+import timeit
+
+from channels.twilio.metrics import MetricsRegistry
+
+SAMPLES = 1_000_000
+
+
+def main():
+    registry = MetricsRegistry()
+    counter = registry.counter("bench_total", "Benchmark counter", ("direction",))
+    histogram = registry.histogram("bench_seconds", "Benchmark histogram", ("direction",))
+    child = counter.labels("inbound")
+    histogram_child = histogram.labels("inbound")
+
+    cases = {
+        "counter child inc": lambda: child.inc(),
+        "counter labels().inc": lambda: counter.labels("inbound").inc(),
+        "histogram child observe": lambda: histogram_child.observe(0.0042),
+    }
+    print(f"{'operation':<24} {'us/sample':>10}")
+    for name, case in cases.items():
+        us = min(timeit.repeat(case, number=SAMPLES, repeat=3)) / SAMPLES * 1e6
+        print(f"{name:<24} {us:>10.3f}")
+    for n in range(100):
+        counter.labels(f"series{n}").inc()
+    us = min(timeit.repeat(registry.render, number=100, repeat=3)) / 100 * 1e6
+    print(f"{'render (103 series)':<24} {us:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
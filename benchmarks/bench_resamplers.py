@@ -0,0 +1,79 @@
+"""Quality and throughput of the resampler backends used by CallTranscoder.
+
+For both directions of the Twilio bridge (8k -> 16k and 24k -> 8k) this
+reports, per backend:
+  - SNR of a 1 kHz tone streamed through in 20 ms chunks,
+  - rejection of the image (upsampling) or alias (downsampling) of an
+    out-of-band tone,
+  - microseconds per 20 ms chunk.
+
+Run from the repository root:
+    python -m benchmarks.bench_resamplers
+"""
+import time
+
+import numpy as np
+
+from channels.twilio.audio import RESAMPLERS
+
+DIRECTIONS = {
+    # name: (in_rate, out_rate, out-of-band test tone, where its image/alias lands)
+    "8k->16k": (8000, 16000, 1000, 7000),
+    "24k->8k": (24000, 8000, 6000, 2000),
+}
+SECONDS = 2
+WARMUP_SECONDS = 0.1
+
+
+def _stream(backend, in_rate, out_rate, x):
+    stream = RESAMPLERS[backend](in_rate, out_rate, dtype="float32")
+    chunk = in_rate // 50
+    parts = [stream.resample_chunk(x[i:i + chunk]) for i in range(0, len(x), chunk)]
+    return np.concatenate(parts)
+
+
+def _tone_power(y, freq, rate):
+    """Least-squares power of the ``freq`` component, independent of delay."""
+    t = np.arange(len(y)) / rate
+    basis = np.stack([np.sin(2 * np.pi * freq * t), np.cos(2 * np.pi * freq * t)], axis=1)
+    coeffs, *_ = np.linalg.lstsq(basis, y, rcond=None)
+    fitted = basis @ coeffs
+    return np.mean(fitted ** 2), np.mean((y - fitted) ** 2)
+
+
+def quality(backend, in_rate, out_rate, oob_freq, image_freq):
+    t = np.arange(SECONDS * in_rate) / in_rate
+    skip = int(WARMUP_SECONDS * out_rate)
+
+    y = _stream(backend, in_rate, out_rate, 0.5 * np.sin(2 * np.pi * 1000 * t).astype(np.float32))[skip:]
+    signal, noise = _tone_power(y, 1000, out_rate)
+    snr = 10 * np.log10(signal / noise)
+
+    x = 0.5 * np.sin(2 * np.pi * oob_freq * t).astype(np.float32)
+    y = _stream(backend, in_rate, out_rate, x)[skip:]
+    leaked, _ = _tone_power(y, image_freq, out_rate)
+    rejection = 10 * np.log10(np.mean(x ** 2) / max(leaked, 1e-20))
+    return snr, rejection
+
+
+def throughput(backend, in_rate, out_rate, dtype="int16", chunks=5000):
+    stream = RESAMPLERS[backend](in_rate, out_rate, dtype=dtype)
+    rng = np.random.default_rng(0)
+    x = rng.integers(-8000, 8000, in_rate // 50).astype(dtype)
+    start = time.perf_counter()
+    for _ in range(chunks):
+        stream.resample_chunk(x)
+    return (time.perf_counter() - start) / chunks
+
+
+def main():
+    print(f"{'direction':<10} {'backend':<10} {'SNR dB':>8} {'rejection dB':>13} {'us/chunk':>9}")
+    for direction, (in_rate, out_rate, oob_freq, image_freq) in DIRECTIONS.items():
+        for backend in RESAMPLERS:
+            snr, rejection = quality(backend, in_rate, out_rate, oob_freq, image_freq)
+            seconds = throughput(backend, in_rate, out_rate)
+            print(f"{direction:<10} {backend:<10} {snr:>8.1f} {rejection:>13.1f} {seconds * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
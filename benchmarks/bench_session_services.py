@@ -0,0 +1,75 @@
+"""Event throughput of the session services a worker can run with.
+
+Simulates calls appending transcript events, with a small state update on
+every fourth event, the way tools like `update_voicemail_data` write. Compares
+the in-memory service with SQLite committing every write and SQLite with
+write-behind batching.
+
+Run from the repository root:
+    python -m benchmarks.bench_session_services
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import InMemorySessionService
+from google.genai.types import Content, Part
+
+from channels.twilio.sqlite_sessions import SqliteSessionService
+
+CALLS = 50
+EVENTS_PER_CALL = 40
+
+
+def _event(n: int) -> Event:
+    return Event(
+        author="agent",
+        content=Content(role="model", parts=[Part(text=f"Transcript line {n} " + "x" * 80)]),
+        actions=EventActions(state_delta={"step": n} if n % 4 == 0 else {}),
+    )
+
+
+async def _run(service) -> tuple[float, float]:
+    sessions = [
+        await service.create_session(app_name="bench", user_id=f"user{n}", session_id=f"CA{n}")
+        for n in range(CALLS)
+    ]
+    start = time.perf_counter()
+    # Calls interleave, as they do on a worker
+    for n in range(EVENTS_PER_CALL):
+        for session in sessions:
+            await service.append_event(session, _event(n))
+    if hasattr(service, "flush"):
+        await service.flush()
+    appends = time.perf_counter() - start
+    start = time.perf_counter()
+    for session in sessions:
+        await service.get_session(app_name="bench", user_id=session.user_id, session_id=session.id)
+    reads = time.perf_counter() - start
+    return appends, reads
+
+
+def main():
+    total = CALLS * EVENTS_PER_CALL
+    with tempfile.TemporaryDirectory() as directory:
+        services = {
+            "in-memory": lambda: InMemorySessionService(),
+            "sqlite, commit per write": lambda: SqliteSessionService(os.path.join(directory, "sync.db"), flush_interval=0),
+            "sqlite, write-behind 50ms": lambda: SqliteSessionService(os.path.join(directory, "batched.db")),
+        }
+        print(f"{'service':<28} {'appends/s':>10} {'get_session us':>15}")
+        for name, build in services.items():
+            async def run():
+                service = build()
+                result = await _run(service)
+                if isinstance(service, SqliteSessionService):
+                    await service.close()
+                return result
+            appends, reads = asyncio.run(run())
+            print(f"{name:<28} {total / appends:>10.0f} {reads / CALLS * 1e6:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Calls per core for the Twilio transcode path, with and without batching.
+
+Each simulated call moves one 20 ms frame in each direction per tick: 160
+bytes of μ-law in from Twilio and 960 bytes of 24kHz PCM out from the model.
+A core keeps up with a call as long as a tick's worth of work for that call
+takes less than 20 ms of CPU.
+
+Run from the repository root:
+    python -m benchmarks.bench_transcode_batching
+"""
+import asyncio
+import time
+
+import numpy as np
+
+from channels.twilio.audio import CallTranscoder, TranscodeBatcher
+
+FRAME_SECONDS = 0.020
+TICKS = 200
+
+
+def _frames(num_calls: int):
+    rng = np.random.default_rng(0)
+    ulaw = [rng.integers(0, 256, 160, dtype=np.uint8).tobytes() for _ in range(num_calls)]
+    pcm24 = [rng.integers(-8000, 8000, 480, dtype=np.int16).tobytes() for _ in range(num_calls)]
+    return ulaw, pcm24
+
+
+def bench_per_call(num_calls: int) -> float:
+    ulaw, pcm24 = _frames(num_calls)
+    transcoders = [CallTranscoder(fused=True) for _ in range(num_calls)]
+    start = time.process_time()
+    for _ in range(TICKS):
+        for transcoder, inbound, outbound in zip(transcoders, ulaw, pcm24):
+            transcoder.inbound(inbound)
+            transcoder.outbound(outbound)
+    return (time.process_time() - start) / TICKS
+
+
+async def bench_batched(num_calls: int) -> float:
+    ulaw, pcm24 = _frames(num_calls)
+    batcher = TranscodeBatcher()
+    calls = [batcher.open_call() for _ in range(num_calls)]
+    start = time.process_time()
+    for _ in range(TICKS):
+        futures = []
+        for call, inbound, outbound in zip(calls, ulaw, pcm24):
+            futures.append(call.inbound(inbound))
+            futures.append(call.outbound(outbound))
+        batcher.process_pending()
+        for future in futures:
+            future.result()
+    elapsed = (time.process_time() - start) / TICKS
+    for call in calls:
+        call.close()
+    return elapsed
+
+
+def main():
+    print(f"{'calls':>6} {'per-call us/tick':>18} {'batched us/tick':>16} {'calls/core':>11} {'batched calls/core':>19}")
+    for num_calls in (1, 10, 50, 100, 250, 500):
+        per_call = bench_per_call(num_calls)
+        batched = asyncio.run(bench_batched(num_calls))
+        print(
+            f"{num_calls:>6} {per_call * 1e6:>18.0f} {batched * 1e6:>16.0f}"
+            f" {FRAME_SECONDS * num_calls / per_call:>11.0f}"
+            f" {FRAME_SECONDS * num_calls / batched:>19.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""Registry of the agents under `agents/`, loaded once and shared by every call."""
+import importlib
+import logging
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
+from types import MappingProxyType, ModuleType
+from typing import Any
+
+from google.adk.agents.run_config import RunConfig
+from google.adk.artifacts import BaseArtifactService, InMemoryArtifactService
+from google.adk.memory import BaseMemoryService, InMemoryMemoryService
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+AGENTS_PACKAGE = "agents"
+AGENTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), AGENTS_PACKAGE)
+
+def _with_vad_overrides(
+    realtime_input_config: types.RealtimeInputConfig | None, vad_overrides: dict[str, Any]
+) -> types.RealtimeInputConfig:
+    """Copies ``realtime_input_config`` with its activity detection fields replaced"""
+    realtime_input_config = realtime_input_config or types.RealtimeInputConfig()
+    detection = realtime_input_config.automatic_activity_detection
+    fields = detection.model_dump(exclude_none=True) if detection else {}
+    # Validated here so that a misspelt setting fails at load time, not mid-call
+    detection = types.AutomaticActivityDetection(**{**fields, **vad_overrides})
+    return realtime_input_config.model_copy(update={"automatic_activity_detection": detection})
+
+class ResolvedRunConfig:
+    """
+    An agent's effective live settings, resolved once when the agent loads.
+    The voice and activity detection settings of its ``root_run_config``,
+    with ``vad_overrides`` applied, are kept read-only. ``apply`` hands each
+    live session its own shallow copy, since ADK assigns RunConfig fields
+    during a run. Nested configs are shared and must not be modified.
+
+    Args:
+        run_config: RunConfig - The agent's ``root_run_config``, if any
+        vad_overrides: dict - AutomaticActivityDetection fields, e.g. ``silence_duration_ms``
+    """
+
+    __slots__ = ("_template", "_overrides")
+
+    def __init__(self, run_config: RunConfig | None = None, vad_overrides: dict[str, Any] | None = None):
+        if vad_overrides:
+            base = run_config or RunConfig()
+            run_config = base.model_copy(
+                update={"realtime_input_config": _with_vad_overrides(base.realtime_input_config, vad_overrides)}
+            )
+        self._template = run_config
+        overrides = {}
+        if run_config and run_config.speech_config:
+            overrides["speech_config"] = run_config.speech_config
+        if run_config and run_config.realtime_input_config:
+            overrides["realtime_input_config"] = run_config.realtime_input_config
+        self._overrides = MappingProxyType(overrides)
+
+    @property
+    def overrides(self) -> MappingProxyType:
+        """Fields that replace the caller's own."""
+        return self._overrides
+
+    @property
+    def silence_duration_ms(self) -> int | None:
+        """The silence that ends a caller's turn, if the agent sets one."""
+        realtime_input_config = self._overrides.get("realtime_input_config")
+        detection = realtime_input_config.automatic_activity_detection if realtime_input_config else None
+        return detection.silence_duration_ms if detection else None
+
+    def apply(self, run_config: RunConfig | None = None) -> RunConfig | None:
+        """
+        The RunConfig to start a live session with. Without a caller config it
+        is the agent's whole ``root_run_config``; otherwise the caller's config
+        with the agent's voice and activity detection. Neither is modified.
+        """
+        if run_config is None:
+            return self._template.model_copy() if self._template else None
+        if not self._overrides:
+            return run_config
+        return run_config.model_copy(update=self._overrides)
+
+@dataclass
+class AgentEntry:
+    """Everything the app needs from one agent module, resolved at load time."""
+    name: str
+    module: ModuleType
+    agent: object
+    run_config: RunConfig | None = None # The module's `root_run_config`
+    greeting: str | None = None # The module's `root_greeting`
+    inbound_coalesce_ms: int | None = None # The module's `root_inbound_coalesce_ms`
+    vad_overrides: dict[str, Any] | None = None # The module's `root_vad_overrides`
+    runner: Runner | None = field(default=None, repr=False) # Shared by every call to the agent
+    live_run_config: ResolvedRunConfig = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.live_run_config = ResolvedRunConfig(self.run_config, self.vad_overrides)
+
+    @classmethod
+    def from_module(cls, name: str, module: ModuleType) -> "AgentEntry":
+        # Raises AttributeError for a module without `root_agent`
+        return cls(
+            name=name,
+            module=module,
+            agent=getattr(module, "root_agent"),
+            run_config=getattr(module, "root_run_config", None),
+            greeting=getattr(module, "root_greeting", None),
+            inbound_coalesce_ms=getattr(module, "root_inbound_coalesce_ms", None),
+            vad_overrides=getattr(module, "root_vad_overrides", None),
+        )
+
+class AgentRegistry:
+    """
+    Lists the agent packages under ``agents_dir`` once and imports each at most
+    once, so calls look agents up in a dict instead of going through importlib.
+    Only names found by the scan can be loaded, which keeps arbitrary module
+    paths from the URL out of ``import_module``.
+
+    Each loaded agent gets one long-lived Runner. All of them share the
+    registry's session, artifact and memory services, so a call only creates
+    a session, and deleting it when the call ends releases what it held.
+    The Runners also share ``plugins``, e.g. the LoggingPlugin that records
+    tool, LLM and token metrics of calls.
+
+    Args:
+        package: str - Package holding one sub-package per agent
+        agents_dir: str - Directory of that package on disk
+        session_service: BaseSessionService - Shared by every agent's Runner
+        artifact_service: BaseArtifactService - Shared by every agent's Runner
+        memory_service: BaseMemoryService - Shared by every agent's Runner
+        plugins: list[BasePlugin] - Run by every agent's Runner
+    """
+
+    def __init__(
+        self,
+        package: str = AGENTS_PACKAGE,
+        agents_dir: str = AGENTS_DIR,
+        session_service: BaseSessionService | None = None,
+        artifact_service: BaseArtifactService | None = None,
+        memory_service: BaseMemoryService | None = None,
+        plugins: list[BasePlugin] | None = None,
+    ):
+        self.package = package
+        self.agents_dir = agents_dir
+        self.session_service = session_service or InMemorySessionService()
+        self.artifact_service = artifact_service or InMemoryArtifactService()
+        self.memory_service = memory_service or InMemoryMemoryService()
+        self.plugins = list(plugins or [])
+        self._entries: dict[str, AgentEntry] = {}
+        self._lock = threading.Lock()
+        self._names = self._scan()
+
+    def _scan(self) -> list[str]:
+        if not os.path.isdir(self.agents_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.agents_dir)
+            if not name.startswith((".", "_")) and os.path.isfile(os.path.join(self.agents_dir, name, "agent.py"))
+        )
+
+    def names(self) -> list[str]:
+        """Agents that can be served."""
+        return list(self._names)
+
+    def loaded(self) -> list[str]:
+        return sorted(self._entries)
+
+    def get(self, name: str) -> AgentEntry:
+        """
+        The cached entry for ``name``, importing its module on first use.
+        Raises LookupError for unknown agents, and ImportError or
+        AttributeError for agents that fail to load.
+        """
+        entry = self._entries.get(name)
+        if entry is not None:
+            return entry
+        if name not in self._names:
+            raise LookupError(f"Unknown agent '{name}'")
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                module = importlib.import_module(f"{self.package}.{name}.agent")
+                entry = AgentEntry.from_module(name, module)
+                entry.runner = Runner(
+                    app_name=name,
+                    agent=entry.agent,
+                    session_service=self.session_service,
+                    artifact_service=self.artifact_service,
+                    memory_service=self.memory_service,
+                    plugins=self.plugins,
+                )
+                self._entries[name] = entry
+                logger.info(f"Loaded agent: {name}")
+        return entry
+
+    def preload(self, names: list[str] | None = None) -> list[str]:
+        """Imports agents ahead of the first call; returns the ones that loaded."""
+        loaded = []
+        for name in names or self._names:
+            try:
+                self.get(name)
+                loaded.append(name)
+            except Exception as ex:
+                logger.warning(f"Could not preload agent '{name}': {ex}")
+        return loaded
+
+    def reload(self, name: str | None = None) -> list[str]:
+        """
+        Development hook: rescans ``agents_dir`` and re-imports the agent module
+        of ``name``, or of every loaded agent, from scratch so that removed
+        attributes do not linger. Submodules such as tools are not reloaded.
+        """
+        with self._lock:
+            self._names = self._scan()
+            stale = [name] if name else list(self._entries)
+            entries = {agent_name: self._entries.pop(agent_name, None) for agent_name in stale}
+        importlib.invalidate_caches()
+        reloaded = []
+        for agent_name, entry in entries.items():
+            if agent_name not in self._names:
+                continue
+            if entry is not None:
+                sys.modules.pop(entry.module.__name__, None)
+            self.get(agent_name)
+            reloaded.append(agent_name)
+        return reloaded
+
+_default_registry: AgentRegistry | None = None
+
+def default_registry(**kwargs) -> AgentRegistry:
+    """
+    The process-wide registry shared by the app routes and plugins. Keyword
+    arguments for AgentRegistry, such as ``session_service``, only apply to
+    the call that creates it.
+    """
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = AgentRegistry(**kwargs)
+    return _default_registry
@@ -0,0 +1,97 @@
+"""Cached greeting audio played while the live session connects."""
+import asyncio
+import hashlib
+import logging
+import os
+
+import numpy as np
+from google import genai
+from google.genai import types
+
+from channels.twilio.audio import adk_pcm24k_to_twilio_ulaw8k
+
+logger = logging.getLogger(__name__)
+
+GREETING_CACHE_DIR = os.environ.get("TWILIO_GREETING_CACHE_DIR", os.path.join(".cache", "greetings"))
+GREETING_TTS_MODEL = os.environ.get("TWILIO_GREETING_TTS_MODEL", "gemini-2.5-flash-preview-tts")
+
+def greeting_cache_path(
+    agent_name: str, greeting: str, speech_config: types.SpeechConfig | None, cache_dir: str = GREETING_CACHE_DIR
+) -> str:
+    """Cache file for a greeting, keyed by its text and voice so edits invalidate it"""
+    voice = speech_config.model_dump_json(exclude_none=True) if speech_config else ""
+    digest = hashlib.sha256(f"{greeting}\0{voice}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{agent_name}-{digest}.ulaw")
+
+async def synthesize_greeting(greeting: str, speech_config: types.SpeechConfig | None) -> bytes:
+    """Renders the greeting with Gemini TTS and returns Twilio u-law 8kHz audio"""
+    client = genai.Client()
+    response = await client.aio.models.generate_content(
+        model=GREETING_TTS_MODEL,
+        contents=greeting,
+        config=types.GenerateContentConfig(
+            response_modalities=["AUDIO"],
+            speech_config=speech_config,
+        ),
+    )
+    pcm24 = response.candidates[0].content.parts[0].inline_data.data # 16-bit 24kHz PCM
+    return adk_pcm24k_to_twilio_ulaw8k(pcm24)
+
+class GreetingCache:
+    """
+    Per-agent greeting audio, rendered once and memory-mapped from disk.
+    ``get`` never blocks a call: it returns the cached u-law frames or None,
+    and ``prepare`` renders a missing greeting in the background so that
+    later calls can play it the moment Twilio's `start` event arrives.
+    Audio is keyed by its cache file, so an agent reloaded with another
+    greeting or voice gets the new audio, and the old one is unmapped.
+    """
+
+    def __init__(self, cache_dir: str = GREETING_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._audio: dict[str, np.memmap] = {} # By cache path
+        self._paths: dict[str, str] = {} # Cache path last mapped per agent
+        self._pending: dict[str, asyncio.Task] = {}
+
+    def get(self, agent_name: str, greeting: str, speech_config: types.SpeechConfig | None = None) -> np.memmap | None:
+        return self._audio.get(greeting_cache_path(agent_name, greeting, speech_config, self.cache_dir))
+
+    def load(self, agent_name: str, greeting: str, speech_config: types.SpeechConfig | None = None) -> np.memmap | None:
+        """Maps a previously rendered greeting from disk, if there is one"""
+        path = greeting_cache_path(agent_name, greeting, speech_config, self.cache_dir)
+        if path in self._audio:
+            return self._audio[path]
+        if os.path.exists(path) and os.path.getsize(path):
+            self._audio[path] = np.memmap(path, dtype=np.uint8, mode="r")
+            previous = self._paths.get(agent_name)
+            if previous != path:
+                self._audio.pop(previous, None) # Calls still playing it keep their reference
+            self._paths[agent_name] = path
+        return self._audio.get(path)
+
+    def prepare(self, agent_name: str, greeting: str, speech_config: types.SpeechConfig | None = None):
+        """Loads the greeting, or starts rendering it in the background"""
+        if self.load(agent_name, greeting, speech_config) is not None:
+            return
+        path = greeting_cache_path(agent_name, greeting, speech_config, self.cache_dir)
+        task = self._pending.get(path)
+        if task is None or task.done():
+            self._pending[path] = asyncio.create_task(self._render(agent_name, greeting, speech_config))
+
+    async def _render(self, agent_name: str, greeting: str, speech_config: types.SpeechConfig | None):
+        try:
+            ulaw = await synthesize_greeting(greeting, speech_config)
+        except Exception as ex:
+            logger.warning(f"Could not render the greeting for {agent_name}: {ex}")
+            return
+        if not ulaw:
+            return
+        path = greeting_cache_path(agent_name, greeting, speech_config, self.cache_dir)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so another worker never maps a half-written file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(ulaw)
+        os.replace(tmp_path, path)
+        self.load(agent_name, greeting, speech_config)
+        logger.info(f"Cached greeting for {agent_name}: {len(ulaw) / 8000:.1f}s of audio")
@@ -1,9 +1,15 @@
 """Live messaging runtime and bridge for ADK agent."""
+import asyncio
+import collections
+import logging
+import time
+from uuid import uuid4
 from typing import AsyncGenerator, Awaitable, Callable, Literal
 from google.adk.agents.run_config import RunConfig, StreamingMode
-from google.adk.events import Event
-from google.adk.runners import InMemoryRunner
-from google.adk.agents.live_request_queue import LiveRequestQueue
+from google.adk.events import Event, EventActions
+from google.adk.runners import InMemoryRunner, Runner
+from google.adk.sessions import Session
+from google.adk.agents.live_request_queue import LiveRequest, LiveRequestQueue
 from google.genai import types
 from google.genai.types import Part, Blob, Content
 from pydantic import BaseModel, Field
@@ -15,26 +21,124 @@ def text_to_content(text: str, role: Literal["user", "model"] = "user") -> Conte
 
 
 
+logger = logging.getLogger(__name__)
+
 APP_NAME = "THE VOICE AGENT"
 LiveEvents = AsyncGenerator[Event, None]
 
-async def start_agent_session_with_agent(
-    user_id: str, session_id: str, agent, agent_name: str = APP_NAME
-) -> tuple[LiveEvents, LiveRequestQueue]:
-    """Starts an agent session with a specific agent"""
-    # Create a Runner
-    runner = InMemoryRunner(
-        agent=agent,
-        app_name=agent_name,
-        plugins=[]
-    )
-    
-    # Create a Session
+# Session state key holding the Twilio callSid of the call a session serves
+CALL_SID_STATE = "twilio_call_sid"
+
+async def _create_warm_session(
+    agent,
+    agent_name: str,
+    user_id: str | None = None,
+    session_id: str | None = None,
+    runner: Runner | None = None,
+    request_queue: Callable[[], LiveRequestQueue] = LiveRequestQueue,
+    state: dict | None = None,
+) -> "WarmSession":
+    """Builds a Session and ``request_queue()`` on ``runner`` without starting run_live"""
+    # Without a shared Runner, build a throwaway one for this session
+    if runner is None:
+        runner = InMemoryRunner(
+            agent=agent,
+            app_name=agent_name,
+            plugins=[]
+        )
+    # Create a Session under the Runner's app name, where run_live looks it up
     session = await runner.session_service.create_session(
-        app_name=APP_NAME,
-        user_id=user_id,
+        app_name=runner.app_name,
+        user_id=user_id or uuid4().hex,
         session_id=session_id,
+        state=state,
+    )
+    return WarmSession(runner=runner, live_request_queue=request_queue(), session=session)
+
+async def end_agent_session(warm: "WarmSession"):
+    """Closes a call's LiveRequestQueue and deletes its session from the shared service"""
+    warm.live_request_queue.close()
+    if warm.connection is not None:
+        # Closing the queue ends run_live; give it a moment to close the model connection
+        done, _ = await asyncio.wait([warm.connection], timeout=2.0)
+        if not done:
+            warm.connection.cancel()
+    await warm.runner.session_service.delete_session(
+        app_name=warm.session.app_name,
+        user_id=warm.session.user_id,
+        session_id=warm.session.id,
+    )
+
+async def _seed_greeting(warm: "WarmSession", agent, greeting: str):
+    """
+    Records a greeting the caller already heard as the agent's first turn.
+    run_live replays session history on connect, and the model waits for the
+    caller instead of greeting again when the last turn is its own.
+    """
+    await warm.runner.session_service.append_event(
+        warm.session,
+        Event(author=agent.name, content=Content(role="model", parts=[Part(text=greeting)])),
+    )
+
+async def _bind_call(warm: "WarmSession", call_sid: str):
+    """Records ``call_sid`` in the state of a session created before the call"""
+    await warm.runner.session_service.append_event(
+        warm.session,
+        Event(author="user", actions=EventActions(state_delta={CALL_SID_STATE: call_sid})),
     )
+
+def _open_live_connection(warm: "WarmSession", run_config: RunConfig | None = None):
+    """
+    Starts run_live in the background so the model connection is open before
+    a call binds the session. Events are buffered until read from
+    ``warm.live_events``.
+    """
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def read():
+        try:
+            async for event in warm.runner.run_live(
+                live_request_queue=warm.live_request_queue,
+                run_config=run_config,
+                session=warm.session,
+            ):
+                events.put_nowait(event)
+        except Exception as ex:
+            logger.warning(f"Live connection of warm session {warm.session.id} failed: {ex}")
+            events.put_nowait(ex)
+        finally:
+            events.put_nowait(None)
+
+    async def replay() -> LiveEvents:
+        while (event := await events.get()) is not None:
+            if isinstance(event, Exception):
+                raise event
+            yield event
+
+    warm.connection = asyncio.create_task(read())
+    warm.live_events = replay()
+
+async def start_agent_session_with_agent(
+    user_id: str,
+    session_id: str,
+    agent,
+    agent_name: str = APP_NAME,
+    greeting: str | None = None,
+    runner: Runner | None = None,
+    run_config: RunConfig | None = None,
+    request_queue: Callable[[], LiveRequestQueue] = LiveRequestQueue,
+) -> tuple[LiveEvents, LiveRequestQueue, "WarmSession"]:
+    """
+    Starts an agent session with a specific agent, on ``runner`` when given.
+    ``request_queue`` builds its LiveRequestQueue, e.g. a BoundedLiveRequestQueue.
+    Pass the returned WarmSession to ``end_agent_session`` when the call ends.
+    """
+    warm = await _create_warm_session(
+        agent, agent_name, user_id=user_id, session_id=session_id, runner=runner,
+        request_queue=request_queue,
+    )
+    if greeting:
+        await _seed_greeting(warm, agent, greeting)
     ''' 
     speech_config = types.SpeechConfig(
         voice_config=types.VoiceConfig(
@@ -67,20 +171,17 @@ async def start_agent_session_with_agent(
     )
     ''' 
 
-    live_request_queue = LiveRequestQueue()
-    
-    run_config = None
-    live_events = runner.run_live(
-        live_request_queue=live_request_queue,
+    live_events = warm.runner.run_live(
+        live_request_queue=warm.live_request_queue,
         run_config=run_config,
-        session=session,
+        session=warm.session,
     )
     
-    return live_events, live_request_queue
+    return live_events, warm.live_request_queue, warm
 
 async def start_agent_session(
     user_id: str, session_id: str
-) -> tuple[LiveEvents, LiveRequestQueue]:
+) -> tuple[LiveEvents, LiveRequestQueue, "WarmSession"]:
     return await start_agent_session_with_agent(user_id, session_id, root_agent)
 
 class AgentInterruptedEvent(BaseModel):
@@ -96,59 +197,281 @@ class AgentDataEvent(BaseModel):
     type: Literal["data"] = "data"
 
 AgentEvent = AgentInterruptedEvent | AgentTurnCompleteEvent | AgentDataEvent
-OnAgentEvent = Callable[[AgentEvent], Awaitable[None]]
 
-async def agent_to_client_messaging(
-    on_agent_event: OnAgentEvent, live_events: LiveEvents
-) -> None:
+class LiveAgentEvent:
     """
-    Agent to client communication.
-    Sends events to the client via the on_event callback.
-    To be used in parallel with webhook loop.
-    
+    The bridge's internal form of an AgentEvent. The model sends dozens of
+    audio chunks per second, and a slotted object with a type tag costs a
+    fraction of a validated pydantic model. ``to_model`` converts it for
+    anything that needs the public AgentEvent types. ``received`` is the
+    ``time.perf_counter()`` at which the bridge read it from the model.
+    """
+
+    __slots__ = ("type", "payload", "timestamp", "received")
+
+    def __init__(
+        self,
+        type: Literal["data", "interrupted", "complete"],
+        payload: bytes = b"",
+        timestamp: float = 0.0,
+        received: float | None = None,
+    ):
+        self.type = type
+        self.payload = payload
+        self.timestamp = timestamp
+        self.received = time.perf_counter() if received is None else received
+
+    def __repr__(self) -> str:
+        return f"LiveAgentEvent({self.type!r}, {len(self.payload)} bytes, {self.timestamp})"
+
+    def to_model(self) -> AgentEvent:
+        if self.type == "data":
+            return AgentDataEvent(payload=self.payload)
+        if self.type == "interrupted":
+            return AgentInterruptedEvent(timestamp=self.timestamp)
+        return AgentTurnCompleteEvent(timestamp=self.timestamp)
+
+OnAgentEvent = Callable[[LiveAgentEvent], Awaitable[None]]
+
+OVERFLOW_POLICIES = ("drop_oldest", "merge")
+
+class AudioBacklogQueue(asyncio.Queue):
+    """
+    An asyncio.Queue holding at most ``max_ms`` of audio. Items without
+    audio, such as control messages, are never dropped and do not count
+    towards the bound. When new audio would exceed it, ``overflow`` decides:
+
+    - ``"drop_oldest"`` drops the oldest queued audio, keeping latency bounded.
+    - ``"merge"`` appends the new audio to the newest queued audio item while
+      a backlog exists, so the consumer catches up with fewer, larger items;
+      past the bound the oldest audio is still dropped.
+
+    Merged items grow to at most ``MAX_MERGED_MS`` of audio. Puts never
+    wait, so a slow consumer cannot stall the producer.
+
     Args:
-        on_agent_event: Async callback invoked per AgentEvent.
-        live_events: Async generator of ADK Event objects to send to client.
+        max_ms: int - Audio kept at most (0 = no limit)
+        overflow: str - One of OVERFLOW_POLICIES
+        bytes_per_ms: int - Audio bytes per millisecond, e.g. 32 for 16-bit 16kHz
+        audio_of: Callable - The audio bytes of an item, or None for other items
+        with_audio: Callable - A copy of an audio item carrying other bytes
     """
+
+    MAX_MERGED_MS = 1000
+
+    def __init__(
+        self,
+        max_ms: int,
+        overflow: str,
+        bytes_per_ms: int,
+        audio_of: Callable[[object], bytes | None],
+        with_audio: Callable[[object, bytes], object],
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}', expected one of {OVERFLOW_POLICIES}")
+        super().__init__()
+        self.max_bytes = max_ms * bytes_per_ms
+        self.max_merged_bytes = self.MAX_MERGED_MS * bytes_per_ms
+        self.overflow = overflow
+        self.bytes_per_ms = bytes_per_ms
+        self._audio_of = audio_of
+        self._with_audio = with_audio
+        self._bytes = 0
+        self.max_depth_bytes = 0
+        self.dropped = 0 # Audio items dropped on overflow
+        self.dropped_bytes = 0
+        self.merged = 0
+
+    def metrics(self) -> dict:
+        return {
+            "depth": self.qsize(),
+            "depth_ms": self._bytes // self.bytes_per_ms,
+            "max_depth_ms": self.max_depth_bytes // self.bytes_per_ms,
+            "dropped": self.dropped,
+            "dropped_ms": self.dropped_bytes // self.bytes_per_ms,
+            "merged": self.merged,
+        }
+
+    def _put(self, item):
+        audio = self._audio_of(item)
+        if audio is None:
+            self._queue.append(item)
+            return
+        tail = self._audio_of(self._queue[-1]) if self.overflow == "merge" and self._queue else None
+        if tail is not None and len(tail) < self.max_merged_bytes:
+            self._queue[-1] = self._with_audio(self._queue[-1], tail + audio)
+            self.merged += 1
+        else:
+            self._queue.append(item)
+        self._bytes += len(audio)
+        if self.max_bytes and self._bytes > self.max_bytes:
+            self._drop_oldest()
+        self.max_depth_bytes = max(self.max_depth_bytes, self._bytes)
+
+    def _drop_oldest(self):
+        """Drop audio from the head until the backlog fits, never the newest item."""
+        for item in list(self._queue)[:-1]:
+            if self._bytes <= self.max_bytes:
+                return
+            audio = self._audio_of(item)
+            if audio is not None:
+                self._queue.remove(item)
+                self._bytes -= len(audio)
+                self.dropped += 1
+                self.dropped_bytes += len(audio)
+
+    def _get(self):
+        item = self._queue.popleft()
+        audio = self._audio_of(item)
+        if audio is not None:
+            self._bytes -= len(audio)
+        return item
+
+    def discard_audio(self) -> int:
+        """Drop every queued audio item, e.g. on barge-in; returns how many."""
+        audio_items = [item for item in self._queue if self._audio_of(item) is not None]
+        for item in audio_items:
+            self._queue.remove(item)
+        self._bytes = 0
+        return len(audio_items)
+
+def _request_audio(request: LiveRequest) -> bytes | None:
+    blob = request.blob
+    if blob is None or not blob.data or not (blob.mime_type or "").startswith("audio/pcm"):
+        return None
+    return blob.data
+
+def _request_with_audio(request: LiveRequest, audio: bytes) -> LiveRequest:
+    return LiveRequest(blob=Blob(data=audio, mime_type=request.blob.mime_type))
+
+class BoundedLiveRequestQueue(LiveRequestQueue):
+    """
+    A LiveRequestQueue that holds at most ``max_ms`` of realtime audio for
+    the model. It fills when the model connection sends slower than the
+    caller speaks; ``overflow`` then drops or merges caller audio instead of
+    letting the backlog, and its latency, grow for the rest of the call.
+    Content, activity and close requests always go through.
+
+    Args:
+        max_ms: int - Caller audio kept at most
+        overflow: str - "drop_oldest" or "merge", see AudioBacklogQueue
+        sample_rate: int - Rate of the 16-bit PCM sent with ``send_realtime``
+    """
+
+    def __init__(self, max_ms: int = 2000, overflow: str = "drop_oldest", sample_rate: int = 16000):
+        super().__init__()
+        self._queue = AudioBacklogQueue(
+            max_ms, overflow, sample_rate * 2 // 1000, _request_audio, _request_with_audio
+        )
+
+    def metrics(self) -> dict:
+        return self._queue.metrics()
+
+def _event_audio(event: LiveAgentEvent | None) -> bytes | None:
+    return event.payload if event is not None and event.type == "data" else None
+
+def _event_with_audio(event: LiveAgentEvent, audio: bytes) -> LiveAgentEvent:
+    return LiveAgentEvent("data", audio, received=event.received)
+
+class AgentEventQueue(AudioBacklogQueue):
+    """
+    Bounded queue of LiveAgentEvents between the live session and the Twilio
+    socket, holding at most ``max_ms`` of model audio. Events are read from
+    the model as they arrive, so a slow socket or transcoder no longer holds
+    up the live session. An interruption discards audio still queued, since
+    the caller must not hear it.
+
+    Args:
+        max_ms: int - Model audio kept at most
+        overflow: str - "drop_oldest" or "merge", see AudioBacklogQueue
+        sample_rate: int - Rate of the 16-bit PCM the model sends
+    """
+
+    def __init__(self, max_ms: int = 30_000, overflow: str = "merge", sample_rate: int = 24000):
+        super().__init__(max_ms, overflow, sample_rate * 2 // 1000, _event_audio, _event_with_audio)
+        self.cleared = 0 # Audio items discarded by interruptions
+
+    def _put(self, item):
+        if item is not None and item.type == "interrupted":
+            self.cleared += self.discard_audio()
+        super()._put(item)
+
+    def metrics(self) -> dict:
+        return {**super().metrics(), "cleared": self.cleared}
+
+# Whether a part's mime type is model audio, memoized since the model only
+# ever sends a handful of distinct ones
+_AUDIO_MIME_TYPES: dict[str, bool] = {}
+
+def _is_audio_mime(mime_type: str) -> bool:
+    is_audio = _AUDIO_MIME_TYPES.get(mime_type)
+    if is_audio is None:
+        is_audio = mime_type.startswith("audio/pcm")
+        if len(_AUDIO_MIME_TYPES) < 64:
+            _AUDIO_MIME_TYPES[mime_type] = is_audio
+    return is_audio
+
+async def _agent_events(live_events: LiveEvents) -> AsyncGenerator[LiveAgentEvent, None]:
+    """Translates ADK Events into the LiveAgentEvents the bridge handles."""
     async for event in live_events:
-        message: AgentEvent
-        
         if event.turn_complete:
-            message = AgentTurnCompleteEvent(timestamp=event.timestamp)
-            await on_agent_event(message)
+            yield LiveAgentEvent("complete", timestamp=event.timestamp)
             continue
             
         if event.interrupted:
-            message = AgentInterruptedEvent(timestamp=event.timestamp)
-            await on_agent_event(message)
+            yield LiveAgentEvent("interrupted", timestamp=event.timestamp)
             continue
             
-        if not event.content or not event.content.parts:
+        content = event.content
+        if not content or not content.parts:
             # print("Agent sent empty content", event)
             continue
             
-        for part in event.content.parts:
-            is_text = hasattr(part, "text") and part.text is not None
-            is_audio = (
-                part.inline_data
-                and part.inline_data.mime_type
-                and part.inline_data.mime_type.startswith("audio/pcm")
-            )
-            
-            if is_audio:
-                audio_data = part.inline_data and part.inline_data.data
-                if not audio_data:
-                    continue
-                message = AgentDataEvent(payload=audio_data)
-                await on_agent_event(message)
-                continue
-                
-            elif is_text:
+        for part in content.parts:
+            inline_data = part.inline_data
+            if inline_data is not None and inline_data.mime_type and _is_audio_mime(inline_data.mime_type):
+                if inline_data.data:
+                    yield LiveAgentEvent("data", inline_data.data)
+            elif part.text is not None:
                 # print(part.text, end="", flush=True)
                 continue
             else:
                 print("Unknown event content part", event)
 
+async def agent_to_client_messaging(
+    on_agent_event: OnAgentEvent, live_events: LiveEvents, queue: AgentEventQueue | None = None
+) -> None:
+    """
+    Agent to client communication.
+    Sends events to the client via the on_event callback.
+    To be used in parallel with webhook loop.
+    
+    Args:
+        on_agent_event: Async callback invoked per LiveAgentEvent.
+        live_events: Async generator of ADK Event objects to send to client.
+        queue: AgentEventQueue - When given, events are read into it in the
+            background and the callback drains it at its own pace.
+    """
+    if queue is None:
+        async for message in _agent_events(live_events):
+            await on_agent_event(message)
+        return
+
+    async def read_events():
+        try:
+            async for message in _agent_events(live_events):
+                queue.put_nowait(message)
+        finally:
+            queue.put_nowait(None) # End of the live session
+
+    reader = asyncio.create_task(read_events())
+    try:
+        while (message := await queue.get()) is not None:
+            await on_agent_event(message)
+        await reader # Re-raises an error from the live session
+    finally:
+        reader.cancel()
+
 def send_pcm_to_agent(pcm_audio: bytes, live_request_queue: LiveRequestQueue):
     """
     Sends audio data to the agent.
@@ -161,3 +484,254 @@ def send_pcm_to_agent(pcm_audio: bytes, live_request_queue: LiveRequestQueue):
     live_request_queue.send_realtime(
         Blob(data=pcm_audio, mime_type="audio/pcm;rate=16000")
     )
+
+
+class PcmCoalescer:
+    """
+    Packs inbound PCM into fewer, larger realtime sends.
+    Twilio delivers 20 ms frames; each one would otherwise become its own Blob
+    and LiveRequestQueue.send_realtime call. Audio is held until ``coalesce_ms``
+    is buffered, and a deadline timer flushes a partial buffer after
+    ``max_delay_ms`` so latency stays bounded when frames stop arriving.
+    With ``coalesce_ms=0`` every frame is sent straight through.
+
+    Args:
+        live_request_queue: LiveRequestQueue - The live request queue to send audio to
+        coalesce_ms: int - Milliseconds of audio to pack per realtime send
+        max_delay_ms: int - Longest time buffered audio may wait, defaults to coalesce_ms
+        sample_rate: int - Input PCM rate (16-bit mono)
+    """
+
+    def __init__(
+        self,
+        live_request_queue: LiveRequestQueue,
+        coalesce_ms: int = 0,
+        max_delay_ms: int | None = None,
+        sample_rate: int = 16000,
+    ):
+        self.live_request_queue = live_request_queue
+        self.target_bytes = sample_rate * 2 * coalesce_ms // 1000
+        self.max_delay = (coalesce_ms if max_delay_ms is None else max_delay_ms) / 1000
+        self._buffer = bytearray()
+        self._deadline: asyncio.TimerHandle | None = None
+        self.sends = 0
+
+    def send(self, pcm_audio: bytes):
+        if not self.target_bytes:
+            self.sends += 1
+            return send_pcm_to_agent(pcm_audio, self.live_request_queue)
+
+        self._buffer += pcm_audio
+        if len(self._buffer) >= self.target_bytes:
+            self.flush()
+        elif self._deadline is None:
+            self._deadline = asyncio.get_running_loop().call_later(self.max_delay, self.flush)
+
+    def flush(self):
+        """Send whatever is buffered now, e.g. on deadline or end of call."""
+        if self._deadline is not None:
+            self._deadline.cancel()
+            self._deadline = None
+        if self._buffer:
+            self.sends += 1
+            send_pcm_to_agent(bytes(self._buffer), self.live_request_queue)
+            self._buffer.clear()
+
+    def close(self):
+        """Drop buffered audio and cancel the deadline timer."""
+        if self._deadline is not None:
+            self._deadline.cancel()
+            self._deadline = None
+        self._buffer.clear()
+
+
+class WarmSession(BaseModel):
+    """A session with its runner and LiveRequestQueue, and for pooled entries its open live connection"""
+    model_config = {"arbitrary_types_allowed": True}
+
+    runner: Runner
+    live_request_queue: LiveRequestQueue
+    session: Session
+    greeting: str | None = None
+    run_config: RunConfig | None = None
+    live_events: object | None = None
+    connection: asyncio.Task | None = None
+    created_at: float = Field(default_factory=time.monotonic)
+
+class LiveSessionPool:
+    """
+    Keeps ``size`` live sessions per agent ready so a call does not wait for
+    session setup and the model connection after Twilio's `start` event.
+    Each entry's session is created, seeded with the agent's greeting and
+    connected with run_live in the background. A call then only records its
+    ``callSid`` in the session state, under ``CALL_SID_STATE``; on a miss the
+    session is built as usual with the ``callSid`` as its ID.
+    Every ready entry holds an open model connection. Entries older than
+    ``ttl`` seconds, whose connection closed, or warmed with another greeting
+    or run config are recycled, and the pool is refilled in the background
+    after every acquire. An agent's pool is created on its first ``acquire``
+    or by an explicit ``warm``.
+
+    Args:
+        size: int - Ready sessions kept per agent
+        ttl: float - Seconds before an unused session is recycled
+        request_queue: Callable - Builds each session's LiveRequestQueue
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        ttl: float = 300.0,
+        request_queue: Callable[[], LiveRequestQueue] = LiveRequestQueue,
+    ):
+        self.size = size
+        self.ttl = ttl
+        self.request_queue = request_queue
+        self._ready: dict[str, collections.deque[WarmSession]] = {}
+        self._agents: dict[str, object] = {}
+        self._runners: dict[str, Runner | None] = {}
+        self._settings: dict[str, tuple[str | None, RunConfig | None]] = {}
+        self._maintainers: dict[str, asyncio.Task] = {}
+        self._wakeups: dict[str, asyncio.Event] = {}
+        self._closed = False
+        self.hits = 0
+        self.misses = 0
+        self.recycled = 0
+
+    def metrics(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "recycled": self.recycled,
+            "ready": {agent_name: len(ready) for agent_name, ready in self._ready.items()},
+        }
+
+    def warm(
+        self,
+        agent,
+        agent_name: str,
+        runner: Runner | None = None,
+        greeting: str | None = None,
+        run_config: RunConfig | None = None,
+    ):
+        """Start keeping ready sessions for ``agent_name``, seeded with ``greeting`` and connected with ``run_config``."""
+        if self._settings.get(agent_name, (greeting, run_config)) != (greeting, run_config):
+            self._settings[agent_name] = (greeting, run_config)
+            self._wakeups[agent_name].set() # Replace the entries warmed with the old settings
+        if agent_name in self._maintainers and not self._maintainers[agent_name].done():
+            return
+        self._agents[agent_name] = agent
+        self._runners[agent_name] = runner
+        self._settings[agent_name] = (greeting, run_config)
+        self._ready.setdefault(agent_name, collections.deque())
+        self._wakeups[agent_name] = asyncio.Event()
+        self._maintainers[agent_name] = asyncio.create_task(self._maintain(agent_name))
+
+    async def acquire(
+        self,
+        call_sid: str,
+        agent,
+        agent_name: str,
+        user_id: str | None = None,
+        greeting: str | None = None,
+        runner: Runner | None = None,
+        run_config: RunConfig | None = None,
+    ) -> tuple[LiveEvents, LiveRequestQueue, WarmSession]:
+        """
+        Bind a ready session to ``call_sid``, building and starting one on a miss.
+        ``user_id`` only applies on a miss, as ready sessions predate the call.
+        Pass the returned WarmSession to ``end_agent_session`` when the call ends.
+        """
+        self.warm(agent, agent_name, runner=runner, greeting=greeting, run_config=run_config)
+        warm = self._take(agent_name)
+        self._wakeups[agent_name].set()
+        if warm is not None:
+            self.hits += 1
+            await _bind_call(warm, call_sid)
+            logger.debug(f"Session {warm.session.id} bound to call {call_sid}")
+            return warm.live_events, warm.live_request_queue, warm
+
+        self.misses += 1
+        warm = await _create_warm_session(
+            agent, agent_name, user_id=user_id or call_sid, session_id=call_sid, runner=runner,
+            request_queue=self.request_queue, state={CALL_SID_STATE: call_sid},
+        )
+        if greeting:
+            await _seed_greeting(warm, agent, greeting)
+        live_events = warm.runner.run_live(
+            live_request_queue=warm.live_request_queue,
+            run_config=run_config,
+            session=warm.session,
+        )
+        return live_events, warm.live_request_queue, warm
+
+    def _usable(self, agent_name: str, warm: WarmSession) -> bool:
+        return (
+            time.monotonic() - warm.created_at < self.ttl
+            and not warm.connection.done()
+            and (warm.greeting, warm.run_config) == self._settings[agent_name]
+        )
+
+    def _take(self, agent_name: str) -> WarmSession | None:
+        ready = self._ready[agent_name]
+        while ready:
+            warm = ready.popleft()
+            if self._usable(agent_name, warm):
+                return warm
+            self._discard(warm)
+        return None
+
+    def _discard(self, warm: WarmSession):
+        self.recycled += 1
+        asyncio.create_task(end_agent_session(warm))
+
+    async def _prepare(self, agent_name: str) -> WarmSession:
+        """Create, seed and connect one ready session with the agent's current settings."""
+        agent = self._agents[agent_name]
+        greeting, run_config = self._settings[agent_name]
+        warm = await _create_warm_session(
+            agent, agent_name, runner=self._runners[agent_name], request_queue=self.request_queue,
+        )
+        warm.greeting, warm.run_config = greeting, run_config
+        if greeting:
+            await _seed_greeting(warm, agent, greeting)
+        _open_live_connection(warm, run_config)
+        return warm
+
+    async def _maintain(self, agent_name: str):
+        """Refill the agent's pool and recycle stale entries until closed."""
+        ready = self._ready[agent_name]
+        wakeup = self._wakeups[agent_name]
+        # wait_for may swallow a cancel that lands as it completes, so close()
+        # also sets a flag the loop checks
+        while not self._closed:
+            wakeup.clear()
+            for warm in [warm for warm in ready if not self._usable(agent_name, warm)]:
+                ready.remove(warm)
+                self._discard(warm)
+            while len(ready) < self.size and not self._closed:
+                try:
+                    ready.append(await self._prepare(agent_name))
+                except Exception as ex:
+                    logger.warning(f"Could not pre-warm a session for {agent_name}: {ex}")
+                    break
+            timeout = self.ttl - (time.monotonic() - ready[0].created_at) if ready else self.ttl
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=max(timeout, 0))
+            except asyncio.TimeoutError:
+                pass
+
+    async def close(self):
+        """Stop refilling and release every ready session."""
+        self._closed = True
+        for wakeup in self._wakeups.values():
+            wakeup.set()
+        for task in self._maintainers.values():
+            task.cancel()
+        await asyncio.gather(*self._maintainers.values(), return_exceptions=True)
+        self._maintainers.clear()
+        released = []
+        for ready in self._ready.values():
+            while ready:
+                released.append(end_agent_session(ready.popleft()))
+        await asyncio.gather(*released, return_exceptions=True)
@@ -0,0 +1,224 @@
+"""Outbound audio framing and pacing for Twilio Media Streams."""
+import asyncio
+import collections
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+# Twilio plays 8kHz 8-bit u-law: 160 bytes is one 20 ms frame
+FRAME_BYTES = 160
+FRAME_SECONDS = 0.020
+ULAW_SILENCE = b"\xff"
+
+SendFrame = Callable[[bytes], Awaitable[None]]
+SendMark = Callable[[str], Awaitable[None]]
+
+@dataclass
+class TurnPlayback:
+    """How much of one agent turn was queued, sent and confirmed played."""
+    turn: int
+    frames_queued: int = 0
+    frames_sent: int = 0
+    frames_heard: int = 0 # Last position Twilio acknowledged with a mark
+    interrupted: bool = False
+
+    @property
+    def heard_ms(self) -> int:
+        """Audio the caller is known to have heard."""
+        return int(self.frames_heard * FRAME_SECONDS * 1000)
+
+    @property
+    def unheard_ms(self) -> int:
+        """Audio queued for the turn that was not confirmed played."""
+        return int((self.frames_queued - self.frames_heard) * FRAME_SECONDS * 1000)
+
+class OutboundScheduler:
+    """
+    Splits transcoded u-law into exact 20 ms frames and paces them to Twilio.
+    Model audio arrives in bursts much faster than real time. Sending it as it
+    comes fills Twilio's playout buffer, so a barge-in has seconds of audio
+    to clear. Instead, frames wait in a bounded local queue. Up to
+    ``burst_ms`` of audio may be ahead of the caller's playout at any time.
+    That gives a fast start and absorbs network jitter, and after that frames
+    go out at real time.
+
+    When ``send_mark`` is given, a Twilio `mark` named ``"<turn>:<frames>"``
+    follows every ``mark_every_ms`` of audio and the end of each turn. Twilio
+    echoes a mark once the audio before it has played, so ``acknowledge``
+    keeps the heard/unheard boundary of each turn in ``turns``.
+
+    Args:
+        send_frame: Async callback sending one u-law frame to Twilio.
+        send_mark: Async callback sending a Twilio mark with the given name.
+        burst_ms: How far ahead of real-time playout Twilio may be fed.
+        max_queued_ms: Bound on queued audio; ``put`` waits when it is full.
+        mark_every_ms: Spacing of playback marks within a turn.
+    """
+
+    MAX_TURNS = 16 # Playback history kept per call
+
+    def __init__(
+        self,
+        send_frame: SendFrame,
+        send_mark: SendMark | None = None,
+        burst_ms: int = 200,
+        max_queued_ms: int = 30_000,
+        mark_every_ms: int = 200,
+    ):
+        self.send_frame = send_frame
+        self.send_mark = send_mark
+        # At least one frame must be allowed in flight
+        self.burst = max(burst_ms / 1000, FRAME_SECONDS)
+        self.max_queued_frames = max(1, max_queued_ms // int(FRAME_SECONDS * 1000))
+        self.mark_every_frames = max(1, mark_every_ms // int(FRAME_SECONDS * 1000))
+        # (turn, frame) items; a None frame marks the end of that turn
+        self._frames: collections.deque[tuple[int, bytes | None]] = collections.deque()
+        self._queued_frames = 0
+        self._partial = b""
+        self._generation = 0
+        self._has_frames = asyncio.Event()
+        self._has_room = asyncio.Event()
+        self._has_room.set()
+        # Monotonic time at which Twilio finishes playing what was sent so far
+        self._playout_end = 0.0
+        self._pending_marks: set[str] = set()
+        self.turn = 0
+        self.turns: collections.OrderedDict[int, TurnPlayback] = collections.OrderedDict()
+        self.interrupted_turns: list[TurnPlayback] = [] # Cut short by the last clear()
+        self.frames_sent = 0
+
+    @property
+    def queued_frames(self) -> int:
+        return self._queued_frames
+
+    def _playback(self, turn: int) -> TurnPlayback:
+        playback = self.turns.get(turn)
+        if playback is None:
+            playback = self.turns[turn] = TurnPlayback(turn)
+            while len(self.turns) > self.MAX_TURNS:
+                self.turns.popitem(last=False)
+        return playback
+
+    def _enqueue(self, frame: bytes | None):
+        self._frames.append((self.turn, frame))
+        if frame is not None:
+            self._queued_frames += 1
+            self._playback(self.turn).frames_queued += 1
+        self._has_frames.set()
+
+    async def put(self, ulaw: bytes):
+        """Queue u-law audio, waiting while the queue is full.
+
+        Any bytes-like input works; frames of a memory-mapped buffer are
+        queued as views without copying.
+        """
+        data = self._partial + bytes(ulaw) if self._partial else ulaw
+        end = len(data) - len(data) % FRAME_BYTES
+        self._partial = bytes(data[end:])
+        generation = self._generation
+        for start in range(0, end, FRAME_BYTES):
+            while self._queued_frames >= self.max_queued_frames:
+                self._has_room.clear()
+                await self._has_room.wait()
+            if generation != self._generation:
+                return # Cleared by a barge-in while waiting for room
+            self._enqueue(data[start:start + FRAME_BYTES])
+
+    def flush_partial(self):
+        """Pad the trailing partial frame with silence and queue it."""
+        if self._partial:
+            self._enqueue(self._partial.ljust(FRAME_BYTES, ULAW_SILENCE))
+            self._partial = b""
+
+    def end_turn(self):
+        """Close the current turn: flush its partial frame and mark its end."""
+        self.flush_partial()
+        if self.send_mark and self.turn in self.turns:
+            self._enqueue(None)
+        self.turn += 1
+
+    def clear(self) -> int:
+        """Drop all unsent audio at once and return how many frames were dropped."""
+        dropped = self._queued_frames
+        self._frames.clear()
+        self._queued_frames = 0
+        self._partial = b""
+        self._generation += 1
+        self.interrupted_turns = [
+            playback for playback in self.turns.values()
+            if not playback.interrupted and playback.frames_heard < playback.frames_queued
+        ]
+        for playback in self.interrupted_turns:
+            playback.interrupted = True
+        self.turn += 1
+        # The caller sends Twilio a `clear`, which empties its playout buffer
+        # too and echoes the pending marks even though that audio never played
+        self._pending_marks.clear()
+        self._playout_end = time.monotonic()
+        self._has_room.set()
+        return dropped
+
+    def acknowledge(self, name: str) -> TurnPlayback | None:
+        """Record a mark echoed by Twilio; returns the turn it advanced, if any."""
+        if name not in self._pending_marks:
+            return None
+        self._pending_marks.discard(name)
+        turn, frames = (int(value) for value in name.split(":"))
+        playback = self.turns.get(turn)
+        if playback is not None:
+            playback.frames_heard = max(playback.frames_heard, frames)
+        return playback
+
+    async def _mark(self, playback: TurnPlayback):
+        name = f"{playback.turn}:{playback.frames_sent}"
+        self._pending_marks.add(name)
+        await self.send_mark(name)
+
+    async def run(self):
+        """Send queued frames for the rest of the call."""
+        while True:
+            if not self._frames:
+                self._has_frames.clear()
+                await self._has_frames.wait()
+                continue
+
+            turn, frame = self._frames[0]
+            if frame is None:
+                # End of turn: mark the final position unless a mark just did
+                self._frames.popleft()
+                playback = self.turns.get(turn)
+                if playback and playback.frames_sent % self.mark_every_frames:
+                    await self._mark(playback)
+                continue
+
+            now = time.monotonic()
+            # Lead over real time once this frame is sent
+            lead = max(self._playout_end - now, 0.0) + FRAME_SECONDS
+            if lead > self.burst:
+                await asyncio.sleep(lead - self.burst)
+                continue
+
+            self._frames.popleft()
+            self._queued_frames -= 1
+            self._has_room.set()
+            self._playout_end = max(self._playout_end, now) + FRAME_SECONDS
+            self.frames_sent += 1
+            playback = self._playback(turn)
+            playback.frames_sent += 1
+            await self.send_frame(frame)
+            if self.send_mark and playback.frames_sent % self.mark_every_frames == 0:
+                await self._mark(playback)
+
+async def finish_turn(outbound: OutboundScheduler, transcoder) -> None:
+    """
+    End the model's turn on ``outbound`` after queueing the audio still held
+    in ``transcoder``'s outbound resampler. soxr holds back about 16 ms of
+    output, which would otherwise be heard at the start of the next reply.
+    Threaded transcoders return a future, which is awaited.
+    """
+    tail = transcoder.flush_outbound()
+    if asyncio.isfuture(tail):
+        tail = await tail
+    if tail:
+        await outbound.put(tail)
+    outbound.end_turn()
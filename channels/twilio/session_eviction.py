@@ -0,0 +1,216 @@
+"""Bounded session storage for long-running workers."""
+import asyncio
+import collections
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+
+logger = logging.getLogger(__name__)
+
+SessionKey = tuple[str, str, str] # (app_name, user_id, session_id)
+
+EVENT_OVERHEAD_BYTES = 256 # Rough per-event cost of ids, timestamps and actions
+
+def event_size(event: Event) -> int:
+    """Cheap estimate of the memory an event holds, without serialising it"""
+    size = EVENT_OVERHEAD_BYTES
+    if event.content and event.content.parts:
+        for part in event.content.parts:
+            if part.text:
+                size += len(part.text)
+            if part.inline_data and part.inline_data.data:
+                size += len(part.inline_data.data)
+    if event.actions and event.actions.state_delta:
+        size += sum(len(str(value)) for value in event.actions.state_delta.values())
+    return size
+
+@dataclass
+class _Tracked:
+    last_access: float
+    events: int = 0
+    bytes: int = 0
+
+class EvictingSessionService(BaseSessionService):
+    """
+    Wraps a session service and evicts sessions so that its footprint stays
+    flat however many calls a worker serves. Sessions idle for ``ttl``
+    seconds are swept, at most every ``sweep_interval`` seconds, as sessions
+    are created or written. Past ``max_sessions`` sessions or ``max_events``
+    events in total, the least recently used sessions go first. The session
+    being written to is never evicted by its own write.
+
+    With ``archive_dir`` set, an evicted session is written there as JSON
+    before it is deleted from the wrapped service.
+
+    Args:
+        inner: BaseSessionService - The service that stores the sessions
+        ttl: float - Seconds a session may stay idle
+        max_sessions: int - Sessions kept at most (0 = no limit)
+        max_events: int - Events kept at most across all sessions (0 = no limit)
+        archive_dir: str - Where evicted sessions are archived, if anywhere
+        sweep_interval: float - Minimum seconds between TTL sweeps
+    """
+
+    def __init__(
+        self,
+        inner: BaseSessionService,
+        ttl: float = 3600.0,
+        max_sessions: int = 1000,
+        max_events: int = 100_000,
+        archive_dir: str | None = None,
+        sweep_interval: float = 30.0,
+    ):
+        self.inner = inner
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_events = max_events
+        self.archive_dir = archive_dir
+        self.sweep_interval = sweep_interval
+        self._tracked: collections.OrderedDict[SessionKey, _Tracked] = collections.OrderedDict()
+        self._events = 0
+        self._bytes = 0
+        self._last_sweep = time.monotonic()
+        self.evicted = collections.Counter() # By reason: ttl, sessions, events
+        self.archived = 0
+
+    def metrics(self) -> dict:
+        return {
+            "sessions": len(self._tracked),
+            "events": self._events,
+            "bytes": self._bytes,
+            "evicted": dict(self.evicted),
+            "archived": self.archived,
+        }
+
+    def _touch(self, key: SessionKey) -> _Tracked:
+        tracked = self._tracked.get(key)
+        if tracked is None:
+            tracked = self._tracked[key] = _Tracked(time.monotonic())
+        else:
+            tracked.last_access = time.monotonic()
+            self._tracked.move_to_end(key)
+        return tracked
+
+    def _untrack(self, key: SessionKey):
+        tracked = self._tracked.pop(key, None)
+        if tracked is not None:
+            self._events -= tracked.events
+            self._bytes -= tracked.bytes
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session = await self.inner.create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        key = (app_name, user_id, session.id)
+        self._touch(key)
+        await self._enforce(keep=key)
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        session = await self.inner.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        key = (app_name, user_id, session_id)
+        if session is not None:
+            tracked = self._touch(key)
+            if not tracked.events and session.events:
+                # Created before this service wrapped the store, e.g. by a restart
+                self._account(tracked, session.events)
+        else:
+            self._untrack(key)
+        return session
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        return await self.inner.list_sessions(app_name=app_name, user_id=user_id)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        self._untrack((app_name, user_id, session_id))
+        await self.inner.delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+
+    async def get_user_state(self, *, app_name: str, user_id: str) -> dict[str, Any]:
+        return await self.inner.get_user_state(app_name=app_name, user_id=user_id)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await self.inner.append_event(session, event)
+        if event.partial:
+            return event
+        key = (session.app_name, session.user_id, session.id)
+        self._account(self._touch(key), [event])
+        await self._enforce(keep=key)
+        return event
+
+    async def flush(self) -> None:
+        await self.inner.flush()
+
+    def _account(self, tracked: _Tracked, events: list[Event]):
+        size = sum(event_size(event) for event in events)
+        tracked.events += len(events)
+        tracked.bytes += size
+        self._events += len(events)
+        self._bytes += size
+
+    async def _enforce(self, keep: SessionKey | None):
+        now = time.monotonic()
+        if now - self._last_sweep >= self.sweep_interval:
+            self._last_sweep = now
+            expired = [key for key, tracked in self._tracked.items() if now - tracked.last_access >= self.ttl]
+            for key in expired:
+                if key != keep:
+                    await self._evict(key, "ttl")
+        # Oldest first: the OrderedDict is kept in access order
+        while self.max_sessions and len(self._tracked) > self.max_sessions:
+            key = next(key for key in self._tracked if key != keep)
+            await self._evict(key, "sessions")
+        while self.max_events and self._events > self.max_events and len(self._tracked) > 1:
+            key = next(key for key in self._tracked if key != keep)
+            await self._evict(key, "events")
+
+    async def sweep(self):
+        """Evicts idle sessions now instead of on the next write."""
+        self._last_sweep = float("-inf")
+        await self._enforce(keep=None)
+
+    async def _evict(self, key: SessionKey, reason: str):
+        if key not in self._tracked:
+            return # Already deleted while an earlier eviction awaited
+        app_name, user_id, session_id = key
+        self._untrack(key)
+        self.evicted[reason] += 1
+        if self.archive_dir:
+            try:
+                session = await self.inner.get_session(app_name=app_name, user_id=user_id, session_id=session_id)
+                if session is not None:
+                    await asyncio.to_thread(self._archive, session)
+                    self.archived += 1
+            except Exception as ex:
+                logger.warning(f"Could not archive session {session_id}: {ex}")
+        await self.inner.delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+        logger.debug(f"Evicted session {session_id} of {app_name} ({reason})")
+
+    def _archive(self, session: Session):
+        directory = os.path.join(self.archive_dir, session.app_name, session.user_id)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{session.id}.json"), "w", encoding="utf-8") as f:
+            f.write(session.model_dump_json())
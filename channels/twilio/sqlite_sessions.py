@@ -0,0 +1,462 @@
+"""SQLite session storage shared by workers, with write-behind batching."""
+import asyncio
+import collections
+import json
+import logging
+import sqlite3
+import threading
+from typing import Any, Optional
+
+from google.adk.errors._stale_session_error import StaleSessionError
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, InMemorySessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+from google.adk.sessions.state import State
+
+logger = logging.getLogger(__name__)
+
+SessionKey = tuple[str, str, str] # (app_name, user_id, session_id)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, id)
+);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_session ON events (app_name, user_id, session_id, seq);
+CREATE TABLE IF NOT EXISTS app_states (
+    app_name TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_states (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id)
+);
+"""
+
+def _split_state_delta(delta: dict[str, Any]) -> tuple[dict, dict, dict]:
+    """Splits a state delta into its app, user and session parts; temp keys are dropped"""
+    app, user, session = {}, {}, {}
+    for name, value in delta.items():
+        if name.startswith(State.APP_PREFIX):
+            app[name.removeprefix(State.APP_PREFIX)] = value
+        elif name.startswith(State.USER_PREFIX):
+            user[name.removeprefix(State.USER_PREFIX)] = value
+        elif not name.startswith(State.TEMP_PREFIX):
+            session[name] = value
+    return app, user, session
+
+def _merge_session_state(db: sqlite3.Connection, key: SessionKey, delta: str, update_time: float):
+    """Applies a JSON state delta to a stored session, keeping keys written by other workers"""
+    if delta != "{}":
+        row = db.execute("SELECT state FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?", key).fetchone()
+        if row is None:
+            return # Deleted meanwhile
+        state = json.loads(row[0])
+        state.update(json.loads(delta))
+        db.execute(
+            "UPDATE sessions SET state = ? WHERE app_name = ? AND user_id = ? AND id = ?", (json.dumps(state), *key)
+        )
+    db.execute(
+        "UPDATE sessions SET update_time = MAX(update_time, ?) WHERE app_name = ? AND user_id = ? AND id = ?",
+        (update_time, *key),
+    )
+
+def _merge_shared_state(db: sqlite3.Connection, table: str, columns: tuple[str, ...], values: tuple, delta: str):
+    """Applies a JSON state delta to an app_states or user_states row"""
+    where = " AND ".join(f"{column} = ?" for column in columns)
+    row = db.execute(f"SELECT state FROM {table} WHERE {where}", values).fetchone()
+    state = json.loads(row[0]) if row else {}
+    state.update(json.loads(delta))
+    db.execute(
+        f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}, state) VALUES ({'?, ' * len(columns)}?)",
+        (*values, json.dumps(state)),
+    )
+
+class SqliteSessionService(BaseSessionService):
+    """
+    Session service backed by a local SQLite file in WAL mode, so that
+    several uvicorn workers can share sessions without a database server.
+
+    Hot sessions are served from an in-process InMemorySessionService, which
+    also provides ADK's state semantics. Sessions missing from it are read
+    through from SQLite, and the least recently used ones are dropped from it
+    past ``cache_size``. Writes are not sent to SQLite one by one. Created
+    sessions, appended events, state changes and deletions are queued in
+    order, then committed in one transaction every ``flush_interval``
+    seconds, or at once past ``max_pending`` queued writes. A tool updating
+    state several times in a turn therefore costs one commit, not one per
+    write. ``flush`` forces a commit, and ``close`` flushes and closes the
+    database.
+
+    Writes reach other workers within ``flush_interval``. Every read or
+    append of a cached session first compares its stored ``update_time``, a
+    single-row SELECT, and reloads the session when another worker wrote it
+    since. State is written as deltas merged into the stored state, so
+    workers writing different keys of one session, or of app and user
+    state, do not overwrite each other. As in ADK's DatabaseSessionService,
+    appending to a session object older than the stored one raises
+    StaleSessionError. Cached app and user state is only refreshed from
+    other workers when a session is loaded.
+
+    Args:
+        path: str - SQLite database file
+        flush_interval: float - Seconds between batched commits
+        cache_size: int - Sessions kept in memory
+        max_pending: int - Queued writes that trigger an immediate commit
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 0.05,
+        cache_size: int = 256,
+        max_pending: int = 1000,
+    ):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.cache_size = cache_size
+        self.max_pending = max_pending
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # Commits survive a process crash; only an OS crash can lose the last ones
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db_lock = threading.Lock()
+        self._cache = InMemorySessionService()
+        self._cached: collections.OrderedDict[SessionKey, None] = collections.OrderedDict()
+        # Ordered writes not yet committed: (sql, params or a callable building
+        # them), or (a function run on the connection, its arguments)
+        self._pending: list[tuple[str, Any]] = []
+        # State deltas and the latest update time not yet written, merged per key
+        self._dirty_sessions: dict[SessionKey, tuple[dict, float]] = {}
+        self._dirty_app_states: dict[str, dict] = {}
+        self._dirty_user_states: dict[tuple[str, str], dict] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flusher: asyncio.Task | None = None
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        self.rows_written = 0
+
+    def metrics(self) -> dict:
+        return {
+            "sessions": len(self._cached),
+            "pending_writes": self.pending_writes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+            "rows_written": self.rows_written,
+        }
+
+    @property
+    def pending_writes(self) -> int:
+        return len(self._pending) + len(self._dirty_sessions) + len(self._dirty_app_states) + len(self._dirty_user_states)
+
+    # -- Cache --------------------------------------------------------------
+
+    def _storage_session(self, key: SessionKey) -> Session | None:
+        app_name, user_id, session_id = key
+        return self._cache.sessions.get(app_name, {}).get(user_id, {}).get(session_id)
+
+    def _touch(self, key: SessionKey):
+        self._cached[key] = None
+        self._cached.move_to_end(key)
+        while len(self._cached) > self.cache_size:
+            app_name, user_id, session_id = old = next(iter(self._cached))
+            del self._cached[old]
+            # Its queued writes hold their own references, so dropping it is safe
+            self._cache.sessions[app_name][user_id].pop(session_id, None)
+
+    def _uncache(self, key: SessionKey):
+        app_name, user_id, session_id = key
+        self._cached.pop(key, None)
+        self._cache.sessions.get(app_name, {}).get(user_id, {}).pop(session_id, None)
+
+    async def _read_through(self, key: SessionKey) -> bool:
+        """
+        Loads a session missing from the cache, or written by another worker
+        since it was cached; returns whether it exists
+        """
+        stale = False
+        cached = self._storage_session(key) if key in self._cached else None
+        if cached is not None:
+            update_time = await asyncio.to_thread(self._update_time, key)
+            # Not stored yet when its creation is still queued
+            if update_time is None or update_time <= cached.last_update_time:
+                self.hits += 1
+                self._touch(key)
+                return True
+            stale = True
+            self.reloads += 1
+        else:
+            self.misses += 1
+        if self.pending_writes:
+            await self.flush() # The stored copy must include what this worker queued
+        loaded = await asyncio.to_thread(self._load, key)
+        if loaded is None:
+            self._uncache(key)
+            return False
+        session, app_state, user_state = loaded
+        if key in self._cached and not stale:
+            return True # Loaded by a concurrent caller meanwhile
+        app_name, user_id, _ = key
+        # Local state may hold writes not flushed yet, so it wins
+        if app_name not in self._cache.app_state and app_state is not None:
+            self._cache.app_state[app_name] = app_state
+        if user_id not in self._cache.user_state.get(app_name, {}) and user_state is not None:
+            self._cache.user_state.setdefault(app_name, {})[user_id] = user_state
+        self._cache.sessions.setdefault(app_name, {}).setdefault(user_id, {})[session.id] = session
+        self._touch(key)
+        return True
+
+    def _update_time(self, key: SessionKey) -> float | None:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT update_time FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?", key
+            ).fetchone()
+        return row[0] if row else None
+
+    def _load(self, key: SessionKey) -> tuple[Session, dict | None, dict | None] | None:
+        app_name, user_id, session_id = key
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT state, update_time FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?", key
+            ).fetchone()
+            if row is None:
+                return None
+            events = self._db.execute(
+                "SELECT data FROM events WHERE app_name = ? AND user_id = ? AND session_id = ? ORDER BY seq", key
+            ).fetchall()
+            app_state = self._db.execute("SELECT state FROM app_states WHERE app_name = ?", (app_name,)).fetchone()
+            user_state = self._db.execute(
+                "SELECT state FROM user_states WHERE app_name = ? AND user_id = ?", (app_name, user_id)
+            ).fetchone()
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=json.loads(row[0]),
+            events=[Event.model_validate_json(data) for (data,) in events],
+            last_update_time=row[1],
+        )
+        return (
+            session,
+            json.loads(app_state[0]) if app_state else None,
+            json.loads(user_state[0]) if user_state else None,
+        )
+
+    # -- BaseSessionService -------------------------------------------------
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        if session_id:
+            # Fails with AlreadyExistsError below if it is stored but not cached
+            await self._read_through((app_name, user_id, session_id.strip()))
+        session = await self._cache.create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        key = (app_name, user_id, session.id)
+        self._touch(key)
+        storage_session = self._storage_session(key)
+        self._queue(
+            "INSERT OR REPLACE INTO sessions (app_name, user_id, id, state, update_time) VALUES (?, ?, ?, ?, ?)",
+            (*key, json.dumps(storage_session.state), storage_session.last_update_time),
+        )
+        app_delta, user_delta, _ = _split_state_delta(state or {})
+        self._mark_shared_state(app_name, user_id, app_delta, user_delta)
+        await self._after_write()
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        if not await self._read_through((app_name, user_id, session_id)):
+            return None
+        return await self._cache.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        await self.flush()
+        rows = await asyncio.to_thread(self._list, app_name, user_id)
+        sessions = []
+        for row_user_id, session_id, state, update_time in rows:
+            state = json.loads(state)
+            for key, value in (self._cache.app_state.get(app_name) or {}).items():
+                state[State.APP_PREFIX + key] = value
+            for key, value in (self._cache.user_state.get(app_name, {}).get(row_user_id) or {}).items():
+                state[State.USER_PREFIX + key] = value
+            sessions.append(Session(
+                app_name=app_name, user_id=row_user_id, id=session_id, state=state, last_update_time=update_time
+            ))
+        return ListSessionsResponse(sessions=sessions)
+
+    def _list(self, app_name: str, user_id: str | None) -> list[tuple]:
+        query = "SELECT user_id, id, state, update_time FROM sessions WHERE app_name = ?"
+        params: tuple = (app_name,)
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params += (user_id,)
+        with self._db_lock:
+            return self._db.execute(query + " ORDER BY update_time, user_id, id", params).fetchall()
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        key = (app_name, user_id, session_id)
+        self._uncache(key)
+        self._dirty_sessions.pop(key, None)
+        self._queue("DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?", key)
+        self._queue("DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?", key)
+        await self._after_write()
+
+    async def get_user_state(self, *, app_name: str, user_id: str) -> dict[str, Any]:
+        if user_id not in self._cache.user_state.get(app_name, {}):
+            row = await asyncio.to_thread(self._user_state, app_name, user_id)
+            if row is not None and user_id not in self._cache.user_state.get(app_name, {}):
+                self._cache.user_state.setdefault(app_name, {})[user_id] = json.loads(row[0])
+        return await self._cache.get_user_state(app_name=app_name, user_id=user_id)
+
+    def _user_state(self, app_name: str, user_id: str):
+        with self._db_lock:
+            return self._db.execute(
+                "SELECT state FROM user_states WHERE app_name = ? AND user_id = ?", (app_name, user_id)
+            ).fetchone()
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        key = (session.app_name, session.user_id, session.id)
+        await self._read_through(key)
+        storage_session = self._storage_session(key)
+        if storage_session is not None and storage_session.last_update_time > session.last_update_time:
+            raise StaleSessionError(
+                "The session has been modified in storage since it was loaded. "
+                "Please reload the session before appending more events."
+            )
+        before = len(storage_session.events) if storage_session else 0
+        event = await self._cache.append_event(session, event)
+        if storage_session is None or len(storage_session.events) == before:
+            return event # Re-delivered event, nothing new to store
+        # Serialised by the flush, off the event loop
+        self._queue(
+            "INSERT INTO events (app_name, user_id, session_id, data) VALUES (?, ?, ?, ?)",
+            lambda: (*key, event.model_dump_json(exclude_none=True)),
+        )
+        app_delta, user_delta, session_delta = _split_state_delta(
+            event.actions.state_delta if event.actions else {}
+        )
+        delta, _ = self._dirty_sessions.get(key, ({}, 0.0))
+        delta.update(session_delta)
+        self._dirty_sessions[key] = (delta, storage_session.last_update_time)
+        self._mark_shared_state(session.app_name, session.user_id, app_delta, user_delta)
+        await self._after_write()
+        return event
+
+    # -- Write-behind -------------------------------------------------------
+
+    def _mark_shared_state(self, app_name: str, user_id: str, app_delta: dict, user_delta: dict):
+        if app_delta:
+            self._dirty_app_states.setdefault(app_name, {}).update(app_delta)
+        if user_delta:
+            self._dirty_user_states.setdefault((app_name, user_id), {}).update(user_delta)
+
+    def _queue(self, sql: str, params: Any):
+        self._pending.append((sql, params))
+
+    async def _after_write(self):
+        if self.flush_interval <= 0 or self.pending_writes >= self.max_pending:
+            await self.flush()
+        elif self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        try:
+            await self.flush()
+        except Exception as ex:
+            logger.error(f"Could not write sessions to {self.path}, retrying: {ex}")
+            self._flusher = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        """
+        Commits every queued write in one transaction. If the commit fails,
+        the writes are queued again ahead of newer ones and retried by the
+        next flush.
+        """
+        async with self._flush_lock:
+            if not self.pending_writes:
+                return
+            writes, self._pending = self._pending, []
+            # Deltas are serialised here, on the loop, since later writes mutate
+            # them, and merged into the stored state by the commit
+            for key, (delta, update_time) in self._dirty_sessions.items():
+                writes.append((_merge_session_state, (key, json.dumps(delta), update_time)))
+            for app_name, delta in self._dirty_app_states.items():
+                writes.append((_merge_shared_state, ("app_states", ("app_name",), (app_name,), json.dumps(delta))))
+            for (app_name, user_id), delta in self._dirty_user_states.items():
+                writes.append((
+                    _merge_shared_state, ("user_states", ("app_name", "user_id"), (app_name, user_id), json.dumps(delta))
+                ))
+            self._dirty_sessions.clear()
+            self._dirty_app_states.clear()
+            self._dirty_user_states.clear()
+            try:
+                await asyncio.to_thread(self._commit, writes)
+            except BaseException:
+                self.flush_errors += 1
+                self._pending[:0] = writes
+                raise
+            self.flushes += 1
+            self.rows_written += len(writes)
+
+    def _commit(self, writes: list[tuple[str, Any]]):
+        with self._db_lock:
+            # Takes the write lock up front, since state merges read before writing
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, params in writes:
+                    if callable(sql):
+                        sql(self._db, *params)
+                    else:
+                        self._db.execute(sql, params() if callable(params) else params)
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    async def close(self):
+        """Flushes queued writes and closes the database."""
+        if self._flusher and not self._flusher.done():
+            self._flusher.cancel()
+        await self.flush()
+        with self._db_lock:
+            self._db.close()
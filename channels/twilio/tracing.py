@@ -0,0 +1,126 @@
+"""Where the latency of each voice turn goes."""
+import time
+
+from channels.twilio.audio import VoiceActivityDetector
+from channels.twilio.metrics import LatencyHistogram, escape_label_value
+
+# Stages of a voice turn, in milliseconds:
+# - inbound: the caller's last speech frame, from the socket to the live session
+# - think: from that frame's arrival to the first model audio of the reply
+# - transcode: transcoding that first chunk of model audio
+# - send: from the first model audio to its first `media` message to Twilio
+# - playout: from that message to Twilio acknowledging a mark of the reply
+# - total: from the caller's last speech frame to that acknowledgement
+TURN_STAGES = ("inbound", "think", "transcode", "send", "playout", "total")
+
+class TurnLatencyStats:
+    """Histograms of each turn stage per agent, shared by every call."""
+
+    def __init__(self):
+        self._agents: dict[str, dict[str, LatencyHistogram]] = {}
+
+    def record(self, agent_name: str, stages: dict[str, float]) -> None:
+        histograms = self._agents.get(agent_name)
+        if histograms is None:
+            histograms = self._agents[agent_name] = {stage: LatencyHistogram() for stage in TURN_STAGES}
+        for stage, ms in stages.items():
+            histograms[stage].record(ms)
+
+    def histograms(self) -> dict[str, dict[str, LatencyHistogram]]:
+        return self._agents
+
+    def metrics(self) -> dict:
+        """Count, mean and p50/p95/p99 of each stage, by agent."""
+        return {
+            agent_name: {stage: histogram.summary() for stage, histogram in histograms.items()}
+            for agent_name, histograms in self._agents.items()
+        }
+
+    def collect(self) -> list[str]:
+        """Prometheus summary of every stage, in seconds, by agent."""
+        name = "twilio_turn_latency_seconds"
+        lines = [f"# HELP {name} Latency of each stage of voice turns", f"# TYPE {name} summary"]
+        for agent_name, histograms in list(self._agents.items()):
+            agent_label = escape_label_value(agent_name)
+            for stage, histogram in histograms.items():
+                labels = f'agent="{agent_label}",stage="{stage}"'
+                for q in (0.5, 0.95, 0.99):
+                    lines.append(f'{name}{{{labels},quantile="{q}"}} {histogram.percentile(q) / 1000!r}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram.sum / 1000!r}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return lines
+
+class TurnTracer:
+    """
+    Timestamps the voice turns of one call and records their stages in
+    ``stats``. A turn starts with the caller's speech, judged by
+    ``detector`` unless the caller already knows, and ends when Twilio
+    acknowledges a mark in the reply, or early when the caller speaks again
+    or the call ends. Stages that were not reached are left out.
+
+    Args:
+        stats: TurnLatencyStats - Where finished turns are recorded
+        agent_name: str - The agent the turns are recorded under
+        detector: VoiceActivityDetector - Classifies inbound frames as speech
+    """
+
+    def __init__(self, stats: TurnLatencyStats, agent_name: str, detector: VoiceActivityDetector | None = None):
+        self.stats = stats
+        self.agent_name = agent_name
+        self.detector = detector or VoiceActivityDetector()
+        self.turns = 0
+        self._reset()
+
+    def _reset(self):
+        self._speech = None # perf_counter() at which the last speech frame arrived
+        self._inbound = 0.0
+        self._first_audio = None
+        self._transcode = 0.0
+        self._reply_turn = None # OutboundScheduler turn the reply is queued on
+        self._first_send = None
+
+    def inbound(self, pcm: bytes, received: float, is_speech: bool | None = None) -> None:
+        """A caller frame that arrived at ``received`` was handed to the live session."""
+        if is_speech is None:
+            is_speech = self.detector.is_speech(pcm)
+        if not is_speech:
+            return
+        if self._first_audio is not None:
+            self._finish() # The caller spoke again before the reply was heard
+        self._speech = received
+        self._inbound = time.perf_counter() - received
+
+    def model_audio(self, received: float, transcode_seconds: float, turn: int) -> None:
+        """Model audio read at ``received`` was transcoded and queued on ``turn``."""
+        if self._speech is None or self._first_audio is not None:
+            return
+        self._first_audio = received
+        self._transcode = transcode_seconds
+        self._reply_turn = turn
+
+    def media_sent(self) -> None:
+        if self._first_audio is not None and self._first_send is None:
+            self._first_send = time.perf_counter()
+
+    def mark_acknowledged(self, turn: int) -> None:
+        if self._first_send is not None and turn == self._reply_turn:
+            self._finish(heard=time.perf_counter())
+
+    def close(self) -> None:
+        if self._first_audio is not None:
+            self._finish()
+
+    def _finish(self, heard: float | None = None):
+        stages = {
+            "inbound": self._inbound * 1000,
+            "think": (self._first_audio - self._speech) * 1000,
+            "transcode": self._transcode * 1000,
+        }
+        if self._first_send is not None:
+            stages["send"] = (self._first_send - self._first_audio) * 1000
+            if heard is not None:
+                stages["playout"] = (heard - self._first_send) * 1000
+                stages["total"] = (heard - self._speech) * 1000
+        self.stats.record(self.agent_name, stages)
+        self.turns += 1
+        self._reset()
@@ -2,18 +2,45 @@ import logging
 import os
 import asyncio
 import base64
-import importlib
+import functools
+import json
+import time
+from contextlib import asynccontextmanager
 from uuid import uuid4
 
 from fastapi import Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from google.adk.cli.fast_api import get_fast_api_app
+from google.adk.cli.service_registry import get_service_registry
+from google.adk.sessions import InMemorySessionService
+from google.adk.agents.live_request_queue import LiveRequestQueue
 
 # Twilio imports
 from twilio.twiml.voice_response import Connect, Stream, VoiceResponse
-from channels.twilio.live_messaging import AgentEvent, agent_to_client_messaging, send_pcm_to_agent, start_agent_session, text_to_content, start_agent_session_with_agent
-from channels.twilio.audio import adk_pcm24k_to_twilio_ulaw8k, twilio_ulaw8k_to_adk_pcm16k
+from channels.twilio.live_messaging import (
+    AgentEventQueue,
+    BoundedLiveRequestQueue,
+    LiveAgentEvent,
+    LiveSessionPool,
+    PcmCoalescer,
+    agent_to_client_messaging,
+    start_agent_session,
+    text_to_content,
+    start_agent_session_with_agent,
+    end_agent_session,
+)
+from channels.twilio.audio import CallTranscoder, TranscodeBatcher, TranscodeExecutor, VoiceActivityDetector
+from channels.twilio.outbound import OutboundScheduler, finish_turn
+from channels.twilio.media_codec import TwilioMessageEncoder, media_payload
+from channels.twilio.metrics import LoopLagMonitor, default_metrics
+from channels.twilio.tracing import TurnLatencyStats, TurnTracer
+from channels.twilio.greetings import GreetingCache
+from channels.twilio.agent_registry import default_registry
+from channels.twilio.session_eviction import EvictingSessionService
+from channels.twilio.sqlite_sessions import SqliteSessionService
+from plugins.log_writer import LogPolicy
+from plugins.logging_plugin import LoggingPlugin
 
 # Import assistant agent if needed
 try:
@@ -28,6 +55,122 @@ from dotenv import load_dotenv
 load_dotenv()
 
 logger = logging.getLogger(__name__)
+
+# Optional cross-call transcode batching, e.g. TWILIO_TRANSCODE_BATCH_MS=5
+TRANSCODE_BATCH_MS = float(os.environ.get("TWILIO_TRANSCODE_BATCH_MS", "0"))
+transcode_batcher = TranscodeBatcher(tick=TRANSCODE_BATCH_MS / 1000) if TRANSCODE_BATCH_MS > 0 else None
+# Resampler backend for per-call transcoding: "soxr" or "polyphase"
+TWILIO_RESAMPLER = os.environ.get("TWILIO_RESAMPLER", "soxr")
+# Optional worker threads for per-call transcoding, keeping it off the event
+# loop (0 = transcode inline). Batching takes precedence when both are set.
+TWILIO_TRANSCODE_THREADS = int(os.environ.get("TWILIO_TRANSCODE_THREADS", "0"))
+transcode_executor = (
+    TranscodeExecutor(max_workers=TWILIO_TRANSCODE_THREADS, fused=True, resampler=TWILIO_RESAMPLER)
+    if TWILIO_TRANSCODE_THREADS > 0 and not transcode_batcher else None
+)
+# Per-turn latency breakdowns by agent, exposed on /twilio_latency
+TWILIO_TURN_TRACING = os.environ.get("TWILIO_TURN_TRACING", "1").lower() in ("1", "true", "yes")
+turn_latency = TurnLatencyStats()
+# Samples event loop lag, exposed on /twilio_loop
+loop_lag = LoopLagMonitor()
+# Optional local VAD dropping silent inbound frames before they reach the model
+TWILIO_VAD = os.environ.get("TWILIO_VAD", "").lower() in ("1", "true", "yes")
+TWILIO_VAD_THRESHOLD_DB = float(os.environ.get("TWILIO_VAD_THRESHOLD_DB", "-45"))
+# Silence forwarded after speech so the model can end the turn. By default it
+# is the agent's `silence_duration_ms` plus TWILIO_VAD_HANGOVER_MARGIN_MS;
+# TWILIO_VAD_HANGOVER_MS fixes it instead.
+TWILIO_VAD_HANGOVER_MS = int(os.environ.get("TWILIO_VAD_HANGOVER_MS", "0"))
+TWILIO_VAD_HANGOVER_MARGIN_MS = int(os.environ.get("TWILIO_VAD_HANGOVER_MARGIN_MS", "200"))
+# Milliseconds of inbound PCM packed per send_realtime (0 = one send per frame).
+# Agents can override it with `root_inbound_coalesce_ms` in their agent module.
+TWILIO_INBOUND_COALESCE_MS = int(os.environ.get("TWILIO_INBOUND_COALESCE_MS", "0"))
+# How far ahead of real-time playout outbound audio may be sent to Twilio
+TWILIO_OUTBOUND_BURST_MS = int(os.environ.get("TWILIO_OUTBOUND_BURST_MS", "200"))
+# Bounds on audio waiting between the socket and the live session, in each
+# direction (0 = unbounded). On overflow, "drop_oldest" drops the oldest
+# audio and "merge" packs the backlog into fewer, larger chunks first.
+TWILIO_INBOUND_QUEUE_MS = int(os.environ.get("TWILIO_INBOUND_QUEUE_MS", "2000"))
+TWILIO_INBOUND_OVERFLOW = os.environ.get("TWILIO_INBOUND_OVERFLOW", "drop_oldest")
+TWILIO_OUTBOUND_QUEUE_MS = int(os.environ.get("TWILIO_OUTBOUND_QUEUE_MS", "30000"))
+TWILIO_OUTBOUND_OVERFLOW = os.environ.get("TWILIO_OUTBOUND_OVERFLOW", "merge")
+inbound_request_queue = (
+    functools.partial(BoundedLiveRequestQueue, max_ms=TWILIO_INBOUND_QUEUE_MS, overflow=TWILIO_INBOUND_OVERFLOW)
+    if TWILIO_INBOUND_QUEUE_MS > 0 else LiveRequestQueue
+)
+# Queue metrics of the calls in progress, by call SID
+active_calls: dict[str, dict] = {}
+# Prometheus metrics served on /metrics; LoggingPlugin records its own there too
+metrics = default_metrics()
+metrics.register(loop_lag)
+metrics.register(turn_latency)
+metrics.gauge("twilio_active_calls", "Calls in progress", function=lambda: len(active_calls))
+calls_total = metrics.counter("twilio_calls_total", "Calls connected to an agent", ("agent",))
+frames_total = metrics.counter("twilio_frames_total", "Twilio media messages", ("direction",))
+# One 20 ms frame transcodes in about 12 µs, far below the default buckets
+TRANSCODE_BUCKETS = (5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 5e-3)
+transcode_seconds = metrics.histogram(
+    "twilio_transcode_seconds", "Time to transcode one frame or chunk", ("direction",), buckets=TRANSCODE_BUCKETS
+)
+inbound_frames, outbound_frames = frames_total.labels("inbound"), frames_total.labels("outbound")
+inbound_transcode, outbound_transcode = transcode_seconds.labels("inbound"), transcode_seconds.labels("outbound")
+# Optional pool of live sessions per agent, created and connected to the model
+# ahead of calls (0 = build one per call). Each ready session holds a connection.
+TWILIO_WARM_POOL_SIZE = int(os.environ.get("TWILIO_WARM_POOL_SIZE", "0"))
+TWILIO_WARM_POOL_TTL = float(os.environ.get("TWILIO_WARM_POOL_TTL", "300"))
+session_pool = LiveSessionPool(size=TWILIO_WARM_POOL_SIZE, ttl=TWILIO_WARM_POOL_TTL, request_queue=inbound_request_queue) if TWILIO_WARM_POOL_SIZE > 0 else None
+# Pre-rendered `root_greeting` audio per agent, played while the live session connects
+greeting_cache = GreetingCache()
+# Agents are listed once at startup and imported on first use, or all at
+# startup with TWILIO_AGENT_PRELOAD=1. TWILIO_AGENT_RELOAD=1 enables the
+# development-only reload route.
+TWILIO_AGENT_PRELOAD = os.environ.get("TWILIO_AGENT_PRELOAD", "").lower() in ("1", "true", "yes")
+TWILIO_AGENT_RELOAD = os.environ.get("TWILIO_AGENT_RELOAD", "").lower() in ("1", "true", "yes")
+# Sessions of Twilio calls and of the web UI share one bounded store: idle
+# sessions expire after SESSION_TTL seconds and, past the caps, the least
+# recently used ones are evicted, archived to SESSION_ARCHIVE_DIR if set.
+SESSION_TTL = float(os.environ.get("SESSION_TTL", "3600"))
+SESSION_MAX_SESSIONS = int(os.environ.get("SESSION_MAX_SESSIONS", "1000"))
+SESSION_MAX_EVENTS = int(os.environ.get("SESSION_MAX_EVENTS", "100000"))
+SESSION_ARCHIVE_DIR = os.environ.get("SESSION_ARCHIVE_DIR") or None
+# With SESSION_DB set, sessions live in that SQLite file instead and are
+# shared by all workers. Writes are batched every SESSION_FLUSH_MS.
+SESSION_DB = os.environ.get("SESSION_DB") or None
+SESSION_FLUSH_MS = float(os.environ.get("SESSION_FLUSH_MS", "50"))
+if SESSION_DB:
+    session_service = SqliteSessionService(
+        SESSION_DB, flush_interval=SESSION_FLUSH_MS / 1000, cache_size=SESSION_MAX_SESSIONS
+    )
+else:
+    session_service = EvictingSessionService(
+        InMemorySessionService(),
+        ttl=SESSION_TTL,
+        max_sessions=SESSION_MAX_SESSIONS,
+        max_events=SESSION_MAX_EVENTS,
+        archive_dir=SESSION_ARCHIVE_DIR,
+    )
+# Lets get_fast_api_app pick up the same instance through a session service URI
+get_service_registry().register_session_service("shared", lambda uri, **kwargs: session_service)
+# Calls record LoggingPlugin's tool, LLM and token metrics on /metrics. Only
+# its errors are logged, unless TWILIO_CALL_LOGGING=1 applies the
+# LOGGING_PLUGIN_* settings to calls too.
+TWILIO_CALL_LOGGING = os.environ.get("TWILIO_CALL_LOGGING", "").lower() in ("1", "true", "yes")
+call_logging_plugin = LoggingPlugin(policy=None if TWILIO_CALL_LOGGING else LogPolicy(level=logging.ERROR))
+agent_registry = default_registry(session_service=session_service, plugins=[call_logging_plugin])
+if TWILIO_AGENT_PRELOAD:
+    agent_registry.preload()
+
+@asynccontextmanager
+async def lifespan(app):
+    loop_lag.start()
+    yield
+    loop_lag.stop()
+    if session_pool:
+        await session_pool.close() # Stops the refill tasks and releases warm sessions
+    if transcode_executor:
+        transcode_executor.close()
+    if SESSION_DB:
+        await session_service.close() # Commit writes still queued
+
 # Initialize the standard ADK FastAPI app
 # agents_dir="." allows it to find agents in the current directory
 app = get_fast_api_app(
@@ -35,7 +178,10 @@ app = get_fast_api_app(
     web=True,  # Enable the Web UI
     host="0.0.0.0",
     port=int(os.environ.get("PORT", 8000)),
-    extra_plugins=["plugins.logging_plugin.LoggingPlugin"]
+    session_service_uri="shared://",
+    lifespan=lifespan,
+    # RunConfigPlugin applies each agent's root_run_config to web UI live sessions
+    extra_plugins=["plugins.logging_plugin.LoggingPlugin", "plugins.run_config_plugin.RunConfigPlugin"]
 )
 
 # Enable CORS
@@ -47,72 +193,65 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# --- PATCH FOR WEB UI CONFIGURATION ---
-# --- PATCH FOR WEB UI CONFIGURATION ---
-# --- PATCH FOR WEB UI CONFIGURATION ---
-try:
-    print("PATCH: Attempting to patch Runner/InMemoryRunner for French voice...")
-    
-    import google.adk.runners
-    from google.adk.runners import InMemoryRunner, Runner
-    import importlib
-
-    print(f"PATCH: InMemoryRunner path: {InMemoryRunner}")
-    print(f"PATCH: Runner path: {Runner}")
-
-    # Patch the BASE class Runner, as run_live is likely defined there
-    if not hasattr(Runner, "_original_run_live"):
-        Runner._original_run_live = Runner.run_live
-        
-    async def patched_run_live(self, session, live_request_queue, run_config=None):
-        app_name = getattr(self, "app_name", None)
-        print(f"PATCH: run_live called on {self.__class__.__name__} for app: {app_name}")
-        
-        if app_name:
-            try:
-                # Dynamically import the agent module
-                agent_module = importlib.import_module(f"agents.{app_name}.agent")
-                
-                # Check for root_run_config in the agent module
-                if hasattr(agent_module, "root_run_config"):
-                    root_run_config = getattr(agent_module, "root_run_config")
-                    print(f"PATCH: Found root_run_config for {app_name}: {root_run_config}")
-                    
-                    if run_config is None:
-                        print(f"PATCH: Injecting root_run_config for {app_name}")
-                        run_config = root_run_config
-                    else:
-                        print(f"PATCH: Merging into existing run_config for {app_name}")
-                        # Overwrite specific settings if they exist in root_run_config
-                        if root_run_config.speech_config:
-                            run_config.speech_config = root_run_config.speech_config
-                        if root_run_config.realtime_input_config:
-                            run_config.realtime_input_config = root_run_config.realtime_input_config
-            except ImportError:
-                 print(f"PATCH: Could not import module agents.{app_name}.agent")
-            except Exception as e:
-                print(f"PATCH: Error checking for root_run_config: {e}")
-        
-        # Call original using Keyword Arguments (signature enforces it)
-        async for item in Runner._original_run_live(self, session=session, live_request_queue=live_request_queue, run_config=run_config):
-            yield item
-            
-    # Apply patch to Runner (which InMemoryRunner inherits from)
-    Runner.run_live = patched_run_live
-    print("PATCH: Runner (base) patch successfully applied.")
-
-except ImportError as e:
-    print(f"PATCH: Could not import dependencies: {e}")
-except Exception as e:
-    print(f"PATCH: Failed to patch Runner: {e}")
-# ----------------------------------------
-# ----------------------------------------
-
 @app.get("/hello")
 def hello():
     """Simple Hello World endpoint for testing custom routes."""
     return {"message": "Hello World"}
 
+@app.get("/twilio_pool")
+def twilio_pool():
+    """Hit/miss counters of the warm live session pool."""
+    if not session_pool:
+        return {"enabled": False}
+    return {"enabled": True, **session_pool.metrics()}
+
+@app.get("/twilio_loop")
+def twilio_loop():
+    """Event loop lag, and the transcoding thread pool if enabled."""
+    loop = {"lag": loop_lag.metrics()}
+    if transcode_executor:
+        loop["transcode_threads"] = transcode_executor.metrics()
+    return loop
+
+# async so that the scrape runs on the event loop, like every metric update
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Counters and histograms of the worker in the Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/twilio_latency")
+def twilio_latency():
+    """p50/p95/p99 of each stage of voice turns, by agent."""
+    return turn_latency.metrics()
+
+@app.get("/twilio_calls")
+def twilio_calls():
+    """Depth and overflow counters of each call's inbound and outbound queues."""
+    return {
+        call_sid: {
+            "agent": call["agent"],
+            "inbound": call["inbound"].metrics() if call["inbound"] else None,
+            "outbound": call["outbound"].metrics() if call["outbound"] else None,
+        }
+        for call_sid, call in active_calls.items()
+    }
+
+@app.get("/session_metrics")
+def session_metrics():
+    """Sessions, events and approximate bytes held, and evictions so far."""
+    return session_service.metrics()
+
+@app.get("/twilio_agents")
+def twilio_agents():
+    """Agents that can be served, and the ones already loaded."""
+    return {"agents": agent_registry.names(), "loaded": agent_registry.loaded()}
+
+if TWILIO_AGENT_RELOAD:
+    @app.post("/twilio_agents/reload")
+    def twilio_agents_reload(agent: str | None = None):
+        """Development hook: re-import one agent module, or all loaded ones."""
+        return {"reloaded": agent_registry.reload(agent)}
+
 @app.get("/twilio_connect/{agent}")
 def create_call(req: Request, agent: str):
     """Generate TwiML to connect a call to a Twilio Media Stream"""
@@ -149,12 +288,14 @@ async def twilio_websocket(ws: WebSocket, agent: str):
          return
 
     try:
-        # Dynamically import the agent module
-        module = importlib.import_module(f"agents.{agent_name}.agent")
-        # Assume the agent object is named 'root_agent' inside the module
-        agent_object = getattr(module, "root_agent")
-        logger.info(f"Loaded agent: {agent_name}")
-    except (ImportError, AttributeError) as e:
+        # Loaded once per process; the agent object is the module's 'root_agent'
+        agent_entry = agent_registry.get(agent_name)
+        agent_object = agent_entry.agent
+        coalesce_ms = agent_entry.inbound_coalesce_ms
+        if coalesce_ms is None:
+            coalesce_ms = TWILIO_INBOUND_COALESCE_MS
+        greeting = agent_entry.greeting
+    except (LookupError, ImportError, AttributeError) as e:
         logger.error(f"Failed to load agent '{agent_name}': {e}")
         # We can't really return a 404 in a websocket, but we can close with a code
         await ws.close(code=1008, reason=f"Agent '{agent_name}' not found")
@@ -169,43 +310,138 @@ async def twilio_websocket(ws: WebSocket, agent: str):
     call_sid = start_event["start"]["callSid"]
     stream_sid = start_event["start"]["streamSid"]
     user_id = uuid4().hex # Fake user ID for the time being
-    initial_message = text_to_content("Allo") # This will trigger an initial message from the agent
-    live_events, live_request_queue = await start_agent_session_with_agent(user_id, call_sid, agent_object, agent_name=agent_name)
+
+    encoder = TwilioMessageEncoder(stream_sid) # Message templates with the streamSid baked in
+    vad = None
+    if TWILIO_VAD:
+        vad = VoiceActivityDetector.for_silence_duration(
+            TWILIO_VAD_HANGOVER_MS or agent_entry.live_run_config.silence_duration_ms,
+            margin_ms=0 if TWILIO_VAD_HANGOVER_MS else TWILIO_VAD_HANGOVER_MARGIN_MS,
+            threshold_db=TWILIO_VAD_THRESHOLD_DB,
+        )
+    tracer = TurnTracer(turn_latency, agent_name, detector=vad) if TWILIO_TURN_TRACING else None
+
+    async def send_media(ulaw_frame: bytes):
+        """Send one paced 20 ms u-law frame to Twilio"""
+        await ws.send_text(encoder.media(ulaw_frame))
+        outbound_frames.inc()
+        if tracer:
+            tracer.media_sent()
+
+    async def send_mark(name: str):
+        """Ask Twilio to echo `name` once the audio sent before it has played"""
+        # https://www.twilio.com/docs/voice/media-streams/websocket-messages#send-a-mark-message
+        await ws.send_text(encoder.mark(name))
+
+    outbound = OutboundScheduler(send_media, send_mark=send_mark, burst_ms=TWILIO_OUTBOUND_BURST_MS)
+    outbound_task = asyncio.create_task(outbound.run())
+
+    # Play the cached greeting right away instead of waiting for the model to
+    # connect and speak first. The session is then seeded with the greeting as
+    # the agent's opening turn so that the model waits for the caller.
+    greeting_audio = None
+    if greeting:
+        speech_config = agent_entry.run_config.speech_config if agent_entry.run_config else None
+        greeting_audio = greeting_cache.load(agent_name, greeting, speech_config)
+        if greeting_audio is None:
+            greeting_cache.prepare(agent_name, greeting, speech_config)
+    if greeting_audio is not None:
+        await outbound.put(greeting_audio)
+        outbound.end_turn()
+    seeded_greeting = greeting if greeting_audio is not None else None
+
+    try:
+        if session_pool:
+            live_events, live_request_queue, call_session = await session_pool.acquire(
+                call_sid, agent_object, agent_name, user_id=user_id, greeting=seeded_greeting,
+                runner=agent_entry.runner, run_config=agent_entry.live_run_config.apply(),
+            )
+        else:
+            live_events, live_request_queue, call_session = await start_agent_session_with_agent(
+                user_id, call_sid, agent_object, agent_name=agent_name, greeting=seeded_greeting,
+                runner=agent_entry.runner, run_config=agent_entry.live_run_config.apply(),
+                request_queue=inbound_request_queue,
+            )
+    except BaseException:
+        outbound_task.cancel()
+        raise
+    agent_events = (
+        AgentEventQueue(max_ms=TWILIO_OUTBOUND_QUEUE_MS, overflow=TWILIO_OUTBOUND_OVERFLOW)
+        if TWILIO_OUTBOUND_QUEUE_MS > 0 else None
+    )
+    calls_total.labels(agent_name).inc()
+    active_calls[call_sid] = {
+        "agent": agent_name,
+        "inbound": live_request_queue if isinstance(live_request_queue, BoundedLiveRequestQueue) else None,
+        "outbound": agent_events,
+    }
+    # Batched and threaded transcoders return futures instead of bytes
+    transcode_async = bool(transcode_batcher or transcode_executor)
+    if transcode_batcher:
+        transcoder = transcode_batcher.open_call()
+    elif transcode_executor:
+        transcoder = transcode_executor.open_call()
+    else:
+        transcoder = CallTranscoder(fused=True, resampler=TWILIO_RESAMPLER) # Owns the resampler state and buffers for the whole call
+    pcm_sender = PcmCoalescer(live_request_queue, coalesce_ms=coalesce_ms)
     
-    live_request_queue.send_content(initial_message)
+    if seeded_greeting is None:
+        initial_message = text_to_content("Allo") # This will trigger an initial message from the agent
+        live_request_queue.send_content(initial_message)
 
-    async def handle_agent_event(event: AgentEvent):
-        """Handle outgoing AgentEvent to Twilio WebSocket"""
+    async def handle_agent_event(event: LiveAgentEvent):
+        """Handle outgoing LiveAgentEvent to Twilio WebSocket"""
         if event.type == "complete":
             # logger.info(f"Agent turn complete at {event.timestamp}")
+            await finish_turn(outbound, transcoder)
             return
             
         if event.type == "interrupted":
             # logger.info(f"Agent interrupted at {event.timestamp}")
             # https://www.twilio.com/docs/voice/media-streams/websocket-messages#clear
-            return await ws.send_json({"event": "clear", "streamSid": stream_sid})
+            transcoder.reset_outbound()
+            dropped = outbound.clear()
+            await ws.send_text(encoder.clear())
+            for playback in outbound.interrupted_turns:
+                logger.debug(f"Barge-in on turn {playback.turn}: heard {playback.heard_ms}ms, unheard {playback.unheard_ms}ms")
+            logger.debug(f"Barge-in dropped {dropped} unsent frames. Stream SID: {stream_sid}")
+            return
             
-        ulaw_bytes = adk_pcm24k_to_twilio_ulaw8k(event.payload)
-        payload = base64.b64encode(ulaw_bytes).decode("ascii")
-        
-        await ws.send_json(
-            {
-                "event": "media",
-                "streamSid": stream_sid,
-                "media": {"payload": payload},
-            }
-        )
+        transcode_started = time.perf_counter()
+        ulaw_bytes = transcoder.outbound(event.payload)
+        if transcode_async:
+            ulaw_bytes = await ulaw_bytes
+        transcode_time = time.perf_counter() - transcode_started
+        outbound_transcode.observe(transcode_time)
+        if tracer:
+            tracer.model_audio(event.received, transcode_time, outbound.turn)
+        if not ulaw_bytes:
+            return
+        await outbound.put(ulaw_bytes)
 
     async def websocket_loop():
         """
         Handle incoming WebSocket messages to Agent.
         """
         while True:
-            event = await ws.receive_json()
-            event_type = event["event"]
+            message = await ws.receive_text()
+            received = time.perf_counter()
+            # Media frames are sliced out without parsing the JSON
+            mulaw_bytes = media_payload(message)
+            if mulaw_bytes is None:
+                event = json.loads(message)
+                event_type = event["event"]
+            else:
+                event_type = "media"
             
             if event_type == "stop":
                 logger.debug(f"Call ended by Twilio. Stream SID: {stream_sid}")
+                pcm_bytes = transcoder.flush_inbound()
+                if transcode_executor:
+                    pcm_bytes = await pcm_bytes
+                if pcm_bytes:
+                    pcm_sender.send(pcm_bytes)
+                pcm_sender.flush()
                 break
                 
             if event_type == "start" or event_type == "connected":
@@ -218,23 +454,38 @@ async def twilio_websocket(ws: WebSocket, agent: str):
                 continue
                 
             elif event_type == "mark":
-                logger.info(f"Twilio sent a Mark Event: {event}")
+                playback = outbound.acknowledge(event["mark"]["name"])
+                if tracer and playback:
+                    tracer.mark_acknowledged(playback.turn)
                 continue
                 
             elif event_type == "media":
-                payload = event["media"]["payload"]
-                mulaw_bytes = base64.b64decode(payload)
-                pcm_bytes = twilio_ulaw8k_to_adk_pcm16k(mulaw_bytes)
-                send_pcm_to_agent(pcm_bytes, live_request_queue)
+                if mulaw_bytes is None:
+                    mulaw_bytes = base64.b64decode(event["media"]["payload"])
+                inbound_frames.inc()
+                transcode_started = time.perf_counter()
+                pcm_bytes = transcoder.inbound(mulaw_bytes)
+                if transcode_async:
+                    pcm_bytes = await pcm_bytes
+                inbound_transcode.observe(time.perf_counter() - transcode_started)
+                if not pcm_bytes:
+                    continue
+                if vad:
+                    for frame in vad.process(pcm_bytes):
+                        pcm_sender.send(frame)
+                else:
+                    pcm_sender.send(pcm_bytes)
+                if tracer:
+                    tracer.inbound(pcm_bytes, received, is_speech=vad.speaking if vad else None)
 
     try:
         websocket_coro = websocket_loop()
         websocket_task = asyncio.create_task(websocket_coro)
         
-        messaging_coro = agent_to_client_messaging(handle_agent_event, live_events)
+        messaging_coro = agent_to_client_messaging(handle_agent_event, live_events, queue=agent_events)
         messaging_task = asyncio.create_task(messaging_coro)
         
-        tasks = [websocket_task, messaging_task]
+        tasks = [websocket_task, messaging_task, outbound_task]
         done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
         
         for p in pending:
@@ -254,7 +505,22 @@ async def twilio_websocket(ws: WebSocket, agent: str):
     except Exception as ex:
         logger.exception(f"Unexpected Error: {ex}")
     finally:
-        live_request_queue.close()
+        pcm_sender.close()
+        call = active_calls.pop(call_sid, None)
+        for direction in ("inbound", "outbound"):
+            if call and call[direction]:
+                logger.info(f"{direction.capitalize()} queue of call {call_sid}: {call[direction].metrics()}")
+        try:
+            # Closes the queue and releases the session from the shared service
+            await end_agent_session(call_session)
+        except Exception as ex:
+            logger.warning(f"Error while ending the agent session: {ex}")
+        if tracer:
+            tracer.close()
+        if vad:
+            logger.info(f"VAD suppressed {vad.suppressed}/{vad.frames} inbound frames. Call SID: {call_sid}")
+        if transcode_async:
+            transcoder.close()
         try:
             await ws.close()
         except Exception as ex:
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import atexit
+import collections
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from typing import Any
+from typing import Callable
+from typing import TextIO
+
+
+class JsonLogWriter:
+  """Writes structured log records as JSON lines from a background thread.
+
+  `emit` only appends a dict to a bounded in-memory queue, so callers on the
+  event loop never wait for stdout. A daemon thread wakes every
+  `flush_interval` seconds, serializes whatever is queued and writes it in a
+  single call. When `max_queue` records are already waiting, new records are
+  dropped and counted instead of growing memory or blocking.
+
+  A record can also be passed as a function returning it. It is only called
+  once the record is known to be written, so records that are filtered out
+  or dropped are never formatted.
+
+  Example:
+      >>> writer = JsonLogWriter(level=logging.INFO)
+      >>> writer.emit(logging.INFO, lambda: {"event": "tool_start", "tool": "search"})
+  """
+
+  def __init__(
+      self,
+      stream: TextIO | None = None,
+      level: int = logging.INFO,
+      max_queue: int = 10_000,
+      flush_interval: float = 0.05,
+  ):
+    """Initialize the writer.
+
+    Args:
+      stream: Where JSON lines are written. Defaults to stdout at write time.
+      level: Records below this level are disabled.
+      max_queue: Records kept waiting at most before new ones are dropped.
+      flush_interval: Seconds between writes of the queued records.
+    """
+    self.stream = stream
+    self.level = level
+    self.max_queue = max_queue
+    self.flush_interval = flush_interval
+    # deque append and popleft are atomic, so the loop and the writer thread
+    # share it without a lock
+    self._records: collections.deque[dict[str, Any]] = collections.deque()
+    self._stop = threading.Event()
+    self._thread: threading.Thread | None = None
+    self._start_lock = threading.Lock()
+    self.written = 0
+    self.dropped = 0
+    self.errors = 0
+
+  def enabled(self, level: int) -> bool:
+    return level >= self.level
+
+  def metrics(self) -> dict[str, int]:
+    return {
+        "queued": len(self._records),
+        "written": self.written,
+        "dropped": self.dropped,
+        "errors": self.errors,
+    }
+
+  def emit(
+      self,
+      level: int,
+      record: dict[str, Any] | Callable[[], dict[str, Any]],
+  ) -> None:
+    """Queue a record without blocking; drops it when the queue is full."""
+    if level < self.level:
+      return
+    if len(self._records) >= self.max_queue:
+      self.dropped += 1
+      return
+    if callable(record):
+      record = record()
+    record["ts"] = time.time()
+    record["level"] = logging.getLevelName(level).lower()
+    self._records.append(record)
+    if self._thread is None:
+      self._start()
+
+  def _start(self) -> None:
+    with self._start_lock:
+      if self._thread is None:
+        self._thread = threading.Thread(
+            target=self._run, name="json-log-writer", daemon=True
+        )
+        self._thread.start()
+
+  def _run(self) -> None:
+    while not self._stop.wait(self.flush_interval):
+      self._write_pending()
+    self._write_pending()
+
+  def _write_pending(self) -> None:
+    lines = []
+    while self._records:
+      try:
+        record = self._records.popleft()
+      except IndexError:
+        break
+      lines.append(json.dumps(record, default=str, ensure_ascii=False))
+    if not lines:
+      return
+    try:
+      stream = self.stream or sys.stdout
+      stream.write("\n".join(lines) + "\n")
+      stream.flush()
+      self.written += len(lines)
+    except Exception:
+      self.errors += 1
+
+  def close(self) -> None:
+    """Write what is still queued and stop the thread."""
+    self._stop.set()
+    if self._thread is not None:
+      self._thread.join()
+    else:
+      self._write_pending()
+
+
+# Callback groups of LoggingPlugin whose verbosity can be set separately
+CALLBACK_GROUPS = ("user_message", "run", "event", "agent", "model", "tool")
+
+# Level name that turns a callback group off
+OFF = logging.CRITICAL + 10
+
+
+def _parse_level(name: str) -> int:
+  name = name.strip().upper()
+  if name == "OFF":
+    return OFF
+  level = logging.getLevelName(name)
+  if not isinstance(level, int):
+    raise ValueError(f"Unknown log level '{name}'")
+  return level
+
+
+class LogPolicy:
+  """Decides how much LoggingPlugin logs, so its cost follows the policy.
+
+  Each callback group logs from `level`, or from its entry in
+  `callback_levels`. A `session_sample_rate` fraction of sessions, picked by
+  a hash of the session ID so that every worker agrees, is logged fully at
+  DEBUG. Of the remaining INFO and DEBUG records, `record_sample_rate` are
+  kept at random. Warnings and errors are always kept.
+
+  Example:
+      >>> policy = LogPolicy(
+      ...     level=logging.WARNING,
+      ...     callback_levels={"tool": logging.INFO},
+      ...     session_sample_rate=0.01,
+      ... )
+  """
+
+  def __init__(
+      self,
+      level: int = logging.INFO,
+      callback_levels: dict[str, int] | None = None,
+      session_sample_rate: float = 0.0,
+      record_sample_rate: float = 1.0,
+  ):
+    """Initialize the policy.
+
+    Args:
+      level: Lowest level logged by callback groups without their own.
+      callback_levels: Lowest level per group of CALLBACK_GROUPS, or OFF.
+      session_sample_rate: Fraction of sessions logged fully at DEBUG.
+      record_sample_rate: Fraction of other INFO and DEBUG records kept.
+    """
+    unknown = set(callback_levels or ()) - set(CALLBACK_GROUPS)
+    if unknown:
+      raise ValueError(
+          f"Unknown callback groups {sorted(unknown)}, expected {CALLBACK_GROUPS}"
+      )
+    self.level = level
+    self.callback_levels = dict(callback_levels or {})
+    self.session_sample_rate = session_sample_rate
+    self.record_sample_rate = record_sample_rate
+    self._session_threshold = int(session_sample_rate * 2**32)
+
+  def session_sampled(self, session_id: str | None) -> bool:
+    """Whether the session is one of those logged fully."""
+    if not self._session_threshold or not session_id:
+      return False
+    return zlib.crc32(session_id.encode()) < self._session_threshold
+
+  def level_for(self, group: str, session_id: str | None = None) -> int:
+    """The lowest level logged for a callback of `group` in the session."""
+    if self.session_sampled(session_id):
+      return logging.DEBUG
+    return self.callback_levels.get(group, self.level)
+
+  def keep(self, level: int, session_id: str | None = None) -> bool:
+    """Whether a record that passed `level_for` survives record sampling."""
+    if level >= logging.WARNING or self.record_sample_rate >= 1.0:
+      return True
+    if self.session_sampled(session_id):
+      return True
+    return random.random() < self.record_sample_rate
+
+  @classmethod
+  def from_env(cls) -> "LogPolicy":
+    """Reads the policy from the environment.
+
+    LOGGING_PLUGIN_LEVEL: level name, default INFO.
+    LOGGING_PLUGIN_CALLBACK_LEVELS: e.g. "model=WARNING,tool=DEBUG,event=OFF".
+    LOGGING_PLUGIN_SESSION_SAMPLE: fraction of sessions logged fully, e.g. 0.01.
+    LOGGING_PLUGIN_SAMPLE: fraction of other INFO and DEBUG records kept.
+    """
+    callback_levels = {}
+    for item in os.environ.get("LOGGING_PLUGIN_CALLBACK_LEVELS", "").split(","):
+      if item.strip():
+        group, _, level = item.partition("=")
+        callback_levels[group.strip()] = _parse_level(level)
+    return cls(
+        level=_parse_level(os.environ.get("LOGGING_PLUGIN_LEVEL", "INFO")),
+        callback_levels=callback_levels,
+        session_sample_rate=float(
+            os.environ.get("LOGGING_PLUGIN_SESSION_SAMPLE", "0")
+        ),
+        record_sample_rate=float(os.environ.get("LOGGING_PLUGIN_SAMPLE", "1")),
+    )
+
+
+_default_writer: JsonLogWriter | None = None
+
+
+def default_writer() -> JsonLogWriter:
+  """The process-wide writer, configured from the environment.
+
+  It writes every level; LogPolicy decides what is logged.
+  LOGGING_PLUGIN_QUEUE sets the records kept waiting at most (default 10000).
+  """
+  global _default_writer
+  if _default_writer is None:
+    _default_writer = JsonLogWriter(
+        level=logging.NOTSET,
+        max_queue=int(os.environ.get("LOGGING_PLUGIN_QUEUE", "10000")),
+    )
+    atexit.register(_default_writer.close)
+  return _default_writer
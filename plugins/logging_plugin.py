@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 import time
 from typing import Any
 from typing import Optional
@@ -15,6 +16,12 @@ from google.adk.tools.base_tool import BaseTool
 from google.adk.tools.tool_context import ToolContext
 from google.adk.plugins.base_plugin import BasePlugin
 
+from channels.twilio.metrics import MetricsRegistry
+from channels.twilio.metrics import default_metrics
+from plugins.log_writer import JsonLogWriter
+from plugins.log_writer import LogPolicy
+from plugins.log_writer import default_writer
+
 if TYPE_CHECKING:
   from google.adk.agents.invocation_context import InvocationContext
 
@@ -22,10 +29,13 @@ if TYPE_CHECKING:
 class LoggingPlugin(BasePlugin):
   """A plugin that logs important information at each callback point.
 
-  This plugin helps printing all critical events in the console. It is not a
-  replacement of existing logging in ADK. It rather helps terminal based
-  debugging by showing all logs in the console, and serves as a simple demo for
-  everyone to leverage when developing new plugins.
+  This plugin writes one structured JSON record per callback to stdout. It is
+  not a replacement of existing logging in ADK. Records are queued and
+  written by a background JsonLogWriter, so the event loop carrying live
+  audio never waits on stdout. A LogPolicy sets the level of each group of
+  callbacks and samples sessions and records, and records it filters out are
+  never formatted, so the cost follows what is logged. Message contents,
+  tool arguments and results are only included at DEBUG.
 
   This plugin helps users track the invocation status by logging:
   - User messages and invocation context
@@ -35,6 +45,10 @@ class LoggingPlugin(BasePlugin):
   - Events and final responses
   - Errors during model and tool execution
 
+  Tool and LLM latency, errors and token usage per agent are also recorded
+  in a metrics registry, served on `/metrics`, along with the records the
+  writer queued, wrote and dropped.
+
   Example:
       >>> logging_plugin = LoggingPlugin()
       >>> runner = Runner(
@@ -44,15 +58,59 @@ class LoggingPlugin(BasePlugin):
       ... )
   """
 
-  def __init__(self, name: str = "logging_plugin"):
+  def __init__(
+      self,
+      name: str = "logging_plugin",
+      metrics: MetricsRegistry | None = None,
+      writer: JsonLogWriter | None = None,
+      policy: LogPolicy | None = None,
+  ):
     """Initialize the logging plugin.
 
     Args:
       name: The name of the plugin instance.
+      metrics: Where latencies and token usage are recorded. Defaults to the
+        process-wide registry.
+      writer: Where records are written. Defaults to the process-wide writer,
+        configured from the environment.
+      policy: What is logged. Defaults to LogPolicy.from_env().
     """
     #print("Logging plugin initialized")
     super().__init__(name)
+    self._writer = writer or default_writer()
+    self._policy = policy or LogPolicy.from_env()
     self._metrics = {}
+    registry = metrics or default_metrics()
+    self._llm_seconds = registry.histogram(
+        "adk_llm_request_seconds",
+        "Time from an LLM request to its first response",
+        ("agent",),
+    )
+    self._llm_errors = registry.counter(
+        "adk_llm_errors_total", "LLM requests that failed", ("agent",)
+    )
+    self._tool_seconds = registry.histogram(
+        "adk_tool_seconds", "Duration of tool calls", ("agent", "tool")
+    )
+    self._tool_errors = registry.counter(
+        "adk_tool_errors_total", "Tool calls that failed", ("agent", "tool")
+    )
+    self._tokens = registry.counter(
+        "adk_tokens_total", "Tokens used, by kind", ("agent", "kind")
+    )
+    # Read at scrape time; the first plugin's writer is the one reported
+    writer_metrics = self._writer.metrics
+    registry.gauge(
+        "adk_log_records",
+        "Log records queued, written, dropped on a full queue, or failed",
+        ("state",),
+        function=lambda: {
+            (state,): count for state, count in writer_metrics().items()
+        },
+    )
+    # perf_counter() of requests in flight, keyed by invocation ID first
+    self._llm_started: dict[tuple[str, str], float] = {}
+    self._tool_started: dict[tuple[str, str], float] = {}
 
   async def on_user_message_callback(
       self,
@@ -61,66 +119,87 @@ class LoggingPlugin(BasePlugin):
       user_message: types.Content,
   ) -> Optional[types.Content]:
     """Log user message and invocation start."""
-    '''
-    self._log(f"🚀 USER MESSAGE RECEIVED")
-    self._log(f"   Invocation ID: {invocation_context.invocation_id}")
-    self._log(f"   Session ID: {invocation_context.session.id}")
-    self._log(f"   User ID: {invocation_context.user_id}")
-    self._log(f"   App Name: {invocation_context.app_name}")
-    self._log(
-        "   Root Agent:"
-        f" {invocation_context.agent.name if hasattr(invocation_context.agent, 'name') else 'Unknown'}"
-    )
-    self._log(f"   User Content: {self._format_content(user_message)}")
-    if invocation_context.branch:
-      self._log(f"   Branch: {invocation_context.branch}")
-    '''
+    if self._enabled(logging.DEBUG, "user_message", invocation_context):
+      self._emit(
+          logging.DEBUG,
+          invocation_context,
+          "user_message",
+          invocation_id=invocation_context.invocation_id,
+          session_id=invocation_context.session.id,
+          user_id=invocation_context.user_id,
+          app_name=invocation_context.app_name,
+          root_agent=getattr(invocation_context.agent, "name", "Unknown"),
+          content=lambda: self._format_content(user_message),
+          branch=invocation_context.branch,
+      )
     return None
 
   async def before_run_callback(
       self, *, invocation_context: InvocationContext
   ) -> Optional[types.Content]:
     """Log invocation start."""
-    self._log(f"🏃 INVOCATION STARTING")
-    self._log(f"   Invocation ID: {invocation_context.invocation_id}")
-    self._log(
-        "   Starting Agent:"
-        f" {invocation_context.agent.name if hasattr(invocation_context.agent, 'name') else 'Unknown'}"
-    )
+    if self._enabled(logging.INFO, "run", invocation_context):
+      self._emit(
+          logging.INFO,
+          invocation_context,
+          "invocation_start",
+          invocation_id=invocation_context.invocation_id,
+          agent=getattr(invocation_context.agent, "name", "Unknown"),
+      )
     return None
 
   async def on_event_callback(
       self, *, invocation_context: InvocationContext, event: Event
   ) -> Optional[Event]:
     """Log events yielded from the runner."""
-    '''
-    self._log(f"📢 EVENT YIELDED")
-    self._log(f"   Event ID: {event.id}")
-    self._log(f"   Author: {event.author}")
-    self._log(f"   Content: {self._format_content(event.content)}")
-    self._log(f"   Final Response: {event.is_final_response()}")
-    '''
-    if event.get_function_calls():
-      func_calls = [fc.name for fc in event.get_function_calls()]
-      self._log(f"   Function Calls: {func_calls}")
-
-    if event.get_function_responses():
-      func_responses = [fr.name for fr in event.get_function_responses()]
-      self._log(f"   Function Responses: {func_responses}")
-
-    if event.long_running_tool_ids:
-      self._log(f"   Long Running Tools: {list(event.long_running_tool_ids)}")
+    if self._enabled(logging.DEBUG, "event", invocation_context):
+      self._emit(
+          logging.DEBUG,
+          invocation_context,
+          "event",
+          event_id=event.id,
+          author=event.author,
+          content=lambda: self._format_content(event.content),
+          final_response=event.is_final_response(),
+      )
+
+    log_info = self._enabled(logging.INFO, "event", invocation_context)
+    if log_info:
+      fields = {}
+      if event.get_function_calls():
+        fields["function_calls"] = [fc.name for fc in event.get_function_calls()]
+      if event.get_function_responses():
+        fields["function_responses"] = [
+            fr.name for fr in event.get_function_responses()
+        ]
+      if event.long_running_tool_ids:
+        fields["long_running_tools"] = list(event.long_running_tool_ids)
+      if fields:
+        self._emit(
+            logging.INFO,
+            invocation_context,
+            "tool_event",
+            invocation_id=invocation_context.invocation_id,
+            author=event.author,
+            **fields,
+        )
 
     if event.usage_metadata:
+      self._count_tokens(event.author, event.usage_metadata)
       # Note: candidates_token_count (output tokens) is not currently supported by
       # the Gemini Live API and will be None.
       # See: https://docs.cloud.google.com/vertex-ai/generative-ai/docs/model-reference/multimodal-live
-      self._log(
-          "   Token Usage - Input:"
-          f" {event.usage_metadata.prompt_token_count}, Output:"
-          f" {event.usage_metadata.candidates_token_count},"
-          f" Total: {event.usage_metadata.total_token_count}"
-      )
+      if log_info:
+        self._emit(
+            logging.INFO,
+            invocation_context,
+            "token_usage",
+            invocation_id=invocation_context.invocation_id,
+            author=event.author,
+            input=event.usage_metadata.prompt_token_count,
+            output=event.usage_metadata.candidates_token_count,
+            total=event.usage_metadata.total_token_count,
+        )
 
     # Voice Duration Tracking
     metrics = self._metrics.setdefault(invocation_context.invocation_id, {})
@@ -133,9 +212,14 @@ class LoggingPlugin(BasePlugin):
 
       if event.input_transcription.finished:
         start_time = metrics.pop("input_start", None)
-        if start_time:
-          duration = current_time - start_time
-          self._log(f"   User Input Duration: {duration:.2f}s")
+        if start_time and log_info:
+          self._emit(
+              logging.INFO,
+              invocation_context,
+              "user_input_duration",
+              invocation_id=invocation_context.invocation_id,
+              seconds=round(current_time - start_time, 2),
+          )
 
     # Output Duration (Model Audio)
     # Mark start on first output transcription or content
@@ -145,9 +229,14 @@ class LoggingPlugin(BasePlugin):
     # Mark end on turn_complete
     if event.turn_complete:
       start_time = metrics.pop("output_start", None)
-      if start_time:
-        duration = current_time - start_time
-        self._log(f"   Model Output Duration: {duration:.2f}s")
+      if start_time and log_info:
+        self._emit(
+            logging.INFO,
+            invocation_context,
+            "model_output_duration",
+            invocation_id=invocation_context.invocation_id,
+            seconds=round(current_time - start_time, 2),
+        )
 
     return None
 
@@ -155,84 +244,123 @@ class LoggingPlugin(BasePlugin):
       self, *, invocation_context: InvocationContext
   ) -> Optional[None]:
     """Log invocation completion."""
-    self._log(f"✅ INVOCATION COMPLETED")
-    self._log(f"   Invocation ID: {invocation_context.invocation_id}")
-    self._log(
-        "   Final Agent:"
-        f" {invocation_context.agent.name if hasattr(invocation_context.agent, 'name') else 'Unknown'}"
-    )
+    self._forget(invocation_context.invocation_id)
+    self._metrics.pop(invocation_context.invocation_id, None)
+    if self._enabled(logging.INFO, "run", invocation_context):
+      self._emit(
+          logging.INFO,
+          invocation_context,
+          "invocation_end",
+          invocation_id=invocation_context.invocation_id,
+          agent=getattr(invocation_context.agent, "name", "Unknown"),
+      )
     return None
 
   async def before_agent_callback(
       self, *, agent: BaseAgent, callback_context: CallbackContext
   ) -> Optional[types.Content]:
     """Log agent execution start."""
-    self._log(f"🤖 AGENT STARTING")
-    self._log(f"   Agent Name: {callback_context.agent_name}")
-    self._log(f"   Invocation ID: {callback_context.invocation_id}")
-    if callback_context._invocation_context.branch:
-      self._log(f"   Branch: {callback_context._invocation_context.branch}")
+    if self._enabled(logging.INFO, "agent", callback_context):
+      self._emit(
+          logging.INFO,
+          callback_context,
+          "agent_start",
+          agent=callback_context.agent_name,
+          invocation_id=callback_context.invocation_id,
+          branch=callback_context._invocation_context.branch,
+      )
     return None
 
   async def after_agent_callback(
       self, *, agent: BaseAgent, callback_context: CallbackContext
   ) -> Optional[types.Content]:
     """Log agent execution completion."""
-    self._log(f"🤖 AGENT COMPLETED")
-    self._log(f"   Agent Name: {callback_context.agent_name}")
-    self._log(f"   Invocation ID: {callback_context.invocation_id}")
+    if self._enabled(logging.INFO, "agent", callback_context):
+      self._emit(
+          logging.INFO,
+          callback_context,
+          "agent_end",
+          agent=callback_context.agent_name,
+          invocation_id=callback_context.invocation_id,
+      )
     return None
 
   async def before_model_callback(
       self, *, callback_context: CallbackContext, llm_request: LlmRequest
   ) -> Optional[LlmResponse]:
     """Log LLM request before sending to model."""
-    self._log(f"🧠 LLM REQUEST")
-    self._log(f"   Model: {llm_request.model or 'default'}")
-    self._log(f"   Agent: {callback_context.agent_name}")
-
-    # Log system instruction if present
-    if llm_request.config and llm_request.config.system_instruction:
-      sys_instruction = llm_request.config.system_instruction[:200]
-      if len(llm_request.config.system_instruction) > 200:
-        sys_instruction += "..."
-      self._log(f"   System Instruction: '{sys_instruction}'")
-
-    # Note: Content logging removed due to type compatibility issues
-    # Users can still see content in the LLM response
-
-    # Log available tools
-    if llm_request.tools_dict:
-      tool_names = list(llm_request.tools_dict.keys())
-      self._log(f"   Available Tools: {tool_names}")
-
+    # Live sessions call this to screen user content, not per request
+    if callback_context._invocation_context.live_request_queue is None:
+      self._llm_started[
+          (callback_context.invocation_id, callback_context.agent_name)
+      ] = time.perf_counter()
+
+    if not self._enabled(logging.INFO, "model", callback_context):
+      return None
+    fields = {}
+    if self._enabled(logging.DEBUG, "model", callback_context):
+      # Note: Content logging removed due to type compatibility issues
+      # Users can still see content in the LLM response
+      if llm_request.config and llm_request.config.system_instruction:
+        sys_instruction = llm_request.config.system_instruction[:200]
+        if len(llm_request.config.system_instruction) > 200:
+          sys_instruction += "..."
+        fields["system_instruction"] = sys_instruction
+      if llm_request.tools_dict:
+        fields["tools"] = list(llm_request.tools_dict.keys())
+    self._emit(
+        logging.INFO,
+        callback_context,
+        "llm_request",
+        model=llm_request.model or "default",
+        agent=callback_context.agent_name,
+        **fields,
+    )
     return None
 
   async def after_model_callback(
       self, *, callback_context: CallbackContext, llm_response: LlmResponse
   ) -> Optional[LlmResponse]:
     """Log LLM response after receiving from model."""
-    self._log(f"🧠 LLM RESPONSE")
-    self._log(f"   Agent: {callback_context.agent_name}")
+    started = self._llm_started.pop(
+        (callback_context.invocation_id, callback_context.agent_name), None
+    )
+    if started is not None:
+      self._llm_seconds.labels(callback_context.agent_name).observe(
+          time.perf_counter() - started
+      )
 
     if llm_response.error_code:
-      self._log(f"   ❌ ERROR - Code: {llm_response.error_code}")
-      self._log(f"   Error Message: {llm_response.error_message}")
-    else:
-      self._log(f"   Content: {self._format_content(llm_response.content)}")
-      if llm_response.partial:
-        self._log(f"   Partial: {llm_response.partial}")
-      if llm_response.turn_complete is not None:
-        self._log(f"   Turn Complete: {llm_response.turn_complete}")
-
-    # Log usage metadata if available
+      if self._enabled(logging.ERROR, "model", callback_context):
+        self._emit(
+            logging.ERROR,
+            callback_context,
+            "llm_response",
+            agent=callback_context.agent_name,
+            error_code=llm_response.error_code,
+            error_message=llm_response.error_message,
+        )
+      return None
+
+    if not self._enabled(logging.INFO, "model", callback_context):
+      return None
+    fields = {}
+    if self._enabled(logging.DEBUG, "model", callback_context):
+      fields["content"] = lambda: self._format_content(llm_response.content)
+    if llm_response.partial:
+      fields["partial"] = llm_response.partial
+    if llm_response.turn_complete is not None:
+      fields["turn_complete"] = llm_response.turn_complete
     if llm_response.usage_metadata:
-      self._log(
-          "   Token Usage - Input:"
-          f" {llm_response.usage_metadata.prompt_token_count}, Output:"
-          f" {llm_response.usage_metadata.candidates_token_count}"
-      )
-
+      fields["input_tokens"] = llm_response.usage_metadata.prompt_token_count
+      fields["output_tokens"] = llm_response.usage_metadata.candidates_token_count
+    self._emit(
+        logging.INFO,
+        callback_context,
+        "llm_response",
+        agent=callback_context.agent_name,
+        **fields,
+    )
     return None
 
   async def before_tool_callback(
@@ -243,11 +371,22 @@ class LoggingPlugin(BasePlugin):
       tool_context: ToolContext,
   ) -> Optional[dict]:
     """Log tool execution start."""
-    self._log(f"🔧 TOOL STARTING")
-    self._log(f"   Tool Name: {tool.name}")
-    self._log(f"   Agent: {tool_context.agent_name}")
-    self._log(f"   Function Call ID: {tool_context.function_call_id}")
-    self._log(f"   Arguments: {self._format_args(tool_args)}")
+    self._tool_started[
+        (tool_context.invocation_id, tool_context.function_call_id)
+    ] = time.perf_counter()
+    if self._enabled(logging.INFO, "tool", tool_context):
+      fields = {}
+      if self._enabled(logging.DEBUG, "tool", tool_context):
+        fields["args"] = lambda: self._format_args(tool_args)
+      self._emit(
+          logging.INFO,
+          tool_context,
+          "tool_start",
+          tool=tool.name,
+          agent=tool_context.agent_name,
+          function_call_id=tool_context.function_call_id,
+          **fields,
+      )
     return None
 
   async def after_tool_callback(
@@ -259,11 +398,20 @@ class LoggingPlugin(BasePlugin):
       result: dict,
   ) -> Optional[dict]:
     """Log tool execution completion."""
-    self._log(f"🔧 TOOL COMPLETED")
-    self._log(f"   Tool Name: {tool.name}")
-    self._log(f"   Agent: {tool_context.agent_name}")
-    self._log(f"   Function Call ID: {tool_context.function_call_id}")
-    self._log(f"   Result: {self._format_args(result)}")
+    self._observe_tool(tool, tool_context)
+    if self._enabled(logging.INFO, "tool", tool_context):
+      fields = {}
+      if self._enabled(logging.DEBUG, "tool", tool_context):
+        fields["result"] = lambda: self._format_args(result)
+      self._emit(
+          logging.INFO,
+          tool_context,
+          "tool_end",
+          tool=tool.name,
+          agent=tool_context.agent_name,
+          function_call_id=tool_context.function_call_id,
+          **fields,
+      )
     return None
 
   async def on_model_error_callback(
@@ -274,10 +422,18 @@ class LoggingPlugin(BasePlugin):
       error: Exception,
   ) -> Optional[LlmResponse]:
     """Log LLM error."""
-    self._log(f"🧠 LLM ERROR")
-    self._log(f"   Agent: {callback_context.agent_name}")
-    self._log(f"   Error: {error}")
-
+    self._llm_started.pop(
+        (callback_context.invocation_id, callback_context.agent_name), None
+    )
+    self._llm_errors.labels(callback_context.agent_name).inc()
+    if self._enabled(logging.ERROR, "model", callback_context):
+      self._emit(
+          logging.ERROR,
+          callback_context,
+          "llm_error",
+          agent=callback_context.agent_name,
+          error=str(error),
+      )
     return None
 
   async def on_tool_error_callback(
@@ -289,19 +445,68 @@ class LoggingPlugin(BasePlugin):
       error: Exception,
   ) -> Optional[dict]:
     """Log tool error."""
-    self._log(f"🔧 TOOL ERROR")
-    self._log(f"   Tool Name: {tool.name}")
-    self._log(f"   Agent: {tool_context.agent_name}")
-    self._log(f"   Function Call ID: {tool_context.function_call_id}")
-    self._log(f"   Arguments: {self._format_args(tool_args)}")
-    self._log(f"   Error: {error}")
+    self._observe_tool(tool, tool_context)
+    self._tool_errors.labels(tool_context.agent_name, tool.name).inc()
+    if self._enabled(logging.ERROR, "tool", tool_context):
+      self._emit(
+          logging.ERROR,
+          tool_context,
+          "tool_error",
+          tool=tool.name,
+          agent=tool_context.agent_name,
+          function_call_id=tool_context.function_call_id,
+          args=lambda: self._format_args(tool_args),
+          error=str(error),
+      )
     return None
 
-  def _log(self, message: str) -> None:
-    """Internal method to format and print log messages."""
-    # ANSI color codes: \033[90m for grey, \033[0m to reset
-    formatted_message: str = f"\033[90m[{self.name}] {message}\033[0m"
-    print(formatted_message)
+  def _observe_tool(self, tool: BaseTool, tool_context: ToolContext) -> None:
+    started = self._tool_started.pop(
+        (tool_context.invocation_id, tool_context.function_call_id), None
+    )
+    if started is not None:
+      self._tool_seconds.labels(tool_context.agent_name, tool.name).observe(
+          time.perf_counter() - started
+      )
+
+  def _count_tokens(
+      self, agent_name: str, usage: types.GenerateContentResponseUsageMetadata
+  ) -> None:
+    for kind, count in (
+        ("prompt", usage.prompt_token_count),
+        ("candidates", usage.candidates_token_count),
+        ("total", usage.total_token_count),
+    ):
+      if count:
+        self._tokens.labels(agent_name, kind).inc(count)
+
+  def _forget(self, invocation_id: str) -> None:
+    """Drop start times left by requests that never completed."""
+    for started in (self._llm_started, self._tool_started):
+      for key in [key for key in started if key[0] == invocation_id]:
+        del started[key]
+
+  def _enabled(self, level: int, group: str, context: Any) -> bool:
+    """Whether the policy logs `level` for the callback group in the session."""
+    return level >= self._policy.level_for(
+        group, _session_id(context)
+    ) and self._writer.enabled(level)
+
+  def _emit(self, level: int, context: Any, event: str, **fields: Any) -> None:
+    """Queue one structured record; never blocks the event loop.
+
+    Fields given as functions are only called if the record is written.
+    """
+    if not self._policy.keep(level, _session_id(context)):
+      return
+
+    def record() -> dict[str, Any]:
+      for key, value in fields.items():
+        if callable(value):
+          fields[key] = value()
+      return {"plugin": self.name, "event": event, **fields}
+
+    self._writer.emit(level, record)
 
   def _format_content(
       self, content: Optional[types.Content], max_length: int = 200
@@ -337,3 +542,9 @@ class LoggingPlugin(BasePlugin):
     if len(formatted) > max_length:
       formatted = formatted[:max_length] + "...}"
     return formatted
+
+
+def _session_id(context: Any) -> Optional[str]:
+  """The session ID of an invocation, callback or tool context, if any."""
+  session = getattr(context, "session", None)
+  return getattr(session, "id", None)
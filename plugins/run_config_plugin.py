@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import Optional
+from typing import TYPE_CHECKING
+from google.genai import types
+
+from google.adk.plugins.base_plugin import BasePlugin
+
+from channels.twilio.agent_registry import AgentRegistry
+from channels.twilio.agent_registry import default_registry
+
+if TYPE_CHECKING:
+  from google.adk.agents.invocation_context import InvocationContext
+
+
+class RunConfigPlugin(BasePlugin):
+  """Applies each agent's resolved live RunConfig to its live invocations.
+
+  Runners built by the web UI know nothing about an agent's
+  `root_run_config`. Before a live invocation starts, this plugin looks the
+  app up in the agent registry and swaps in a copy of the run config with
+  the agent's voice and activity detection settings. Resolution happens once
+  per agent when the registry loads it, so this is a dict lookup and a
+  shallow copy per session.
+
+  Example:
+      >>> runner = Runner(
+      ...     agent=my_agent,
+      ...     # ...
+      ...     plugins=[RunConfigPlugin()],
+      ... )
+  """
+
+  def __init__(
+      self,
+      name: str = "run_config_plugin",
+      registry: AgentRegistry | None = None,
+  ):
+    """Initialize the run config plugin.
+
+    Args:
+      name: The name of the plugin instance.
+      registry: Where agents are looked up. Defaults to the process-wide one.
+    """
+    super().__init__(name)
+    self._registry = registry
+
+  async def before_run_callback(
+      self, *, invocation_context: InvocationContext
+  ) -> Optional[types.Content]:
+    """Swap in the agent's run config for live invocations."""
+    if invocation_context.live_request_queue is None:
+      return None
+    registry = self._registry or default_registry()
+    try:
+      entry = registry.get(invocation_context.app_name)
+    except (LookupError, ImportError, AttributeError):
+      return None
+    invocation_context.run_config = entry.live_run_config.apply(
+        invocation_context.run_config
+    )
+    return None
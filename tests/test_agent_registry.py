@@ -0,0 +1,119 @@
+import sys
+from pathlib import Path
+import pytest
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.genai import types
+from channels.twilio.agent_registry import AgentRegistry, ResolvedRunConfig
+
+def _agent_source(instruction: str, extra: str = "") -> str:
+    return (
+        "from google.adk.agents import Agent\n"
+        f"root_agent = Agent(name='echo', model='gemini-live-2.5-flash-native-audio', instruction='{instruction}')\n"
+        + extra
+    )
+
+def _write_agent(root, name: str, body: str):
+    package = root / name
+    package.mkdir(exist_ok=True)
+    (package / "__init__.py").write_text("")
+    (package / "agent.py").write_text(body)
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    root = tmp_path / "registry_agents"
+    root.mkdir()
+    (root / "__init__.py").write_text("")
+    _write_agent(root, "echo", _agent_source("v1", 'root_greeting = "Bonjour"\n'))
+    _write_agent(root, "broken", "raise ImportError('missing dependency')\n")
+    (root / "notes").mkdir() # Not an agent: no agent.py
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield AgentRegistry(package="registry_agents", agents_dir=str(root))
+    for name in [name for name in sys.modules if name.startswith("registry_agents")]:
+        del sys.modules[name]
+
+def test_agent_registry_lists_and_caches_agents(registry):
+    assert registry.names() == ["broken", "echo"]
+    entry = registry.get("echo")
+    assert (entry.agent.instruction, entry.greeting, entry.run_config) == ("v1", "Bonjour", None)
+    assert registry.get("echo") is entry
+    assert entry.runner.app_name == "echo"
+    assert entry.runner.session_service is registry.session_service
+    with pytest.raises(LookupError):
+        registry.get("os")
+
+def test_agent_registry_preload_skips_broken_agents(registry):
+    assert registry.preload() == ["echo"]
+    assert registry.loaded() == ["echo"]
+
+def test_agent_registry_reload_picks_up_changes(registry):
+    assert registry.get("echo").agent.instruction == "v1"
+    (Path(registry.agents_dir) / "echo" / "agent.py").write_text(_agent_source("v2"))
+    assert registry.reload("echo") == ["echo"]
+    assert registry.get("echo").agent.instruction == "v2"
+    assert registry.get("echo").greeting is None
+
+def _root_run_config() -> RunConfig:
+    return RunConfig(
+        speech_config=types.SpeechConfig(language_code="fr-FR"),
+        realtime_input_config=types.RealtimeInputConfig(
+            automatic_activity_detection=types.AutomaticActivityDetection(prefix_padding_ms=150, silence_duration_ms=400)
+        ),
+    )
+
+def test_resolved_run_config_keeps_caller_config_intact():
+    resolved = ResolvedRunConfig(_root_run_config())
+    base = RunConfig(streaming_mode=StreamingMode.BIDI)
+    merged = resolved.apply(base)
+    assert merged.speech_config.language_code == "fr-FR"
+    assert merged.streaming_mode == StreamingMode.BIDI
+    assert base.speech_config is None
+    # Each session gets its own copy of the agent's config
+    assert resolved.apply() == resolved.apply()
+    assert resolved.apply() is not resolved.apply()
+    assert ResolvedRunConfig().apply() is None
+    assert ResolvedRunConfig().apply(base) is base
+
+def test_resolved_run_config_applies_vad_overrides():
+    root = _root_run_config()
+    resolved = ResolvedRunConfig(root, {"silence_duration_ms": 250})
+    detection = resolved.apply().realtime_input_config.automatic_activity_detection
+    assert (detection.silence_duration_ms, detection.prefix_padding_ms) == (250, 150)
+    assert root.realtime_input_config.automatic_activity_detection.silence_duration_ms == 400
+    assert resolved.silence_duration_ms == 250
+    assert ResolvedRunConfig().silence_duration_ms is None
+    with pytest.raises(ValueError):
+        ResolvedRunConfig(root, {"silence_ms": 250})
+
+def test_run_config_plugin_applies_agent_config_to_live_runs(registry):
+    import asyncio
+    from types import SimpleNamespace
+    from plugins.run_config_plugin import RunConfigPlugin
+
+    (Path(registry.agents_dir) / "echo" / "agent.py").write_text(
+        _agent_source("v1", "root_vad_overrides = {'silence_duration_ms': 300}\n")
+    )
+    plugin = RunConfigPlugin(registry=registry)
+    live = SimpleNamespace(app_name="echo", live_request_queue=object(), run_config=RunConfig())
+    text = SimpleNamespace(app_name="echo", live_request_queue=None, run_config=RunConfig())
+    unknown = SimpleNamespace(app_name="nobody", live_request_queue=object(), run_config=RunConfig())
+    for context in (live, text, unknown):
+        asyncio.run(plugin.before_run_callback(invocation_context=context))
+    assert live.run_config.realtime_input_config.automatic_activity_detection.silence_duration_ms == 300
+    assert text.run_config.realtime_input_config is None
+    assert unknown.run_config.realtime_input_config is None
+
+def test_agent_registry_runners_share_its_plugins(tmp_path, monkeypatch):
+    from plugins.log_writer import OFF, JsonLogWriter, LogPolicy
+    from plugins.logging_plugin import LoggingPlugin
+
+    root = tmp_path / "plugin_agents"
+    root.mkdir()
+    (root / "__init__.py").write_text("")
+    _write_agent(root, "echo", _agent_source("v1"))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    plugin = LoggingPlugin(writer=JsonLogWriter(), policy=LogPolicy(level=OFF))
+    registry = AgentRegistry(package="plugin_agents", agents_dir=str(root), plugins=[plugin])
+
+    assert registry.get("echo").runner.plugin_manager.get_plugin("logging_plugin") is plugin
+    for name in [name for name in sys.modules if name.startswith("plugin_agents")]:
+        del sys.modules[name]
@@ -1,8 +1,9 @@
+import asyncio
 import pytest
 import json
 import numpy as np
 import os
-from twilio_voice_agent.audio import twilio_ulaw8k_to_adk_pcm16k, adk_pcm24k_to_twilio_ulaw8k, _ulaw2lin, _lin2ulaw
+from channels.twilio.audio import CallTranscoder, twilio_ulaw8k_to_adk_pcm16k, adk_pcm24k_to_twilio_ulaw8k, _ulaw2lin, _lin2ulaw
 
 # Use a relative path to where we know the test data is
 TEST_DATA_PATH = os.path.join(os.path.dirname(__file__), "data", "audio_test_vectors.json")
@@ -40,7 +41,7 @@ def test_ulaw2lin_direct_comparison(audio_vectors):
     # inside audio.py so we can test them in isolation.
     
     # Let's check imports after we refactor.
-    from twilio_voice_agent.audio import _ulaw2lin, _lin2ulaw
+    from channels.twilio.audio import _ulaw2lin, _lin2ulaw
     
     # 1. Check ulaw -> lin
     vectors = audio_vectors["ulaw2lin"]
@@ -64,3 +65,213 @@ def test_lin2ulaw_direct_comparison(audio_vectors):
     
     # Compare
     assert result_ulaw == expected_ulaw, "lin2ulaw conversion mismatch"
+
+@pytest.mark.parametrize("resampler", ["soxr", "polyphase"])
+@pytest.mark.parametrize("fused", [False, True])
+def test_call_transcoder_streams_inbound_frames(fused, resampler):
+    transcoder = CallTranscoder(fused=fused, resampler=resampler)
+    rng = np.random.default_rng(0)
+    ulaw = rng.integers(0, 256, 160 * 50, dtype=np.uint8).tobytes()
+
+    # Feed 20 ms Twilio frames one at a time, then drain at end of call
+    streamed = b"".join(transcoder.inbound(ulaw[i:i + 160]) for i in range(0, len(ulaw), 160))
+    streamed += transcoder.flush_inbound()
+
+    assert len(streamed) == len(twilio_ulaw8k_to_adk_pcm16k(ulaw))
+
+@pytest.mark.parametrize("resampler", ["soxr", "polyphase"])
+@pytest.mark.parametrize("fused", [False, True])
+def test_call_transcoder_handles_odd_length_chunks(fused, resampler):
+    transcoder = CallTranscoder(fused=fused, resampler=resampler)
+    t = np.arange(24000) / 24000
+    pcm24 = (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16).tobytes()
+
+    # Model chunks are not guaranteed to split on sample boundaries
+    chunks = [pcm24[i:i + 1001] for i in range(0, len(pcm24), 1001)]
+    streamed = b"".join(transcoder.outbound(chunk) for chunk in chunks)
+    streamed += transcoder.flush_outbound()
+
+    assert len(streamed) == len(adk_pcm24k_to_twilio_ulaw8k(pcm24))
+
+def test_call_transcoder_fused_matches_float_path():
+    t = np.arange(24000) / 24000
+    pcm24 = (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16).tobytes()
+
+    outputs = []
+    for fused in (False, True):
+        transcoder = CallTranscoder(fused=fused)
+        ulaw = b"".join(transcoder.outbound(pcm24[i:i + 960]) for i in range(0, len(pcm24), 960))
+        outputs.append(np.frombuffer(_ulaw2lin(ulaw + transcoder.flush_outbound()), dtype=np.int16))
+
+    reference, fused = (o.astype(np.float64) for o in outputs)
+    # Only int16 rounding differs between the two paths
+    assert np.max(np.abs(reference - fused)) <= 0.01 * np.max(np.abs(reference))
+
+def _reference_lin2ulaw_sample(sample):
+    # Scalar G.711 encoder the vectorized table is generated from
+    sign = 0
+    if sample < 0:
+        sample = -sample
+        sign = 0x80
+    sample = min(sample, 32635) + 0x84
+    exponent = 7
+    while exponent > 0 and not sample & (0x4000 >> (7 - exponent)):
+        exponent -= 1
+    mantissa = (sample >> (exponent + 3)) & 0x0F
+    return ~(sign | (exponent << 4) | mantissa) & 0xFF
+
+def test_lin_to_ulaw_table_matches_scalar_reference():
+    from channels.twilio.audio import _LIN_TO_ULAW_TABLE
+
+    expected = bytes(_reference_lin2ulaw_sample(s) for s in range(-32768, 32768))
+    samples = np.arange(-32768, 32768, dtype=np.int16)
+
+    assert _LIN_TO_ULAW_TABLE[samples.view(np.uint16)].tobytes() == expected
+
+def test_transcode_batcher_matches_unbatched_filter():
+    from channels.twilio.audio import TranscodeBatcher, _UPSAMPLE_8K_TO_16K
+
+    rng = np.random.default_rng(1)
+    ulaw = [rng.integers(0, 256, 160 * 25, dtype=np.uint8).tobytes() for _ in range(3)]
+
+    async def run():
+        batcher = TranscodeBatcher()
+        calls = [batcher.open_call() for _ in ulaw]
+        outputs = [b""] * len(calls)
+        for i in range(0, len(ulaw[0]), 160):
+            futures = [call.inbound(frames[i:i + 160]) for call, frames in zip(calls, ulaw)]
+            batcher.process_pending()
+            outputs = [out + future.result() for out, future in zip(outputs, futures)]
+        for call in calls:
+            call.close()
+        return outputs
+
+    outputs = asyncio.run(run())
+
+    # Batching calls together must not leak state between rows
+    for frames, output in zip(ulaw, outputs):
+        x = np.frombuffer(_ulaw2lin(frames), dtype=np.int16).astype(np.float32)[None]
+        history = np.zeros((1, _UPSAMPLE_8K_TO_16K.history_len), dtype=np.float32)
+        y, _ = _UPSAMPLE_8K_TO_16K(x, history)
+        expected = np.clip(np.rint(y[0]), -32768, 32767)
+        # Chunked and one-shot float32 sums may round to a neighbouring integer
+        assert np.max(np.abs(np.frombuffer(output, dtype=np.int16) - expected)) <= 1
+
+def test_transcode_batcher_keeps_frame_order_per_call():
+    from channels.twilio.audio import TranscodeBatcher
+
+    t = np.arange(24000) / 24000
+    pcm24 = (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16).tobytes()
+    chunks = [pcm24[i:i + 1001] for i in range(0, len(pcm24), 1001)]
+
+    async def run(chunks_per_tick):
+        batcher = TranscodeBatcher()
+        call = batcher.open_call()
+        output = b""
+        for i in range(0, len(chunks), chunks_per_tick):
+            futures = [call.outbound(chunk) for chunk in chunks[i:i + chunks_per_tick]]
+            batcher.process_pending()
+            output += b"".join(future.result() for future in futures)
+        call.close()
+        return output
+
+    # Several odd-sized chunks from one call in a single tick stay sequential
+    assert asyncio.run(run(4)) == asyncio.run(run(1))
+
+def test_transcode_executor_matches_inline_transcoder_in_order():
+    from channels.twilio.audio import TranscodeExecutor
+
+    t = np.arange(24000) / 24000
+    pcm24 = (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16).tobytes()
+    chunks = [pcm24[i:i + 1001] for i in range(0, len(pcm24), 1001)]
+    ulaw = np.random.default_rng(2).integers(0, 256, 160 * 25, dtype=np.uint8).tobytes()
+    frames = [ulaw[i:i + 160] for i in range(0, len(ulaw), 160)]
+
+    # soxr dithers its int16 output, so compare on the deterministic backend
+    inline = CallTranscoder(fused=True, resampler="polyphase")
+    expected_out = b"".join(inline.outbound(chunk) for chunk in chunks) + inline.flush_outbound()
+    expected_in = b"".join(inline.inbound(frame) for frame in frames) + inline.flush_inbound()
+
+    async def run():
+        executor = TranscodeExecutor(max_workers=4, resampler="polyphase")
+        call = executor.open_call()
+        # Submitted without awaiting in between, so several frames are in flight
+        outbound = [call.outbound(chunk) for chunk in chunks] + [call.flush_outbound()]
+        inbound = [call.inbound(frame) for frame in frames] + [call.flush_inbound()]
+        results = await asyncio.gather(asyncio.gather(*outbound), asyncio.gather(*inbound))
+        call.close()
+        metrics = executor.metrics()
+        executor.close()
+        return [b"".join(result) for result in results], metrics
+
+    (out, inb), metrics = asyncio.run(run())
+    assert out == expected_out
+    assert inb == expected_in
+    assert metrics["jobs"] == len(chunks) + len(frames) + 2
+    assert metrics["in_flight"] == 0
+
+def _tone_snr_db(samples, freq, rate):
+    """SNR of a pure tone, fitted by least squares so delay does not matter."""
+    t = np.arange(len(samples)) / rate
+    basis = np.stack([np.sin(2 * np.pi * freq * t), np.cos(2 * np.pi * freq * t)], axis=1)
+    coeffs, *_ = np.linalg.lstsq(basis, samples, rcond=None)
+    fitted = basis @ coeffs
+    return 10 * np.log10(np.mean(fitted ** 2) / np.mean((samples - fitted) ** 2))
+
+def test_ulaw_round_trip_snr():
+    t = np.arange(8000) / 8000
+    pcm = (np.sin(2 * np.pi * 1000 * t) * 16000).astype(np.int16)
+
+    decoded = np.frombuffer(_ulaw2lin(_lin2ulaw(pcm.tobytes())), dtype=np.int16).astype(np.float64)
+
+    # G.711 u-law gives ~38 dB SQNR for a loud tone
+    assert _tone_snr_db(decoded, 1000, 8000) > 35
+
+@pytest.mark.parametrize("resampler", ["soxr", "polyphase"])
+def test_full_chain_round_trip_snr(resampler):
+    # Model audio out to Twilio and back in again, as heard by the other side
+    t = np.arange(24000) / 24000
+    pcm24 = (np.sin(2 * np.pi * 1000 * t) * 16000).astype(np.int16).tobytes()
+    transcoder = CallTranscoder(fused=True, resampler=resampler)
+
+    ulaw = b"".join(transcoder.outbound(pcm24[i:i + 960]) for i in range(0, len(pcm24), 960))
+    pcm16 = b"".join(transcoder.inbound(ulaw[i:i + 160]) for i in range(0, len(ulaw), 160))
+    samples = np.frombuffer(pcm16, dtype=np.int16).astype(np.float64)
+
+    # Skip the resamplers' start-up transient
+    assert _tone_snr_db(samples[1600:], 1000, 16000) > 33
+
+def test_vad_suppresses_silence_with_hangover_and_preroll():
+    from channels.twilio.audio import VoiceActivityDetector
+
+    vad = VoiceActivityDetector(hangover_frames=3, preroll_frames=2)
+    silence = np.zeros(320, dtype=np.int16).tobytes()
+    t = np.arange(320) / 16000
+    speech = (np.sin(2 * np.pi * 300 * t) * 8000).astype(np.int16).tobytes()
+
+    assert [vad.process(silence) for _ in range(5)] == [[]] * 5
+    # Onset replays the pre-roll ahead of the speech frame
+    assert vad.process(speech) == [silence, silence, speech]
+    # Hangover keeps the pause the model needs to detect end of speech
+    assert [len(vad.process(silence)) for _ in range(5)] == [1, 1, 1, 0, 0]
+    assert (vad.frames, vad.suppressed) == (11, 5)
+
+def test_vad_hangover_outlasts_the_model_silence_duration():
+    from channels.twilio.audio import VoiceActivityDetector
+
+    assert VoiceActivityDetector.for_silence_duration(1000).hangover_frames == 60
+    assert VoiceActivityDetector.for_silence_duration(410, margin_ms=0).hangover_frames == 21
+    assert VoiceActivityDetector.for_silence_duration(None).hangover_frames == VoiceActivityDetector().hangover_frames
+
+def test_vad_rejects_quiet_hiss_but_keeps_quiet_voice():
+    from channels.twilio.audio import VoiceActivityDetector
+
+    vad = VoiceActivityDetector(threshold_db=-30)
+    rng = np.random.default_rng(0)
+    # Same level as the voice, only the zero-crossing rate tells them apart
+    hiss = (rng.standard_normal(320) * 500).astype(np.int16).tobytes()
+    t = np.arange(320) / 16000
+    quiet_voice = (np.sin(2 * np.pi * 200 * t) * 700).astype(np.int16).tobytes()
+
+    assert not vad.is_speech(hiss)
+    assert vad.is_speech(quiet_voice)
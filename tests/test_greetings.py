@@ -0,0 +1,40 @@
+from google.genai import types
+from channels.twilio.greetings import GreetingCache, greeting_cache_path
+
+def _voice(name: str) -> types.SpeechConfig:
+    return types.SpeechConfig(
+        voice_config=types.VoiceConfig(prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=name))
+    )
+
+def test_greeting_cache_path_changes_with_text_and_voice(tmp_path):
+    path = greeting_cache_path("agent", "Bonjour", _voice("Aoede"), str(tmp_path))
+    assert path == greeting_cache_path("agent", "Bonjour", _voice("Aoede"), str(tmp_path))
+    assert path != greeting_cache_path("agent", "Bonsoir", _voice("Aoede"), str(tmp_path))
+    assert path != greeting_cache_path("agent", "Bonjour", _voice("Zephyr"), str(tmp_path))
+
+def test_greeting_cache_maps_rendered_greeting(tmp_path):
+    cache = GreetingCache(str(tmp_path))
+    assert cache.load("agent", "Bonjour") is None
+
+    with open(greeting_cache_path("agent", "Bonjour", None, str(tmp_path)), "wb") as f:
+        f.write(b"\x7f" * 480)
+    audio = cache.load("agent", "Bonjour")
+    assert bytes(audio) == b"\x7f" * 480
+    assert cache.get("agent", "Bonjour") is audio
+
+def test_greeting_cache_ignores_empty_file(tmp_path):
+    open(greeting_cache_path("agent", "Bonjour", None, str(tmp_path)), "wb").close()
+    assert GreetingCache(str(tmp_path)).load("agent", "Bonjour") is None
+
+def test_greeting_cache_switches_to_an_edited_greeting(tmp_path):
+    cache = GreetingCache(str(tmp_path))
+    for greeting, byte in (("Bonjour", b"\x7f"), ("Bonsoir", b"\x01")):
+        with open(greeting_cache_path("agent", greeting, None, str(tmp_path)), "wb") as f:
+            f.write(byte * 160)
+    old = cache.load("agent", "Bonjour")
+
+    # The agent is reloaded with an edited greeting
+    assert cache.get("agent", "Bonsoir") is None
+    assert bytes(cache.load("agent", "Bonsoir")) == b"\x01" * 160
+    assert cache.get("agent", "Bonjour") is None
+    assert bytes(old) == b"\x7f" * 160
@@ -0,0 +1,277 @@
+import asyncio
+from google.adk.agents.live_request_queue import LiveRequestQueue
+from google.adk.events import Event
+from google.genai.types import Blob, Content, Part
+from channels.twilio.live_messaging import PcmCoalescer, text_to_content
+
+FRAME_20MS = b"\x01\x00" * 320 # 20 ms of 16-bit 16kHz PCM
+
+def _drain(queue: LiveRequestQueue) -> list[bytes]:
+    blobs = []
+    while not queue._queue.empty():
+        blobs.append(queue._queue.get_nowait().blob.data)
+    return blobs
+
+def test_pcm_coalescer_passes_frames_through_by_default():
+    async def run():
+        queue = LiveRequestQueue()
+        sender = PcmCoalescer(queue)
+        for _ in range(3):
+            sender.send(FRAME_20MS)
+        return _drain(queue)
+
+    assert asyncio.run(run()) == [FRAME_20MS] * 3
+
+def test_pcm_coalescer_packs_frames_up_to_target():
+    async def run():
+        queue = LiveRequestQueue()
+        sender = PcmCoalescer(queue, coalesce_ms=60)
+        for _ in range(7):
+            sender.send(FRAME_20MS)
+        packed = _drain(queue)
+        sender.close()
+        return packed, sender.sends
+
+    packed, sends = asyncio.run(run())
+    assert packed == [FRAME_20MS * 3] * 2
+    assert sends == 2
+
+def test_pcm_coalescer_flushes_partial_buffer_at_deadline():
+    async def run():
+        queue = LiveRequestQueue()
+        sender = PcmCoalescer(queue, coalesce_ms=100, max_delay_ms=10)
+        sender.send(FRAME_20MS)
+        assert _drain(queue) == []
+        await asyncio.sleep(0.05)
+        return _drain(queue)
+
+    assert asyncio.run(run()) == [FRAME_20MS]
+
+def _agent():
+    from google.adk.agents import Agent
+    return Agent(name="pool_test_agent", model="gemini-live-2.5-flash-native-audio", instruction="Test")
+
+def _live_runner(agent):
+    """An InMemoryRunner whose run_live records connections instead of dialing the model"""
+    from google.adk.runners import InMemoryRunner
+
+    class LiveRunner(InMemoryRunner):
+        connections: list = []
+
+        async def run_live(self, *, live_request_queue, run_config=None, session=None, **kwargs):
+            self.connections.append(session.id)
+            while not (await live_request_queue.get()).close:
+                pass
+            yield Event(author=agent.name, content=text_to_content("closed", role="model"))
+
+    return LiveRunner(agent=agent, app_name="pool_test_agent", plugins=[])
+
+def test_live_session_pool_hits_after_warm_up():
+    from channels.twilio.live_messaging import LiveSessionPool
+
+    async def run():
+        pool = LiveSessionPool(size=2, ttl=60)
+        agent = _agent()
+        runner = _live_runner(agent)
+        pool.warm(agent, "pool_test_agent", runner=runner)
+        await asyncio.sleep(0.05)
+        ready = pool.metrics()["ready"]["pool_test_agent"]
+        _, queue, _ = await pool.acquire("CA123", agent, "pool_test_agent", runner=runner)
+        await asyncio.sleep(0.05)
+        metrics = pool.metrics()
+        await pool.close()
+        return ready, queue, metrics
+
+    ready, queue, metrics = asyncio.run(run())
+    assert ready == 2
+    assert isinstance(queue, LiveRequestQueue)
+    assert (metrics["hits"], metrics["misses"]) == (1, 0)
+    # Refilled in the background after the acquire
+    assert metrics["ready"]["pool_test_agent"] == 2
+
+def test_live_session_pool_connects_before_acquire_and_binds_the_call_sid():
+    from channels.twilio.live_messaging import CALL_SID_STATE, LiveSessionPool
+
+    async def run():
+        pool = LiveSessionPool(size=1, ttl=60)
+        agent = _agent()
+        runner = _live_runner(agent)
+        service = runner.session_service
+        pool.warm(agent, "pool_test_agent", runner=runner)
+        await asyncio.sleep(0.05)
+        created = {session.id for session in (await service.list_sessions(app_name="pool_test_agent")).sessions}
+        connected = list(runner.connections)
+        live_events, queue, hit = await pool.acquire("CA1", agent, "pool_test_agent", runner=runner)
+        # The acquire created no session and opened no connection of its own
+        after_acquire = list(runner.connections)
+        _, _, miss = await pool.acquire("CA2", agent, "pool_test_agent", runner=runner) # Before the refill
+        stored = await service.get_session(app_name="pool_test_agent", user_id=hit.session.user_id, session_id=hit.session.id)
+        queue.close()
+        events = [event async for event in live_events]
+        metrics = pool.metrics()
+        await pool.close()
+        return created, connected, after_acquire, hit, miss, stored, events, metrics
+
+    created, connected, after_acquire, hit, miss, stored, events, metrics = asyncio.run(run())
+    assert (metrics["hits"], metrics["misses"]) == (1, 1)
+    assert connected == after_acquire == [hit.session.id]
+    assert created == {hit.session.id}
+    assert stored.state[CALL_SID_STATE] == "CA1"
+    assert (miss.session.id, miss.session.state[CALL_SID_STATE]) == ("CA2", "CA2")
+    # Events of the pre-opened connection reach the call
+    assert [event.content.parts[0].text for event in events] == ["closed"]
+
+def test_live_session_pool_recycles_expired_sessions():
+    from channels.twilio.live_messaging import LiveSessionPool
+
+    async def run():
+        pool = LiveSessionPool(size=1, ttl=0.05)
+        agent = _agent()
+        pool.warm(agent, "pool_test_agent", runner=_live_runner(agent))
+        await asyncio.sleep(0.2)
+        metrics = pool.metrics()
+        await pool.close()
+        return metrics
+
+    metrics = asyncio.run(run())
+    assert metrics["recycled"] >= 2
+    assert metrics["ready"]["pool_test_agent"] == 1
+
+def test_live_session_pool_seeds_greeting_before_connecting():
+    from channels.twilio.live_messaging import LiveSessionPool
+
+    async def run():
+        pool = LiveSessionPool(size=1, ttl=60)
+        agent = _agent()
+        runner = _live_runner(agent)
+        pool.warm(agent, "pool_test_agent", runner=runner)
+        await asyncio.sleep(0.05)
+        unseeded = pool._ready["pool_test_agent"][0]
+        # The first call with the greeting misses and re-warms the pool with it
+        await pool.acquire("CA1", agent, "pool_test_agent", greeting="Bonjour", runner=runner)
+        await asyncio.sleep(0.05)
+        seeded = pool._ready["pool_test_agent"][0]
+        seeded_events = list(seeded.session.events)
+        _, _, hit = await pool.acquire("CA2", agent, "pool_test_agent", greeting="Bonjour", runner=runner)
+        metrics = pool.metrics()
+        await pool.close()
+        return unseeded, seeded, seeded_events, hit, metrics
+
+    unseeded, seeded, seeded_events, hit, metrics = asyncio.run(run())
+    assert (metrics["hits"], metrics["misses"]) == (1, 1)
+    assert unseeded.session.events == []
+    assert hit is seeded
+    assert [(event.content.role, event.content.parts[0].text) for event in seeded_events] == [("model", "Bonjour")]
+
+def test_calls_share_runner_and_release_their_sessions():
+    from google.adk.runners import InMemoryRunner
+    from channels.twilio.live_messaging import end_agent_session, start_agent_session_with_agent
+
+    async def run():
+        agent = _agent()
+        runner = InMemoryRunner(agent=agent, app_name="pool_test_agent", plugins=[])
+        calls = [
+            await start_agent_session_with_agent(f"user{n}", f"CA{n}", agent, agent_name="pool_test_agent", runner=runner)
+            for n in range(2)
+        ]
+        sessions = [warm.session for _, _, warm in calls]
+        listed = await runner.session_service.list_sessions(app_name="pool_test_agent")
+        for _, _, warm in calls:
+            await end_agent_session(warm)
+        remaining = await runner.session_service.list_sessions(app_name="pool_test_agent")
+        return calls, sessions, listed, remaining
+
+    calls, sessions, listed, remaining = asyncio.run(run())
+    assert all(warm.runner is calls[0][2].runner for _, _, warm in calls)
+    # Sessions live under the Runner's app name, where run_live looks them up
+    assert [session.app_name for session in sessions] == ["pool_test_agent"] * 2
+    assert len(listed.sessions) == 2
+    assert remaining.sessions == []
+    assert all(queue._queue.get_nowait().close for _, queue, _ in calls)
+
+def test_bounded_request_queue_drops_oldest_audio_but_keeps_control():
+    from channels.twilio.live_messaging import BoundedLiveRequestQueue
+
+    async def run():
+        queue = BoundedLiveRequestQueue(max_ms=60)
+        queue.send_content(text_to_content("Allo"))
+        for n in range(5):
+            queue.send_realtime(Blob(data=bytes([n]) * 640, mime_type="audio/pcm;rate=16000"))
+        metrics = queue.metrics()
+        requests = [await queue.get() for _ in range(queue._queue.qsize())]
+        return metrics, requests
+
+    metrics, requests = asyncio.run(run())
+    assert requests[0].content.parts[0].text == "Allo"
+    assert [request.blob.data[0] for request in requests[1:]] == [2, 3, 4]
+    assert (metrics["depth_ms"], metrics["dropped"], metrics["dropped_ms"]) == (60, 2, 40)
+
+def test_bounded_request_queue_merges_backlog():
+    from channels.twilio.live_messaging import BoundedLiveRequestQueue
+
+    async def run():
+        queue = BoundedLiveRequestQueue(max_ms=1000, overflow="merge")
+        for _ in range(3):
+            queue.send_realtime(Blob(data=FRAME_20MS, mime_type="audio/pcm;rate=16000"))
+        return queue.metrics(), _drain(queue)
+
+    metrics, blobs = asyncio.run(run())
+    assert blobs == [FRAME_20MS * 3]
+    assert (metrics["merged"], metrics["dropped"]) == (2, 0)
+
+def test_agent_event_queue_decouples_slow_handler_and_clears_on_interrupt():
+    from channels.twilio.live_messaging import AgentEventQueue, agent_to_client_messaging
+
+    def audio_event(data: bytes) -> Event:
+        return Event(author="agent", content=Content(role="model", parts=[
+            Part(inline_data=Blob(data=data, mime_type="audio/pcm;rate=24000"))
+        ]))
+
+    async def live_events():
+        for n in range(3):
+            yield audio_event(bytes([n]) * 480)
+        yield Event(author="agent", interrupted=True)
+        yield audio_event(b"\x09" * 480)
+
+    async def run():
+        queue = AgentEventQueue(max_ms=1000, overflow="drop_oldest")
+        handled = []
+
+        async def on_agent_event(message):
+            await asyncio.sleep(0.01) # Slower than the model
+            handled.append(message)
+
+        await agent_to_client_messaging(on_agent_event, live_events(), queue=queue)
+        return handled, queue.metrics()
+
+    handled, metrics = asyncio.run(run())
+    # The model got ahead of the handler, so the interrupted audio never played
+    assert [message.type for message in handled] == ["interrupted", "data"]
+    assert handled[-1].payload == b"\x09" * 480
+    assert metrics["cleared"] == 3
+
+def test_agent_events_classify_parts_and_convert_to_models():
+    from channels.twilio.live_messaging import AgentDataEvent, AgentTurnCompleteEvent, agent_to_client_messaging
+
+    async def live_events():
+        yield Event(author="agent", content=Content(role="model", parts=[
+            Part(text="transcript"),
+            Part(inline_data=Blob(data=b"\x01\x00" * 240, mime_type="audio/pcm;rate=24000")),
+            Part(inline_data=Blob(data=b"", mime_type="audio/pcm;rate=24000")),
+        ]))
+        yield Event(author="agent", turn_complete=True)
+
+    async def run():
+        handled = []
+
+        async def on_agent_event(message):
+            handled.append(message)
+
+        await agent_to_client_messaging(on_agent_event, live_events())
+        return handled
+
+    handled = asyncio.run(run())
+    assert [message.type for message in handled] == ["data", "complete"]
+    data, complete = (message.to_model() for message in handled)
+    assert isinstance(data, AgentDataEvent) and data.payload == b"\x01\x00" * 240
+    assert isinstance(complete, AgentTurnCompleteEvent)
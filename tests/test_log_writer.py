@@ -0,0 +1,106 @@
+import asyncio
+import io
+import json
+import logging
+from types import SimpleNamespace
+
+from plugins.log_writer import OFF, JsonLogWriter, LogPolicy
+
+def test_writer_batches_json_records_off_the_caller_thread():
+    stream = io.StringIO()
+    writer = JsonLogWriter(stream=stream, flush_interval=0.01)
+    writer.emit(logging.INFO, {"event": "tool_start", "tool": "search"})
+    writer.emit(logging.DEBUG, {"event": "hidden"})
+    writer.emit(logging.ERROR, {"event": "tool_error", "error": ValueError("boom")})
+    writer.close()
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [record["event"] for record in records] == ["tool_start", "tool_error"]
+    assert [record["level"] for record in records] == ["info", "error"]
+    assert records[1]["error"] == "boom"
+    assert writer.metrics()["written"] == 2
+
+def test_writer_drops_and_counts_records_when_saturated():
+    stream = io.StringIO()
+    writer = JsonLogWriter(stream=stream, max_queue=3, flush_interval=60)
+    writer._thread = object() # Keep the background thread from draining
+    for n in range(5):
+        writer.emit(logging.INFO, {"event": "event", "n": n})
+    assert writer.metrics()["dropped"] == 2
+    writer._thread = None
+    writer.close()
+    assert [json.loads(line)["n"] for line in stream.getvalue().splitlines()] == [0, 1, 2]
+
+def test_logging_plugin_skips_formatting_below_the_writer_level():
+    from plugins.logging_plugin import LoggingPlugin
+
+    stream = io.StringIO()
+    writer = JsonLogWriter(stream=stream, level=logging.INFO)
+    plugin = LoggingPlugin(writer=writer)
+    formatted = []
+    plugin._format_args = lambda args, max_length=300: formatted.append(args) or str(args)
+    tool = SimpleNamespace(name="search")
+    tool_context = SimpleNamespace(agent_name="agent", invocation_id="inv", function_call_id="call")
+
+    asyncio.run(plugin.before_tool_callback(tool=tool, tool_args={"q": "x"}, tool_context=tool_context))
+    writer.close()
+
+    (record,) = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert record["event"] == "tool_start" and record["tool"] == "search"
+    assert "args" not in record
+    assert formatted == []
+
+def test_writer_only_builds_records_it_writes():
+    built = []
+    writer = JsonLogWriter(stream=io.StringIO(), level=logging.INFO)
+    writer.emit(logging.DEBUG, lambda: built.append("debug") or {"event": "debug"})
+    writer.emit(logging.INFO, lambda: built.append("info") or {"event": "info"})
+    writer.close()
+    assert built == ["info"]
+
+def test_policy_reads_levels_and_sampling_from_env(monkeypatch):
+    monkeypatch.setenv("LOGGING_PLUGIN_LEVEL", "warning")
+    monkeypatch.setenv("LOGGING_PLUGIN_CALLBACK_LEVELS", "tool=DEBUG, event=OFF")
+    monkeypatch.setenv("LOGGING_PLUGIN_SESSION_SAMPLE", "0.01")
+    policy = LogPolicy.from_env()
+    assert policy.level_for("model") == logging.WARNING
+    assert policy.level_for("tool") == logging.DEBUG
+    assert policy.level_for("event") == OFF
+    sampled = sum(policy.session_sampled(f"session-{n}") for n in range(10_000))
+    assert 50 < sampled < 150
+
+def test_logging_plugin_logs_sampled_sessions_fully():
+    from plugins.logging_plugin import LoggingPlugin
+
+    stream = io.StringIO()
+    writer = JsonLogWriter(stream=stream, level=logging.NOTSET)
+    policy = LogPolicy(level=logging.WARNING, session_sample_rate=0.5)
+    plugin = LoggingPlugin(writer=writer, policy=policy)
+    sessions = [f"session-{n}" for n in range(20)]
+    tool = SimpleNamespace(name="search")
+    for session_id in sessions:
+        tool_context = SimpleNamespace(
+            agent_name="agent", invocation_id="inv", function_call_id="call", session=SimpleNamespace(id=session_id)
+        )
+        asyncio.run(plugin.before_tool_callback(tool=tool, tool_args={"q": session_id}, tool_context=tool_context))
+    writer.close()
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    expected = [session_id for session_id in sessions if policy.session_sampled(session_id)]
+    assert 0 < len(expected) < len(sessions)
+    assert [record["args"] for record in records] == [str({"q": session_id}) for session_id in expected]
+
+def test_logging_plugin_reports_dropped_records_on_metrics():
+    from channels.twilio.metrics import MetricsRegistry
+    from plugins.logging_plugin import LoggingPlugin
+
+    registry = MetricsRegistry()
+    writer = JsonLogWriter(stream=io.StringIO(), max_queue=1)
+    writer._thread = object() # Keep the background thread from draining
+    LoggingPlugin(metrics=registry, writer=writer)
+    for n in range(3):
+        writer.emit(logging.INFO, {"event": "event", "n": n})
+
+    text = registry.render()
+    assert 'adk_log_records{state="queued"} 1' in text
+    assert 'adk_log_records{state="dropped"} 2' in text
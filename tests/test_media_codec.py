@@ -0,0 +1,35 @@
+import base64
+import json
+from channels.twilio.media_codec import TwilioMessageEncoder, media_payload
+
+ULAW = bytes(range(256))[:160]
+
+def _media_message(payload: str, **fields) -> str:
+    message = {
+        "event": "media",
+        "sequenceNumber": "3",
+        "media": {"track": "inbound", "chunk": "1", "timestamp": "5", "payload": payload},
+        "streamSid": "MZ123",
+    }
+    return json.dumps(message, separators=(",", ":"), **fields)
+
+def test_media_payload_slices_twilio_media_messages():
+    assert media_payload(_media_message(base64.b64encode(ULAW).decode())) == ULAW
+
+def test_media_payload_falls_back_to_json_for_escaped_payloads():
+    payload = base64.b64encode(b"\xff\xfe" * 80).decode()
+    assert "/" in payload
+    escaped = _media_message(payload).replace("/", "\\/")
+    assert media_payload(escaped) == b"\xff\xfe" * 80
+
+def test_media_payload_ignores_other_events():
+    assert media_payload('{"event":"mark","streamSid":"MZ123","mark":{"name":"3:10"}}') is None
+    assert media_payload('{"event":"stop","streamSid":"MZ123"}') is None
+
+def test_twilio_message_encoder_matches_json_messages():
+    encoder = TwilioMessageEncoder('MZ"123')
+    assert json.loads(encoder.media(ULAW)) == {
+        "event": "media", "streamSid": 'MZ"123', "media": {"payload": base64.b64encode(ULAW).decode()}
+    }
+    assert json.loads(encoder.mark("3:10")) == {"event": "mark", "streamSid": 'MZ"123', "mark": {"name": "3:10"}}
+    assert json.loads(encoder.clear()) == {"event": "clear", "streamSid": 'MZ"123'}
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+from channels.twilio.metrics import MetricsRegistry
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    frames = registry.counter("frames_total", "Frames", ("direction",))
+    frames.labels("in").inc()
+    frames.labels("in").inc(2)
+    registry.gauge("active_calls", "Calls", function=lambda: 3)
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE frames_total counter" in lines
+    assert 'frames_total{direction="in"} 3.0' in lines
+    assert "active_calls 3" in lines
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert "latency_seconds_count 3" in lines
+    # Asking again returns the same metric instead of a second family
+    assert registry.counter("frames_total", "Frames", ("direction",)) is frames
+
+def test_logging_plugin_records_tool_latency_and_tokens():
+    from google.genai import types
+    from plugins.logging_plugin import LoggingPlugin
+
+    from plugins.log_writer import JsonLogWriter
+
+    registry = MetricsRegistry()
+    plugin = LoggingPlugin(metrics=registry, writer=JsonLogWriter(level=logging.CRITICAL))
+    tool = SimpleNamespace(name="search")
+    tool_context = SimpleNamespace(agent_name="agent", invocation_id="inv", function_call_id="call")
+    event = SimpleNamespace(
+        author="agent",
+        usage_metadata=types.GenerateContentResponseUsageMetadata(prompt_token_count=12, total_token_count=20),
+        get_function_calls=lambda: [],
+        get_function_responses=lambda: [],
+        long_running_tool_ids=None,
+        input_transcription=None,
+        output_transcription=None,
+        content=None,
+        turn_complete=False,
+    )
+
+    async def run():
+        await plugin.before_tool_callback(tool=tool, tool_args={}, tool_context=tool_context)
+        await plugin.after_tool_callback(tool=tool, tool_args={}, tool_context=tool_context, result={})
+        await plugin.on_event_callback(invocation_context=SimpleNamespace(invocation_id="inv"), event=event)
+
+    asyncio.run(run())
+    lines = registry.render().splitlines()
+    assert 'adk_tool_seconds_count{agent="agent",tool="search"} 1' in lines
+    assert 'adk_tokens_total{agent="agent",kind="prompt"} 12.0' in lines
+    assert 'adk_tokens_total{agent="agent",kind="total"} 20.0' in lines
+    assert plugin._tool_started == {}
@@ -0,0 +1,155 @@
+import asyncio
+import collections
+import time
+
+import numpy as np
+import pytest
+
+from channels.twilio.audio import CallTranscoder, TranscodeExecutor
+from channels.twilio.outbound import FRAME_BYTES, OutboundScheduler, finish_turn
+
+def test_outbound_scheduler_splits_into_exact_frames():
+    async def run():
+        sent = []
+        async def send(frame):
+            sent.append(frame)
+        scheduler = OutboundScheduler(send, burst_ms=1000)
+        task = asyncio.create_task(scheduler.run())
+        await scheduler.put(b"\x01" * 250)
+        await scheduler.put(b"\x02" * 100)
+        scheduler.flush_partial()
+        await asyncio.sleep(0.01)
+        task.cancel()
+        return sent
+
+    sent = asyncio.run(run())
+    assert [len(frame) for frame in sent] == [FRAME_BYTES] * 3
+    assert sent[1] == b"\x01" * 90 + b"\x02" * 70
+    # The trailing partial frame is padded with u-law silence
+    assert sent[2] == b"\x02" * 30 + b"\xff" * 130
+
+def test_outbound_scheduler_bursts_then_paces_at_real_time():
+    async def run():
+        sent_at = []
+        async def send(frame):
+            sent_at.append(time.monotonic())
+        scheduler = OutboundScheduler(send, burst_ms=60)
+        task = asyncio.create_task(scheduler.run())
+        start = time.monotonic()
+        await scheduler.put(b"\x00" * FRAME_BYTES * 8)
+        await asyncio.sleep(0.2)
+        task.cancel()
+        return [t - start for t in sent_at]
+
+    sent_at = asyncio.run(run())
+    # 60 ms of audio goes out at once, the rest follows one frame per 20 ms
+    assert all(t < 0.01 for t in sent_at[:3])
+    assert sent_at[3] > 0.015
+    assert 0.09 < sent_at[-1] < 0.16
+
+def test_outbound_scheduler_clear_drops_unsent_audio():
+    async def run():
+        sent = []
+        async def send(frame):
+            sent.append(frame)
+        scheduler = OutboundScheduler(send, burst_ms=20, max_queued_ms=100)
+        task = asyncio.create_task(scheduler.run())
+        # More than the queue holds: put() waits for room until the barge-in
+        put = asyncio.create_task(scheduler.put(b"\x00" * FRAME_BYTES * 20))
+        await asyncio.sleep(0.05)
+        assert not put.done()
+        dropped = scheduler.clear()
+        await asyncio.wait_for(put, 1)
+        await asyncio.sleep(0.05)
+        task.cancel()
+        return len(sent), dropped, scheduler.queued_frames
+
+    sent, dropped, queued = asyncio.run(run())
+    assert dropped == 5
+    assert queued == 0
+    assert sent < 8
+
+def test_outbound_scheduler_tracks_heard_position_with_marks():
+    async def run():
+        marks = []
+        async def send(frame):
+            pass
+        async def send_mark(name):
+            marks.append(name)
+        scheduler = OutboundScheduler(send, send_mark=send_mark, burst_ms=1000, mark_every_ms=100)
+        task = asyncio.create_task(scheduler.run())
+
+        await scheduler.put(b"\x00" * FRAME_BYTES * 12)
+        scheduler.end_turn()
+        await asyncio.sleep(0.01)
+        # Twilio echoes the first mark once that audio has played
+        scheduler.acknowledge(marks[0])
+
+        await scheduler.put(b"\x00" * FRAME_BYTES * 8)
+        await asyncio.sleep(0.01)
+        scheduler.clear()
+        # Marks echoed because of the clear did not play
+        for name in marks[1:]:
+            assert scheduler.acknowledge(name) is None
+        task.cancel()
+        return marks, scheduler
+
+    marks, scheduler = asyncio.run(run())
+    assert marks == ["0:5", "0:10", "0:12", "1:5"]
+    first, second = scheduler.turns[0], scheduler.turns[1]
+    assert (first.frames_queued, first.frames_sent, first.heard_ms, first.unheard_ms) == (12, 12, 100, 140)
+    assert first.interrupted and second.interrupted
+    assert scheduler.interrupted_turns == [first, second]
+
+def test_outbound_scheduler_plays_memory_mapped_audio(tmp_path):
+    import numpy as np
+    path = tmp_path / "greeting.ulaw"
+    path.write_bytes(b"\x01" * 400)
+    greeting = np.memmap(path, dtype=np.uint8, mode="r")
+
+    async def run():
+        sent = []
+        async def send(frame):
+            sent.append(bytes(frame))
+        scheduler = OutboundScheduler(send, burst_ms=1000)
+        task = asyncio.create_task(scheduler.run())
+        await scheduler.put(greeting)
+        scheduler.end_turn()
+        await asyncio.sleep(0.01)
+        task.cancel()
+        return sent
+
+    sent = asyncio.run(run())
+    assert sent == [b"\x01" * FRAME_BYTES] * 2 + [b"\x01" * 80 + b"\xff" * 80]
+
+@pytest.mark.parametrize("resampler", ["soxr", "polyphase"])
+@pytest.mark.parametrize("threaded", [False, True])
+def test_finish_turn_queues_the_resampler_tail_in_its_own_turn(resampler, threaded):
+    rng = np.random.default_rng(3)
+    turns = [rng.integers(-8000, 8000, n, dtype=np.int16).tobytes() for n in (24000, 7203)]
+
+    async def run():
+        executor = TranscodeExecutor(max_workers=2, resampler=resampler) if threaded else None
+        transcoder = executor.open_call() if executor else CallTranscoder(fused=True, resampler=resampler)
+        scheduler = OutboundScheduler(lambda frame: asyncio.sleep(0), max_queued_ms=60_000)
+        queued = collections.Counter()
+        put = scheduler.put
+        async def counting_put(ulaw):
+            queued[scheduler.turn] += len(ulaw)
+            await put(ulaw)
+        scheduler.put = counting_put
+
+        for pcm24 in turns:
+            # Model chunks are not guaranteed to split on sample boundaries
+            for i in range(0, len(pcm24), 1001):
+                ulaw = transcoder.outbound(pcm24[i:i + 1001])
+                if executor:
+                    ulaw = await ulaw
+                await scheduler.put(ulaw)
+            await finish_turn(scheduler, transcoder)
+        if executor:
+            executor.close()
+        return queued
+
+    queued = asyncio.run(run())
+    assert [queued[turn] for turn in range(len(turns))] == [len(pcm24) // 6 for pcm24 in turns]
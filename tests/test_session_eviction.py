@@ -0,0 +1,71 @@
+import asyncio
+import json
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from google.genai.types import Content, Part
+from channels.twilio.session_eviction import EvictingSessionService
+
+def _event(text: str) -> Event:
+    return Event(author="agent", content=Content(role="model", parts=[Part(text=text)]))
+
+async def _ids(service: EvictingSessionService) -> list[str]:
+    listed = await service.list_sessions(app_name="app")
+    return sorted(session.id for session in listed.sessions)
+
+def test_evicting_session_service_caps_sessions_lru():
+    async def run():
+        service = EvictingSessionService(InMemorySessionService(), max_sessions=2)
+        for session_id in ("a", "b"):
+            await service.create_session(app_name="app", user_id="u", session_id=session_id)
+        await service.get_session(app_name="app", user_id="u", session_id="a") # b is now least recent
+        await service.create_session(app_name="app", user_id="u", session_id="c")
+        return await _ids(service), service.metrics()
+
+    ids, metrics = asyncio.run(run())
+    assert ids == ["a", "c"]
+    assert metrics["sessions"] == 2
+    assert metrics["evicted"] == {"sessions": 1}
+
+def test_evicting_session_service_caps_events_and_tracks_bytes():
+    async def run():
+        service = EvictingSessionService(InMemorySessionService(), max_events=3)
+        old = await service.create_session(app_name="app", user_id="u", session_id="old")
+        for _ in range(2):
+            await service.append_event(old, _event("x" * 100))
+        before = service.metrics()
+        new = await service.create_session(app_name="app", user_id="u", session_id="new")
+        for _ in range(2):
+            await service.append_event(new, _event("y"))
+        return before, await _ids(service), service.metrics()
+
+    before, ids, metrics = asyncio.run(run())
+    assert before["events"] == 2
+    assert before["bytes"] > 200
+    # The session being written to survives; the older one makes room
+    assert ids == ["new"]
+    assert (metrics["events"], metrics["evicted"]) == (2, {"events": 1})
+
+def test_evicting_session_service_expires_and_archives_idle_sessions(tmp_path):
+    async def run():
+        service = EvictingSessionService(InMemorySessionService(), ttl=0, archive_dir=str(tmp_path))
+        session = await service.create_session(app_name="app", user_id="u", session_id="idle")
+        await service.append_event(session, _event("Bonjour"))
+        await service.sweep()
+        return await _ids(service), service.metrics()
+
+    ids, metrics = asyncio.run(run())
+    assert ids == []
+    assert metrics == {"sessions": 0, "events": 0, "bytes": 0, "evicted": {"ttl": 1}, "archived": 1}
+    archived = json.loads((tmp_path / "app" / "u" / "idle.json").read_text())
+    assert archived["events"][0]["content"]["parts"][0]["text"] == "Bonjour"
+
+def test_evicting_session_service_forgets_deleted_sessions():
+    async def run():
+        service = EvictingSessionService(InMemorySessionService())
+        session = await service.create_session(app_name="app", user_id="u")
+        await service.append_event(session, _event("hi"))
+        await service.delete_session(app_name="app", user_id="u", session_id=session.id)
+        return service.metrics()
+
+    metrics = asyncio.run(run())
+    assert (metrics["sessions"], metrics["events"], metrics["bytes"]) == (0, 0, 0)
@@ -0,0 +1,158 @@
+import asyncio
+import pytest
+from google.adk.errors.already_exists_error import AlreadyExistsError
+from google.adk.events import Event, EventActions
+from google.genai.types import Content, Part
+from channels.twilio.sqlite_sessions import SqliteSessionService
+
+def _event(text: str, state_delta: dict | None = None) -> Event:
+    return Event(
+        author="agent",
+        content=Content(role="model", parts=[Part(text=text)]),
+        actions=EventActions(state_delta=state_delta or {}),
+    )
+
+def test_sqlite_session_service_persists_events_and_state(tmp_path):
+    path = str(tmp_path / "sessions.db")
+
+    async def write():
+        service = SqliteSessionService(path, flush_interval=10)
+        session = await service.create_session(app_name="app", user_id="u", session_id="CA1", state={"caller": "+33"})
+        await service.append_event(session, _event("Bonjour", {"topic": "rdv", "user:name": "Ana", "temp:scratch": 1}))
+        await service.append_event(session, _event("Au revoir", {"app:calls": 1}))
+        pending = service.pending_writes
+        await service.close()
+        return pending
+
+    async def read():
+        service = SqliteSessionService(path)
+        session = await service.get_session(app_name="app", user_id="u", session_id="CA1")
+        listed = await service.list_sessions(app_name="app", user_id="u")
+        user_state = await service.get_user_state(app_name="app", user_id="u")
+        await service.close()
+        return session, listed, user_state
+
+    # Nothing is committed until the flush interval or close
+    assert asyncio.run(write()) > 0
+    session, listed, user_state = asyncio.run(read())
+    assert [event.content.parts[0].text for event in session.events] == ["Bonjour", "Au revoir"]
+    assert session.state == {"caller": "+33", "topic": "rdv", "user:name": "Ana", "app:calls": 1}
+    assert [listed_session.id for listed_session in listed.sessions] == ["CA1"]
+    assert listed.sessions[0].state["user:name"] == "Ana"
+    assert user_state == {"name": "Ana"}
+
+def test_sqlite_session_service_batches_writes(tmp_path):
+    async def run():
+        service = SqliteSessionService(str(tmp_path / "sessions.db"), flush_interval=0.01)
+        session = await service.create_session(app_name="app", user_id="u")
+        for n in range(20):
+            await service.append_event(session, _event(f"turn {n}", {"turn": n}))
+        await asyncio.sleep(0.05)
+        metrics = service.metrics()
+        await service.close()
+        return metrics
+
+    metrics = asyncio.run(run())
+    assert metrics["pending_writes"] == 0
+    # One commit for the whole burst, with the session state written once
+    assert metrics["flushes"] == 1
+    assert metrics["rows_written"] == 22
+
+def test_sqlite_session_service_reads_through_evicted_sessions(tmp_path):
+    async def run():
+        service = SqliteSessionService(str(tmp_path / "sessions.db"), cache_size=1)
+        first = await service.create_session(app_name="app", user_id="u", session_id="a")
+        await service.append_event(first, _event("kept", {"step": 1}))
+        await service.create_session(app_name="app", user_id="u", session_id="b") # Pushes "a" out
+        cached = service.metrics()["sessions"]
+        reloaded = await service.get_session(app_name="app", user_id="u", session_id="a")
+        with pytest.raises(AlreadyExistsError):
+            await service.create_session(app_name="app", user_id="u", session_id="b")
+        await service.delete_session(app_name="app", user_id="u", session_id="a")
+        missing = await service.get_session(app_name="app", user_id="u", session_id="a")
+        await service.close()
+        return cached, reloaded, missing
+
+    cached, reloaded, missing = asyncio.run(run())
+    assert cached == 1
+    assert [event.content.parts[0].text for event in reloaded.events] == ["kept"]
+    assert reloaded.state == {"step": 1}
+    assert missing is None
+
+def test_sqlite_session_service_retries_writes_after_a_failed_commit(tmp_path):
+    path = str(tmp_path / "sessions.db")
+
+    class FailingConnection:
+        """Fails the first event insert, then behaves like the connection."""
+        def __init__(self, db):
+            self.db = db
+            self.failed = False
+
+        def execute(self, sql, *args):
+            if sql.startswith("INSERT INTO events") and not self.failed:
+                self.failed = True
+                raise OSError("disk I/O error")
+            return self.db.execute(sql, *args)
+
+        def __getattr__(self, name):
+            return getattr(self.db, name)
+
+    async def run():
+        service = SqliteSessionService(path, flush_interval=10)
+        service._db = FailingConnection(service._db)
+        session = await service.create_session(app_name="app", user_id="u", session_id="CA1")
+        await service.append_event(session, _event("Bonjour", {"topic": "rdv"}))
+        with pytest.raises(OSError):
+            await service.flush()
+        failed = service.metrics()
+        await service.append_event(session, _event("Au revoir"))
+        await service.close()
+        return failed
+
+    failed = asyncio.run(run())
+    assert failed["flush_errors"] == 1 and failed["pending_writes"] == 3
+
+    async def read():
+        service = SqliteSessionService(path)
+        session = await service.get_session(app_name="app", user_id="u", session_id="CA1")
+        await service.close()
+        return session
+
+    session = asyncio.run(read())
+    assert [event.content.parts[0].text for event in session.events] == ["Bonjour", "Au revoir"]
+    assert session.state == {"topic": "rdv"}
+
+def test_sqlite_session_service_workers_see_and_keep_each_others_writes(tmp_path):
+    from google.adk.errors._stale_session_error import StaleSessionError
+
+    path = str(tmp_path / "sessions.db")
+
+    async def run():
+        a = SqliteSessionService(path, flush_interval=10)
+        b = SqliteSessionService(path, flush_interval=10)
+        await a.create_session(app_name="app", user_id="u", session_id="s")
+        await a.flush()
+        on_b = await b.get_session(app_name="app", user_id="u", session_id="s") # Now cached by b
+        on_a = await a.get_session(app_name="app", user_id="u", session_id="s")
+        await a.append_event(on_a, _event("from a", {"k": "A", "app:visits": 1}))
+        await a.flush()
+
+        # b reloads the session a wrote, and rejects appends to its old copy
+        with pytest.raises(StaleSessionError):
+            await b.append_event(on_b, _event("stale"))
+        on_b = await b.get_session(app_name="app", user_id="u", session_id="s")
+        await b.append_event(on_b, _event("from b", {"j": "B", "user:name": "Ana"}))
+        await b.flush()
+        metrics = b.metrics()
+        await a.close()
+        await b.close()
+
+        reader = SqliteSessionService(path)
+        stored = await reader.get_session(app_name="app", user_id="u", session_id="s")
+        await reader.close()
+        return stored, metrics
+
+    stored, metrics = asyncio.run(run())
+    assert metrics["reloads"] == 1
+    assert [event.content.parts[0].text for event in stored.events] == ["from a", "from b"]
+    assert stored.state == {"k": "A", "j": "B", "app:visits": 1, "user:name": "Ana"}
@@ -0,0 +1,51 @@
+import time
+
+import numpy as np
+
+from channels.twilio.metrics import LatencyHistogram
+from channels.twilio.tracing import TurnLatencyStats, TurnTracer
+
+SILENCE = b"\x00\x00" * 320
+SPEECH = (np.sin(np.arange(320) / 3) * 8000).astype(np.int16).tobytes()
+
+def test_latency_histogram_percentiles_within_bucket_width():
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms)
+    summary = histogram.summary()
+    assert summary["count"] == 1000
+    assert abs(summary["mean_ms"] - 500.5) < 1e-9
+    # Buckets are about 19% apart
+    for q, expected in ((0.5, 500), (0.95, 950), (0.99, 990)):
+        assert abs(histogram.percentile(q) - expected) <= 0.19 * expected
+
+def test_turn_tracer_records_stages_of_a_turn():
+    stats = TurnLatencyStats()
+    tracer = TurnTracer(stats, "agent")
+
+    speech_end = time.perf_counter() - 1.0
+    tracer.inbound(SPEECH, speech_end)
+    tracer.inbound(SILENCE, time.perf_counter()) # Silence does not move the end of speech
+    tracer.model_audio(speech_end + 0.3, 0.001, turn=2)
+    tracer.media_sent()
+    tracer.mark_acknowledged(turn=1) # A mark of an earlier turn
+    assert tracer.turns == 0
+    tracer.mark_acknowledged(turn=2)
+
+    metrics = stats.metrics()["agent"]
+    assert tracer.turns == 1
+    assert all(metrics[stage]["count"] == 1 for stage in metrics)
+    assert abs(metrics["think"]["mean_ms"] - 300) < 1e-6
+    assert metrics["total"]["mean_ms"] >= metrics["think"]["mean_ms"]
+
+def test_turn_tracer_cuts_turn_short_when_caller_speaks_again():
+    stats = TurnLatencyStats()
+    tracer = TurnTracer(stats, "agent")
+
+    tracer.inbound(SPEECH, time.perf_counter())
+    tracer.model_audio(time.perf_counter(), 0.001, turn=0)
+    tracer.inbound(SPEECH, time.perf_counter())
+
+    metrics = stats.metrics()["agent"]
+    assert metrics["think"]["count"] == 1
+    assert metrics["send"]["count"] == metrics["total"]["count"] == 0